@@ -0,0 +1,144 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Registro en memoria de métricas por vista (tiempo, consultas SQL)
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+"""
+Métricas por vista que alimenta core.middleware.MetricasRequestMiddleware.
+
+Cada vista guarda sus últimas N muestras en un buffer circular (deque), así
+que la memoria queda acotada y los percentiles reflejan el tráfico reciente.
+Los datos son del proceso: con varios workers, cada uno expone los suyos.
+"""
+from __future__ import annotations
+
+import math
+import threading
+from collections import deque
+from typing import NamedTuple
+
+from django.conf import settings
+
+
+class Muestra(NamedTuple):
+    estado: int
+    duracion_ms: float
+    consultas: int | None
+    tiempo_bd_ms: float | None
+    bytes: int | None
+
+
+def percentil(valores: list[float], p: float) -> float:
+    """Percentil por rango más cercano (valores ya ordenados)."""
+    if not valores:
+        return 0.0
+    return valores[max(1, math.ceil(p / 100 * len(valores))) - 1]
+
+
+class RegistroMetricas:
+    def __init__(self, capacidad: int = 1000):
+        self.capacidad = capacidad
+        self._muestras: dict[str, deque[Muestra]] = {}
+        # Contadores totales (no se pierden al rotar el buffer)
+        self._totales: dict[str, int] = {}
+        self._duracion_total_ms: dict[str, float] = {}
+        self._sobre_presupuesto: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, vista: str, muestra: Muestra, sobre_presupuesto: bool = False) -> None:
+        with self._lock:
+            buffer = self._muestras.get(vista)
+            if buffer is None:
+                buffer = self._muestras[vista] = deque(maxlen=self.capacidad)
+            buffer.append(muestra)
+            self._totales[vista] = self._totales.get(vista, 0) + 1
+            self._duracion_total_ms[vista] = self._duracion_total_ms.get(vista, 0.0) + muestra.duracion_ms
+            if sobre_presupuesto:
+                self._sobre_presupuesto[vista] = self._sobre_presupuesto.get(vista, 0) + 1
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._muestras.clear()
+            self._totales.clear()
+            self._duracion_total_ms.clear()
+            self._sobre_presupuesto.clear()
+
+    def resumen(self) -> dict[str, dict]:
+        """Por vista: totales, percentiles de duración y consultas, tiempo en BD y tamaño."""
+        with self._lock:
+            copia = {vista: list(buffer) for vista, buffer in self._muestras.items()}
+            totales = dict(self._totales)
+            duracion_total = dict(self._duracion_total_ms)
+            sobre = dict(self._sobre_presupuesto)
+
+        resultado = {}
+        for vista, muestras in sorted(copia.items()):
+            duraciones = sorted(m.duracion_ms for m in muestras)
+            consultas = sorted(m.consultas for m in muestras if m.consultas is not None)
+            tiempos_bd = sorted(m.tiempo_bd_ms for m in muestras if m.tiempo_bd_ms is not None)
+            tamanos = [m.bytes for m in muestras if m.bytes is not None]
+            resultado[vista] = {
+                "requests": totales.get(vista, 0),
+                "muestras": len(muestras),
+                "errores_5xx": sum(1 for m in muestras if m.estado >= 500),
+                "sobre_presupuesto": sobre.get(vista, 0),
+                "duracion_ms": {
+                    "p50": round(percentil(duraciones, 50), 3),
+                    "p95": round(percentil(duraciones, 95), 3),
+                    "p99": round(percentil(duraciones, 99), 3),
+                    "max": round(duraciones[-1], 3) if duraciones else 0.0,
+                    "total": round(duracion_total.get(vista, 0.0), 3),
+                },
+                "consultas": {
+                    "p50": percentil(consultas, 50),
+                    "p95": percentil(consultas, 95),
+                    "max": consultas[-1] if consultas else 0,
+                },
+                "tiempo_bd_ms_p95": round(percentil(tiempos_bd, 95), 3),
+                "bytes_promedio": round(sum(tamanos) / len(tamanos)) if tamanos else 0,
+            }
+        return resultado
+
+    def como_prometheus(self) -> str:
+        """Formato de texto de Prometheus (summary con cuantiles por vista)."""
+        lineas = [
+            "# HELP django_vista_duracion_ms Duración del request por vista (ms).",
+            "# TYPE django_vista_duracion_ms summary",
+        ]
+        resumen = self.resumen()
+        for vista, datos in resumen.items():
+            etiqueta = _etiqueta(vista)
+            for q, clave in (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99")):
+                lineas.append(
+                    f'django_vista_duracion_ms{{vista="{etiqueta}",quantile="{q}"}} {datos["duracion_ms"][clave]}'
+                )
+            lineas.append(f'django_vista_duracion_ms_sum{{vista="{etiqueta}"}} {datos["duracion_ms"]["total"]}')
+            lineas.append(f'django_vista_duracion_ms_count{{vista="{etiqueta}"}} {datos["requests"]}')
+
+        for nombre, ayuda, obtener in (
+            ("django_vista_consultas_p95", "Consultas SQL por request, p95.", lambda d: d["consultas"]["p95"]),
+            ("django_vista_tiempo_bd_ms_p95", "Tiempo en BD por request (ms), p95.", lambda d: d["tiempo_bd_ms_p95"]),
+            ("django_vista_bytes_promedio", "Tamaño promedio de la respuesta (bytes).", lambda d: d["bytes_promedio"]),
+        ):
+            lineas.append(f"# HELP {nombre} {ayuda}")
+            lineas.append(f"# TYPE {nombre} gauge")
+            for vista, datos in resumen.items():
+                lineas.append(f'{nombre}{{vista="{_etiqueta(vista)}"}} {obtener(datos)}')
+
+        lineas.append("# HELP django_vista_sobre_presupuesto_total Requests sobre el presupuesto de consultas.")
+        lineas.append("# TYPE django_vista_sobre_presupuesto_total counter")
+        for vista, datos in resumen.items():
+            lineas.append(
+                f'django_vista_sobre_presupuesto_total{{vista="{_etiqueta(vista)}"}} {datos["sobre_presupuesto"]}'
+            )
+        return "\n".join(lineas) + "\n"
+
+
+def _etiqueta(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Registro del proceso (lo llena el middleware)
+registro = RegistroMetricas(getattr(settings, "METRICAS_CAPACIDAD", 1000))
@@ -0,0 +1,108 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Middleware de instrumentación por request (tiempo y consultas SQL)
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from __future__ import annotations
+
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connection
+
+from core.metricas import Muestra, registro
+
+logger = logging.getLogger(__name__)
+
+
+class _ContadorConsultas:
+    """execute_wrapper de Django: cuenta consultas y acumula su duración."""
+
+    def __init__(self):
+        self.consultas = 0
+        self.segundos = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.segundos += time.perf_counter() - inicio
+            self.consultas += 1
+
+
+def _nombre_vista(request) -> str:
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "<sin_ruta>"
+    return match.view_name or f"{match.func.__module__}.{match.func.__qualname__}"
+
+
+def _bytes_respuesta(response) -> int | None:
+    if getattr(response, "streaming", False):
+        return None
+    return len(response.content)
+
+
+class MetricasRequestMiddleware:
+    """
+    Registra por vista: duración, consultas SQL, tiempo en BD y tamaño de la
+    respuesta (ver core.metricas). Avisa en el log cuando una vista supera
+    METRICAS_PRESUPUESTO_CONSULTAS (ej: N+1 en listados).
+
+    Con vistas async las consultas corren en otros hilos (sync_to_async), así
+    que sólo se registran duración y tamaño.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.activo = getattr(settings, "METRICAS_REQUESTS_ACTIVAS", True)
+        self.presupuesto = getattr(settings, "METRICAS_PRESUPUESTO_CONSULTAS", 50)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.activo:
+            return self.get_response(request)
+
+        contador = _ContadorConsultas()
+        inicio = time.perf_counter()
+        with connection.execute_wrapper(contador):
+            response = self.get_response(request)
+        duracion_ms = (time.perf_counter() - inicio) * 1000
+
+        self._registrar(request, response, duracion_ms, contador.consultas, contador.segundos * 1000)
+        return response
+
+    async def __acall__(self, request):
+        if not self.activo:
+            return await self.get_response(request)
+
+        inicio = time.perf_counter()
+        response = await self.get_response(request)
+        duracion_ms = (time.perf_counter() - inicio) * 1000
+
+        self._registrar(request, response, duracion_ms, None, None)
+        return response
+
+    def _registrar(self, request, response, duracion_ms, consultas, tiempo_bd_ms):
+        vista = _nombre_vista(request)
+        sobre_presupuesto = consultas is not None and consultas > self.presupuesto
+        if sobre_presupuesto:
+            logger.warning(
+                "%s %s (%s) ejecutó %d consultas SQL (presupuesto %d)",
+                request.method, request.path, vista, consultas, self.presupuesto,
+            )
+        registro.registrar(
+            vista,
+            Muestra(response.status_code, duracion_ms, consultas, tiempo_bd_ms, _bytes_respuesta(response)),
+            sobre_presupuesto,
+        )
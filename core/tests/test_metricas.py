@@ -0,0 +1,72 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Pruebas unitarias para el middleware de métricas por vista
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from core.metricas import Muestra, RegistroMetricas, registro
+
+
+class RegistroMetricasTests(TestCase):
+
+    def test_buffer_circular_y_percentiles(self):
+        reg = RegistroMetricas(capacidad=10)
+        for i in range(1, 21):
+            reg.registrar("vista", Muestra(200, float(i), i, 0.5, 100))
+
+        datos = reg.resumen()["vista"]
+        self.assertEqual(datos["requests"], 20)
+        self.assertEqual(datos["muestras"], 10)
+        # Sólo quedan las últimas 10 muestras (11..20)
+        self.assertEqual(datos["duracion_ms"]["p50"], 15.0)
+        self.assertEqual(datos["consultas"]["max"], 20)
+
+    def test_formato_prometheus(self):
+        reg = RegistroMetricas()
+        reg.registrar('a"b', Muestra(200, 3.0, 2, 1.0, 10), sobre_presupuesto=True)
+        reg.registrar('a"b', Muestra(200, 4.5, 2, 1.0, 10))
+
+        texto = reg.como_prometheus()
+        self.assertIn('django_vista_duracion_ms{vista="a\\"b",quantile="0.5"} 3.0', texto)
+        self.assertIn('django_vista_sobre_presupuesto_total{vista="a\\"b"} 1', texto)
+        self.assertIn('django_vista_duracion_ms_sum{vista="a\\"b"} 7.5', texto)
+        self.assertIn('django_vista_duracion_ms_count{vista="a\\"b"} 2', texto)
+
+
+class MiddlewareMetricasTests(TestCase):
+
+    def setUp(self):
+        registro.limpiar()
+        self.staff = get_user_model().objects.create_user("staff", password="x", is_staff=True)
+
+    def test_registra_consultas_por_vista(self):
+        self.client.post("/sensores/api/lectura/", data="{}", content_type="application/json")
+
+        datos = registro.resumen()["api_recibir_lectura"]
+        self.assertEqual(datos["requests"], 1)
+        self.assertGreater(datos["bytes_promedio"], 0)
+
+    @override_settings(METRICAS_PRESUPUESTO_CONSULTAS=0)
+    def test_avisa_sobre_presupuesto(self):
+        self.client.force_login(self.staff)
+        with self.assertLogs("core.middleware", level="WARNING"):
+            self.client.get("/metricas/")
+
+    def test_endpoints_solo_staff(self):
+        self.assertEqual(self.client.get("/metricas/").status_code, 302)
+
+        self.client.force_login(self.staff)
+        self.client.get("/metricas/")
+        resp = self.client.get("/metricas/")
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn("metricas_json", json.loads(resp.content)["vistas"])
+
+        resp = self.client.get("/metricas/prometheus/")
+        self.assertTrue(resp["Content-Type"].startswith("text/plain"))
+        self.assertIn("django_vista_duracion_ms", resp.content.decode())
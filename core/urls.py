@@ -0,0 +1,15 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: URLs de la aplicación core
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from django.urls import path
+
+from .views import metricas_json, metricas_prometheus
+
+urlpatterns = [
+    path("metricas/", metricas_json, name="metricas_json"),
+    path("metricas/prometheus/", metricas_prometheus, name="metricas_prometheus"),
+]
@@ -1,3 +1,31 @@
-from django.shortcuts import render
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Vistas de observabilidad (métricas por vista, sólo staff)
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse, JsonResponse
 
-# Create your views here.
+from core.metricas import registro
+
+
+@staff_member_required
+def metricas_json(request):
+    """
+    Métricas por vista de este proceso (ver core.middleware).
+
+    URL: /metricas/
+    """
+    return JsonResponse({"vistas": registro.resumen()})
+
+
+@staff_member_required
+def metricas_prometheus(request):
+    """
+    Mismas métricas en formato de texto de Prometheus.
+
+    URL: /metricas/prometheus/
+    """
+    return HttpResponse(registro.como_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,38 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Comando para detectar diferencias entre el registro y el stock
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from django.core.management.base import BaseCommand, CommandError
+
+from inventario.snapshots import reconciliar_stock
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara el stock según MovimientoInventario (desde el último snapshot) "
+        "con StockUbicacion y lista las diferencias."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ubicacion", type=int)
+        parser.add_argument(
+            "--estricto", action="store_true", help="Termina con error si hay diferencias (ej: cron)"
+        )
+
+    def handle(self, *args, **options):
+        diferencias = reconciliar_stock(options["ubicacion"])
+        for fila in diferencias:
+            self.stdout.write(
+                f"ubicacion={fila['ubicacion_id']} producto={fila['producto_id']}: "
+                f"libro={fila['libro']} stock={fila['stock']} ({fila['diferencia']:+d})"
+            )
+
+        if not diferencias:
+            self.stdout.write(self.style.SUCCESS("El stock cuadra con el registro de movimientos."))
+        elif options["estricto"]:
+            raise CommandError(f"{len(diferencias)} diferencias entre el registro y el stock.")
+        else:
+            self.stdout.write(self.style.WARNING(f"{len(diferencias)} diferencias."))
@@ -0,0 +1,39 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Comando para tomar snapshots del stock según el registro
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from inventario.snapshots import inicio_del_dia, tomar_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Guarda el stock de cada (ubicación, producto) según MovimientoInventario "
+        "al inicio del día indicado (por defecto, el último ya cerrado según "
+        "INVENTARIO_SNAPSHOT_MARGEN). Programar a diario: "
+        "las consultas de stock histórico reproducen sólo desde el último snapshot."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dia", help="Día AAAA-MM-DD (el snapshot queda a las 00:00)")
+
+    def handle(self, *args, **options):
+        dia = None
+        if options["dia"]:
+            try:
+                dia = date.fromisoformat(options["dia"])
+            except ValueError:
+                raise CommandError(f"Fecha inválida (use AAAA-MM-DD): {options['dia']}")
+
+        resultado = tomar_snapshot(inicio_del_dia(dia) if dia else None)
+        if not resultado["ok"]:
+            raise CommandError(resultado["error"])
+        self.stdout.write(self.style.SUCCESS(
+            f"{resultado['creados']} stocks guardados al {resultado['tomado_en']:%Y-%m-%d %H:%M}."
+        ))
@@ -1,4 +1,8 @@
-from django.db import models
+from collections import Counter
+
+from django.db import IntegrityError, models, transaction
+from django.db.models import Case, F, Q, When
+from django.utils import timezone
 from core.models import BaseModel
 from productos.models import Producto
 
@@ -24,6 +28,95 @@ class Ubicacion(BaseModel):
         return f"{self.nombre} ({self.tipo})"
 
 
+class StockUbicacionQuerySet(models.QuerySet):
+    """
+    Operaciones de stock como un único UPDATE con expresiones F: la base de
+    datos suma/resta sobre el valor vigente, así dos despachos simultáneos
+    no pisan sus cambios y no hace falta bloquear la fila.
+    update() no aplica auto_now: cada UPDATE fija updated_at explícitamente.
+    """
+
+    def incrementar(self, ubicacion_id: int, producto_id: int, cantidad: int) -> bool:
+        """Suma 'cantidad'. False si no existe el stock de ese producto en la ubicación."""
+        if cantidad <= 0:
+            raise ValueError("La cantidad a incrementar debe ser positiva.")
+        return bool(
+            self.filter(ubicacion_id=ubicacion_id, producto_id=producto_id)
+            .update(cantidad=F("cantidad") + cantidad, updated_at=timezone.now())
+        )
+
+    def decrementar(self, ubicacion_id: int, producto_id: int, cantidad: int) -> bool:
+        """
+        UPDATE ... SET cantidad = cantidad - n WHERE cantidad >= n.
+        False si no hay stock suficiente (no se descuenta nada).
+        """
+        if cantidad <= 0:
+            raise ValueError("La cantidad a decrementar debe ser positiva.")
+        return bool(
+            self.filter(ubicacion_id=ubicacion_id, producto_id=producto_id, cantidad__gte=cantidad)
+            .update(cantidad=F("cantidad") - cantidad, updated_at=timezone.now())
+        )
+
+    def aplicar_deltas(self, ubicacion_id: int, deltas: dict[int, int]) -> bool:
+        """
+        Aplica {producto_id: delta} (positivo suma, negativo resta) en una
+        ubicación con un solo UPDATE ... CASE. Todo o nada: si falta el stock
+        de algún producto, o no alcanza para una resta, no se aplica ninguno.
+        """
+        return self.aplicar_deltas_en_lote(
+            {(ubicacion_id, producto_id): delta for producto_id, delta in deltas.items()}
+        )
+
+    def aplicar_deltas_en_lote(self, deltas: dict[tuple[int, int], int]) -> bool:
+        """Como aplicar_deltas, con claves (ubicacion_id, producto_id) de varias ubicaciones."""
+        deltas = {clave: delta for clave, delta in deltas.items() if delta}
+        if not deltas:
+            return True
+
+        suficiente = Q()
+        for (ubicacion_id, producto_id), delta in deltas.items():
+            suficiente |= Q(
+                ubicacion_id=ubicacion_id, producto_id=producto_id, cantidad__gte=max(-delta, 0)
+            )
+
+        with transaction.atomic():
+            actualizadas = self.filter(suficiente).update(
+                cantidad=Case(
+                    *[
+                        When(ubicacion_id=ubicacion_id, producto_id=producto_id, then=F("cantidad") + delta)
+                        for (ubicacion_id, producto_id), delta in deltas.items()
+                    ],
+                    default=F("cantidad"),
+                    output_field=models.PositiveIntegerField(),
+                ),
+                updated_at=timezone.now(),
+            )
+            if actualizadas != len(deltas):
+                transaction.set_rollback(True)
+                return False
+        return True
+
+    def bajo_minimo(self):
+        """
+        Stocks bajo su mínimo, filtrados en la base (cantidad < stock_minimo).
+        Con stock_minimo = 0 nunca califican. Lo soporta el índice parcial
+        stock_bajo_minimo_idx, que sólo contiene esas filas.
+        """
+        return self.filter(cantidad__lt=F("stock_minimo"))
+
+    def descontar_pedido(self, pedido, ubicacion_id: int) -> bool:
+        """
+        Descuenta todas las unidades del pedido desde la ubicación: una
+        consulta para los detalles y un UPDATE (ver aplicar_deltas).
+        """
+        cantidades = Counter()
+        for producto_id, cantidad in pedido.detalles.values_list("producto_id", "cantidad"):
+            cantidades[producto_id] += cantidad
+        return self.aplicar_deltas(
+            ubicacion_id, {producto_id: -cantidad for producto_id, cantidad in cantidades.items()}
+        )
+
+
 class StockUbicacion(BaseModel):
     ubicacion = models.ForeignKey(
         Ubicacion,
@@ -39,10 +132,19 @@ class StockUbicacion(BaseModel):
     stock_minimo = models.PositiveIntegerField(default=0)
     stock_maximo = models.PositiveIntegerField(default=0)
 
+    objects = StockUbicacionQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Stock por ubicación"
         verbose_name_plural = "Stocks por ubicación"
         unique_together = ("ubicacion", "producto")
+        indexes = [
+            models.Index(
+                fields=["ubicacion", "producto"],
+                condition=Q(cantidad__lt=F("stock_minimo")),
+                name="stock_bajo_minimo_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.producto} en {self.ubicacion}: {self.cantidad} ud."
@@ -50,31 +152,44 @@ class StockUbicacion(BaseModel):
     def stock_disponible(self) -> int:
         return self.cantidad
 
+    def _recargar_cantidad(self):
+        # El valor quedó en la base: se vuelve a leer sólo si se usa
+        # (Django recarga un campo diferido al accederlo)
+        self.__dict__.pop("cantidad", None)
+
     def incrementar(self, cantidad: int):
         """
         Incrementa el stock en 'cantidad' unidades.
         Uso típico: recepción de compra, retorno de bidones.
+        Si el stock aún no existe en la base (instancia sin guardar), lo crea.
         """
-        if cantidad <= 0:
-            raise ValueError("La cantidad a incrementar debe ser positiva.")
-        self.cantidad += cantidad
-        self.save()
+        if StockUbicacion.objects.incrementar(self.ubicacion_id, self.producto_id, cantidad):
+            self._recargar_cantidad()
+            return
+
+        self.cantidad = self.__dict__.get("cantidad", 0) + cantidad
+        try:
+            with transaction.atomic():
+                self.save()
+        except IntegrityError:
+            # Otra transacción lo creó entre medio: se suma sobre esa fila
+            if not StockUbicacion.objects.incrementar(self.ubicacion_id, self.producto_id, cantidad):
+                raise
+            self._recargar_cantidad()
 
     def decrementar(self, cantidad: int):
         """
         Decrementa el stock en 'cantidad' unidades.
         Valida que exista stock suficiente.
         """
-        if cantidad <= 0:
-            raise ValueError("La cantidad a decrementar debe ser positiva.")
-        if cantidad > self.cantidad:
+        if not StockUbicacion.objects.decrementar(self.ubicacion_id, self.producto_id, cantidad):
             raise ValueError("No hay stock suficiente para realizar la salida.")
-        self.cantidad -= cantidad
-        self.save()
+        self._recargar_cantidad()
 
     def esta_bajo_minimo(self) -> bool:
         """
         Retorna True si el stock actual está por debajo del mínimo configurado.
+        Para buscar todos los stocks en esa condición: StockUbicacion.objects.bajo_minimo().
         """
         if self.stock_minimo is None:
             return False
@@ -113,6 +228,36 @@ class MovimientoInventario(BaseModel):
     class Meta:
         verbose_name = "Movimiento de inventario"
         verbose_name_plural = "Movimientos de inventario"
+        indexes = [
+            # Reproducción del registro desde el último snapshot (inventario.snapshots)
+            models.Index(fields=["created_at"], name="movimiento_creado_idx"),
+        ]
 
     def __str__(self):
         return f"{self.tipo} {self.cantidad} {self.producto}"
+
+
+class SnapshotStock(models.Model):
+    """
+    Stock de un producto en una ubicación según el registro de movimientos,
+    en un instante. Todos los pares se toman juntos (mismo tomado_en); el
+    stock histórico parte del último snapshot y sólo reproduce los
+    movimientos posteriores (ver inventario.snapshots).
+    """
+    ubicacion = models.ForeignKey(Ubicacion, on_delete=models.CASCADE, related_name="snapshots")
+    producto = models.ForeignKey(Producto, on_delete=models.CASCADE, related_name="snapshots")
+    tomado_en = models.DateTimeField()
+    cantidad = models.IntegerField()
+
+    class Meta:
+        verbose_name = "Snapshot de stock"
+        verbose_name_plural = "Snapshots de stock"
+        ordering = ["-tomado_en"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tomado_en", "ubicacion", "producto"], name="snapshot_stock_unico"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.producto} en {self.ubicacion} al {self.tomado_en}: {self.cantidad} ud."
@@ -0,0 +1,144 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Servicios de inventario (movimientos y stock por ubicación)
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import Q
+
+from inventario.models import MovimientoInventario, StockUbicacion
+
+TIPOS_MOVIMIENTO = {tipo for tipo, _ in MovimientoInventario.TIPO_MOVIMIENTO}
+
+
+# ================================================================
+# 1) VALIDACIÓN
+# ================================================================
+def _validar_movimiento(movimiento: MovimientoInventario) -> str | None:
+    """Mensaje de error del movimiento, o None si es válido."""
+    if movimiento.tipo not in TIPOS_MOVIMIENTO:
+        return f"Tipo de movimiento desconocido: {movimiento.tipo}"
+    if not isinstance(movimiento.cantidad, int) or movimiento.cantidad <= 0:
+        return "La cantidad debe ser un entero positivo"
+    if not movimiento.producto_id:
+        return "Falta el producto"
+
+    origen, destino = movimiento.ubicacion_origen_id, movimiento.ubicacion_destino_id
+    if movimiento.tipo == "ENTRADA" and (origen or not destino):
+        return "Una ENTRADA requiere sólo ubicación de destino"
+    if movimiento.tipo == "SALIDA" and (destino or not origen):
+        return "Una SALIDA requiere sólo ubicación de origen"
+    if movimiento.tipo == "TRASLADO" and (not origen or not destino or origen == destino):
+        return "Un TRASLADO requiere origen y destino distintos"
+    return None
+
+
+def _deltas(movimientos: Iterable[MovimientoInventario]) -> dict[tuple[int, int], int]:
+    """Variación neta por (ubicacion_id, producto_id)."""
+    deltas: dict[tuple[int, int], int] = defaultdict(int)
+    for movimiento in movimientos:
+        if movimiento.ubicacion_origen_id:
+            deltas[(movimiento.ubicacion_origen_id, movimiento.producto_id)] -= movimiento.cantidad
+        if movimiento.ubicacion_destino_id:
+            deltas[(movimiento.ubicacion_destino_id, movimiento.producto_id)] += movimiento.cantidad
+    return {clave: delta for clave, delta in deltas.items() if delta}
+
+
+# ================================================================
+# 2) REGISTRO DE MOVIMIENTOS
+# ================================================================
+def _bloquear_stocks(claves: Iterable[tuple[int, int]]) -> dict[tuple[int, int], int]:
+    """
+    SELECT ... FOR UPDATE de las filas de stock afectadas, siempre en orden
+    (ubicacion, producto): dos transacciones que tocan las mismas filas las
+    bloquean en el mismo orden y no pueden quedar esperándose mutuamente.
+    """
+    filtro = Q()
+    for ubicacion_id, producto_id in claves:
+        filtro |= Q(ubicacion_id=ubicacion_id, producto_id=producto_id)
+    filas = (
+        StockUbicacion.objects.select_for_update()
+        .filter(filtro)
+        .order_by("ubicacion_id", "producto_id")
+        .values_list("ubicacion_id", "producto_id", "cantidad")
+    )
+    return {(ubicacion_id, producto_id): cantidad for ubicacion_id, producto_id, cantidad in filas}
+
+
+def registrar_movimientos(lista: Iterable[dict | MovimientoInventario]) -> dict:
+    """
+    Registra movimientos de inventario y aplica su efecto en StockUbicacion,
+    todo en una transacción (todo o nada).
+
+    Cada item es un MovimientoInventario sin guardar o un dict con sus campos:
+      {"tipo": "SALIDA", "producto_id": 1, "cantidad": 20,
+       "ubicacion_origen_id": 3, "referencia": "Ruta 12"}
+
+    - ENTRADA suma en destino, SALIDA resta en origen, TRASLADO hace ambas.
+    - Las filas de stock se bloquean una sola vez, en orden determinista.
+    - Las variaciones netas se aplican con un solo UPDATE y el registro de
+      movimientos con bulk_create: la cantidad de consultas no depende del
+      largo de la lista.
+    - Una ENTRADA en una ubicación sin stock del producto crea la fila.
+
+    Retorna:
+      - {"ok": True, "movimientos": [<MovimientoInventario>, ...]}
+      - {"ok": False, "errores": [{"indice": 0, "error": "..."}, ...]}
+    """
+    movimientos = [
+        item if isinstance(item, MovimientoInventario) else MovimientoInventario(**item)
+        for item in lista
+    ]
+    errores = []
+    for indice, movimiento in enumerate(movimientos):
+        error = _validar_movimiento(movimiento)
+        if error:
+            errores.append({"indice": indice, "error": error})
+    if errores:
+        return {"ok": False, "errores": errores}
+    if not movimientos:
+        return {"ok": True, "movimientos": []}
+
+    deltas = _deltas(movimientos)
+    with transaction.atomic():
+        actuales = _bloquear_stocks(deltas) if deltas else {}
+
+        faltantes = [clave for clave in deltas if clave not in actuales]
+        sin_stock = [clave for clave in faltantes if deltas[clave] < 0]
+        sin_stock += [
+            clave for clave, cantidad in actuales.items() if cantidad + deltas[clave] < 0
+        ]
+        if sin_stock:
+            return {
+                "ok": False,
+                "errores": [
+                    {"ubicacion_id": ubicacion_id, "producto_id": producto_id, "error": "Stock insuficiente"}
+                    for ubicacion_id, producto_id in sorted(sin_stock)
+                ],
+            }
+
+        if faltantes:
+            # ignore_conflicts: si otra transacción la creó recién, se suma sobre esa fila
+            StockUbicacion.objects.bulk_create(
+                [
+                    StockUbicacion(ubicacion_id=ubicacion_id, producto_id=producto_id, cantidad=0)
+                    for ubicacion_id, producto_id in faltantes
+                ],
+                ignore_conflicts=True,
+            )
+
+        if not StockUbicacion.objects.aplicar_deltas_en_lote(deltas):
+            # Sólo si cambió el stock entre el bloqueo y el UPDATE (no debería)
+            transaction.set_rollback(True)
+            return {"ok": False, "errores": [{"error": "El stock cambió durante el registro"}]}
+
+        MovimientoInventario.objects.bulk_create(movimientos)
+
+    return {"ok": True, "movimientos": movimientos}
@@ -0,0 +1,175 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Stock histórico desde snapshots y el registro de movimientos
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+"""
+Stock de cada (ubicación, producto) en cualquier instante.
+
+MovimientoInventario es el registro: el stock al instante D es la suma de
+los movimientos hasta D. Para no recorrerlo desde el principio, los
+SnapshotStock guardan ese resultado en instantes fijos (manage.py
+snapshot_stock, ej: diario a las 00:00); una consulta parte del último
+snapshot anterior a D y agrega sólo los movimientos posteriores.
+
+MovimientoInventario.created_at se fija al crear la fila, antes del commit:
+un movimiento con created_at anterior al instante del snapshot puede
+confirmarse después de leído el snapshot y quedar fuera para siempre. Por
+eso sólo se aceptan instantes al menos INVENTARIO_SNAPSHOT_MARGEN segundos
+en el pasado (más que la transacción de movimientos más larga); por defecto,
+el último inicio de día que cumple ese margen.
+manage.py reconciliar_stock compara el registro con StockUbicacion.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Max, Sum
+from django.utils import timezone
+
+from inventario.models import MovimientoInventario, SnapshotStock, StockUbicacion
+
+
+# ================================================================
+# 1) CONSULTA DE STOCK HISTÓRICO
+# ================================================================
+def ultimo_snapshot(fecha: datetime) -> datetime | None:
+    """Instante del último snapshot tomado hasta 'fecha' (incluida)."""
+    return SnapshotStock.objects.filter(tomado_en__lte=fecha).aggregate(m=Max("tomado_en"))["m"]
+
+
+def stocks_en(
+    fecha: datetime,
+    ubicacion_id: int | None = None,
+    producto_id: int | None = None,
+) -> dict[tuple[int, int], int]:
+    """
+    {(ubicacion_id, producto_id): cantidad} al instante 'fecha' según el
+    registro. Cuatro consultas, sin importar el largo del registro: el
+    snapshot base (instante y filas) y los movimientos posteriores agregados
+    por destino (entradas) y por origen (salidas).
+    """
+    base = ultimo_snapshot(fecha)
+    stocks: dict[tuple[int, int], int] = defaultdict(int)
+
+    filtros = {}
+    if ubicacion_id is not None:
+        filtros["ubicacion_id"] = ubicacion_id
+    if producto_id is not None:
+        filtros["producto_id"] = producto_id
+
+    if base is not None:
+        for ubicacion, producto, cantidad in SnapshotStock.objects.filter(
+            tomado_en=base, **filtros
+        ).values_list("ubicacion_id", "producto_id", "cantidad"):
+            stocks[(ubicacion, producto)] = cantidad
+
+    movimientos = MovimientoInventario.objects.filter(created_at__lte=fecha)
+    if base is not None:
+        movimientos = movimientos.filter(created_at__gt=base)
+    if producto_id is not None:
+        movimientos = movimientos.filter(producto_id=producto_id)
+
+    for campo, signo in (("ubicacion_destino_id", 1), ("ubicacion_origen_id", -1)):
+        lado = movimientos.filter(**{f"{campo}__isnull": False})
+        if ubicacion_id is not None:
+            lado = lado.filter(**{campo: ubicacion_id})
+        for ubicacion, producto, total in (
+            lado.order_by().values(campo, "producto_id").annotate(total=Sum("cantidad"))
+            .values_list(campo, "producto_id", "total")
+        ):
+            stocks[(ubicacion, producto)] += signo * total
+
+    return dict(stocks)
+
+
+def stock_en(ubicacion_id: int, producto_id: int, fecha: datetime) -> int:
+    """Stock de un producto en una ubicación al instante 'fecha'."""
+    return stocks_en(fecha, ubicacion_id, producto_id).get((ubicacion_id, producto_id), 0)
+
+
+# ================================================================
+# 2) SNAPSHOTS
+# ================================================================
+def inicio_del_dia(dia=None) -> datetime:
+    dia = dia or timezone.localdate()
+    return timezone.make_aware(datetime.combine(dia, time.min))
+
+
+def _margen_snapshot() -> timedelta:
+    return timedelta(seconds=getattr(settings, "INVENTARIO_SNAPSHOT_MARGEN", 600))
+
+
+def tomar_snapshot(tomado_en: datetime | None = None) -> dict:
+    """
+    Guarda el stock de todos los pares (ubicación, producto) al instante
+    'tomado_en' (por defecto, el último inicio de día que quedó al menos
+    INVENTARIO_SNAPSHOT_MARGEN segundos atrás).
+
+    Retorna:
+      - {"ok": True, "tomado_en": datetime, "creados": int}
+      - {"ok": False, "error": "..."} si ya existe un snapshot en ese instante
+        o si el instante es demasiado reciente
+    """
+    limite = timezone.now() - _margen_snapshot()
+    tomado_en = tomado_en or inicio_del_dia(timezone.localdate(limite))
+    if tomado_en > limite:
+        return {
+            "ok": False,
+            "error": (
+                "El snapshot debe quedar al menos "
+                f"{int(_margen_snapshot().total_seconds())} segundos en el pasado"
+            ),
+        }
+    if SnapshotStock.objects.filter(tomado_en=tomado_en).exists():
+        return {"ok": False, "error": f"Ya existe un snapshot al {tomado_en.isoformat()}"}
+
+    snapshots = [
+        SnapshotStock(ubicacion_id=ubicacion, producto_id=producto, tomado_en=tomado_en, cantidad=cantidad)
+        for (ubicacion, producto), cantidad in sorted(stocks_en(tomado_en).items())
+    ]
+    try:
+        with transaction.atomic():
+            SnapshotStock.objects.bulk_create(snapshots)
+    except IntegrityError:
+        # Otra ejecución tomó el mismo snapshot en paralelo
+        return {"ok": False, "error": f"Ya existe un snapshot al {tomado_en.isoformat()}"}
+    return {"ok": True, "tomado_en": tomado_en, "creados": len(snapshots)}
+
+
+# ================================================================
+# 3) RECONCILIACIÓN
+# ================================================================
+def reconciliar_stock(ubicacion_id: int | None = None) -> list[dict]:
+    """
+    Diferencias entre el registro de movimientos y StockUbicacion.cantidad
+    (ej: ajustes manuales de stock sin su movimiento). Lista vacía si cuadran.
+    """
+    libro = stocks_en(timezone.now(), ubicacion_id)
+
+    actuales = StockUbicacion.objects.all()
+    if ubicacion_id is not None:
+        actuales = actuales.filter(ubicacion_id=ubicacion_id)
+    stock = {
+        (ubicacion, producto): cantidad
+        for ubicacion, producto, cantidad in actuales.values_list("ubicacion_id", "producto_id", "cantidad")
+    }
+
+    diferencias = []
+    for ubicacion, producto in sorted(libro.keys() | stock.keys()):
+        segun_libro = libro.get((ubicacion, producto), 0)
+        segun_stock = stock.get((ubicacion, producto), 0)
+        if segun_libro != segun_stock:
+            diferencias.append({
+                "ubicacion_id": ubicacion,
+                "producto_id": producto,
+                "libro": segun_libro,
+                "stock": segun_stock,
+                "diferencia": segun_stock - segun_libro,
+            })
+    return diferencias
@@ -0,0 +1,100 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Pruebas unitarias para el registro de movimientos de inventario
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from inventario.models import MovimientoInventario, StockUbicacion, Ubicacion
+from inventario.services import registrar_movimientos
+from productos.models import Producto
+
+
+class RegistrarMovimientosTests(TestCase):
+
+    def setUp(self):
+        self.bodega = Ubicacion.objects.create(codigo="BOD-M", nombre="Bodega", tipo="BODEGA")
+        self.camion = Ubicacion.objects.create(codigo="VEH-M", nombre="Camión", tipo="VEHICULO")
+        self.bidon = Producto.objects.create(
+            codigo="B20-M", nombre="Bidón", presentacion_litros=20, precio_lista=2500
+        )
+        self.vacio = Producto.objects.create(
+            codigo="B20-V", nombre="Bidón vacío", presentacion_litros=20, precio_lista=0
+        )
+        StockUbicacion.objects.create(ubicacion=self.bodega, producto=self.bidon, cantidad=50)
+        StockUbicacion.objects.create(ubicacion=self.camion, producto=self.bidon, cantidad=0)
+
+    def _stock(self, ubicacion, producto) -> int:
+        return StockUbicacion.objects.values_list("cantidad", flat=True).get(
+            ubicacion=ubicacion, producto=producto
+        )
+
+    def _cierre_de_ruta(self, entregas: int) -> list[dict]:
+        return [
+            {"tipo": "SALIDA", "producto_id": self.bidon.pk, "cantidad": 2,
+             "ubicacion_origen_id": self.camion.pk, "referencia": f"Pedido {i}"}
+            for i in range(entregas)
+        ] + [
+            {"tipo": "ENTRADA", "producto_id": self.vacio.pk, "cantidad": 2,
+             "ubicacion_destino_id": self.bodega.pk, "referencia": f"Retorno {i}"}
+            for i in range(entregas)
+        ]
+
+    def test_traslado_y_cierre_de_ruta_aplican_stock_y_registro(self):
+        carga = registrar_movimientos([
+            {"tipo": "TRASLADO", "producto_id": self.bidon.pk, "cantidad": 20,
+             "ubicacion_origen_id": self.bodega.pk, "ubicacion_destino_id": self.camion.pk},
+        ])
+        self.assertTrue(carga["ok"])
+
+        cierre = registrar_movimientos(self._cierre_de_ruta(5))
+
+        self.assertTrue(cierre["ok"])
+        self.assertEqual(self._stock(self.bodega, self.bidon), 30)
+        self.assertEqual(self._stock(self.camion, self.bidon), 10)
+        self.assertEqual(self._stock(self.bodega, self.vacio), 10)  # fila creada por la ENTRADA
+        self.assertEqual(MovimientoInventario.objects.count(), 11)
+
+    def test_consultas_constantes_segun_largo_de_la_lista(self):
+        registrar_movimientos([
+            {"tipo": "ENTRADA", "producto_id": self.bidon.pk, "cantidad": 40,
+             "ubicacion_destino_id": self.camion.pk},
+            {"tipo": "ENTRADA", "producto_id": self.vacio.pk, "cantidad": 1,
+             "ubicacion_destino_id": self.bodega.pk},
+        ])
+
+        consultas = []
+        for entregas in (2, 10):
+            with CaptureQueriesContext(connection) as capturadas:
+                self.assertTrue(registrar_movimientos(self._cierre_de_ruta(entregas))["ok"])
+            consultas.append(len(capturadas))
+
+        self.assertEqual(consultas[0], consultas[1])
+
+    def test_validacion_y_stock_insuficiente_no_aplican_nada(self):
+        invalido = registrar_movimientos([
+            {"tipo": "SALIDA", "producto_id": self.bidon.pk, "cantidad": 1,
+             "ubicacion_destino_id": self.camion.pk},
+            {"tipo": "DEVOLUCION", "producto_id": self.bidon.pk, "cantidad": 1},
+            {"tipo": "ENTRADA", "producto_id": self.bidon.pk, "cantidad": 0,
+             "ubicacion_destino_id": self.camion.pk},
+        ])
+        self.assertEqual([e["indice"] for e in invalido["errores"]], [0, 1, 2])
+
+        insuficiente = registrar_movimientos([
+            {"tipo": "SALIDA", "producto_id": self.bidon.pk, "cantidad": 10,
+             "ubicacion_origen_id": self.bodega.pk},
+            {"tipo": "SALIDA", "producto_id": self.bidon.pk, "cantidad": 1,
+             "ubicacion_origen_id": self.camion.pk},
+            {"tipo": "SALIDA", "producto_id": self.vacio.pk, "cantidad": 1,
+             "ubicacion_origen_id": self.bodega.pk},
+        ])
+
+        self.assertFalse(insuficiente["ok"])
+        self.assertEqual(len(insuficiente["errores"]), 2)
+        self.assertEqual(self._stock(self.bodega, self.bidon), 50)
+        self.assertFalse(MovimientoInventario.objects.exists())
@@ -0,0 +1,104 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Pruebas unitarias para snapshots y stock histórico
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+import io
+from datetime import datetime, time, timedelta
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from inventario.models import MovimientoInventario, SnapshotStock, StockUbicacion, Ubicacion
+from inventario.services import registrar_movimientos
+from inventario.snapshots import reconciliar_stock, stock_en, stocks_en, tomar_snapshot
+from productos.models import Producto
+
+
+class SnapshotStockTests(TestCase):
+
+    def setUp(self):
+        self.bodega = Ubicacion.objects.create(codigo="BOD-S", nombre="Bodega", tipo="BODEGA")
+        self.camion = Ubicacion.objects.create(codigo="VEH-S", nombre="Camión", tipo="VEHICULO")
+        self.bidon = Producto.objects.create(
+            codigo="B20-S", nombre="Bidón", presentacion_litros=20, precio_lista=2500
+        )
+        self.dia = timezone.make_aware(datetime(2026, 5, 1))
+
+    def _mover(self, dias: int, **movimiento):
+        resultado = registrar_movimientos([{"producto_id": self.bidon.pk, **movimiento}])
+        self.assertTrue(resultado["ok"])
+        MovimientoInventario.objects.filter(pk=resultado["movimientos"][0].pk).update(
+            created_at=self.dia + timedelta(days=dias, hours=10)
+        )
+
+    def _historia(self):
+        self._mover(0, tipo="ENTRADA", cantidad=100, ubicacion_destino_id=self.bodega.pk)
+        self._mover(1, tipo="TRASLADO", cantidad=30, ubicacion_origen_id=self.bodega.pk,
+                    ubicacion_destino_id=self.camion.pk)
+        self._mover(2, tipo="SALIDA", cantidad=12, ubicacion_origen_id=self.camion.pk)
+        self._mover(3, tipo="ENTRADA", cantidad=5, ubicacion_destino_id=self.bodega.pk)
+
+    def test_stock_en_cualquier_instante_desde_el_registro(self):
+        self._historia()
+
+        self.assertEqual(stock_en(self.bodega.pk, self.bidon.pk, self.dia), 0)
+        self.assertEqual(stock_en(self.bodega.pk, self.bidon.pk, self.dia + timedelta(days=1)), 100)
+        self.assertEqual(
+            stocks_en(self.dia + timedelta(days=3)),
+            {(self.bodega.pk, self.bidon.pk): 70, (self.camion.pk, self.bidon.pk): 18},
+        )
+
+    def test_snapshot_evita_reproducir_el_registro_anterior(self):
+        self._historia()
+        resultado = tomar_snapshot(self.dia + timedelta(days=2))
+        self.assertEqual(resultado["creados"], 2)
+        self.assertFalse(tomar_snapshot(self.dia + timedelta(days=2))["ok"])
+
+        # Lo anterior al snapshot ya no se lee: borrarlo no cambia el resultado
+        MovimientoInventario.objects.filter(created_at__lt=self.dia + timedelta(days=2)).delete()
+
+        with self.assertNumQueries(4):
+            stocks = stocks_en(self.dia + timedelta(days=5))
+        self.assertEqual(stocks[(self.bodega.pk, self.bidon.pk)], 75)
+        self.assertEqual(stocks[(self.camion.pk, self.bidon.pk)], 18)
+
+    def test_reconciliacion_detecta_diferencias(self):
+        self._historia()
+        self.assertEqual(reconciliar_stock(), [])
+
+        StockUbicacion.objects.filter(ubicacion=self.camion).update(cantidad=20)  # ajuste sin movimiento
+
+        self.assertEqual(
+            reconciliar_stock(),
+            [{"ubicacion_id": self.camion.pk, "producto_id": self.bidon.pk,
+              "libro": 18, "stock": 20, "diferencia": 2}],
+        )
+        with self.assertRaises(CommandError):
+            call_command("reconciliar_stock", "--estricto", stdout=io.StringIO())
+
+    def test_comando_snapshot(self):
+        self._historia()
+        salida = io.StringIO()
+
+        call_command("snapshot_stock", "--dia", "2026-05-03", stdout=salida)
+
+        self.assertIn("2 stocks guardados", salida.getvalue())
+        self.assertEqual(
+            SnapshotStock.objects.get(ubicacion=self.camion).cantidad, 30
+        )
+        with self.assertRaises(CommandError):
+            call_command("snapshot_stock", "--dia", "2026-05-03", stdout=io.StringIO())
+
+    def test_snapshot_reciente_se_rechaza_y_el_defecto_respeta_el_margen(self):
+        with override_settings(INVENTARIO_SNAPSHOT_MARGEN=600):
+            self.assertFalse(tomar_snapshot(timezone.now() - timedelta(minutes=5))["ok"])
+
+            resultado = tomar_snapshot()
+
+        self.assertTrue(resultado["ok"])
+        self.assertLessEqual(resultado["tomado_en"], timezone.now() - timedelta(minutes=10))
+        self.assertEqual(timezone.localtime(resultado["tomado_en"]).time(), time.min)
@@ -0,0 +1,113 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Pruebas unitarias para las operaciones atómicas de stock
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from clientes.models import Cliente, SectorEntrega
+from inventario.models import StockUbicacion, Ubicacion
+from productos.models import Producto
+from ventas.models import DetallePedido, Pedido
+
+
+class StockAtomicoTests(TestCase):
+
+    def setUp(self):
+        self.bodega = Ubicacion.objects.create(codigo="BOD-1", nombre="Bodega", tipo="BODEGA")
+        self.bidon = Producto.objects.create(
+            codigo="B20", nombre="Bidón", presentacion_litros=20, precio_lista=2500
+        )
+        self.tapa = Producto.objects.create(
+            codigo="TAPA", nombre="Tapa", tipo="INSUMO", presentacion_litros=0, precio_lista=50
+        )
+        self.stock_bidon = StockUbicacion.objects.create(
+            ubicacion=self.bodega, producto=self.bidon, cantidad=10
+        )
+        self.stock_tapa = StockUbicacion.objects.create(
+            ubicacion=self.bodega, producto=self.tapa, cantidad=3
+        )
+
+    def _sentencias(self, capturadas: CaptureQueriesContext) -> list[str]:
+        # Sin los SAVEPOINT del atomic() anidado en la transacción del test
+        return [q["sql"] for q in capturadas.captured_queries if "SAVEPOINT" not in q["sql"]]
+
+    def _cantidad(self, stock: StockUbicacion) -> int:
+        return StockUbicacion.objects.values_list("cantidad", flat=True).get(pk=stock.pk)
+
+    def test_decrementar_con_valor_desactualizado_no_pierde_cambios(self):
+        otro_operador = StockUbicacion.objects.get(pk=self.stock_bidon.pk)
+
+        with self.assertNumQueries(1):
+            self.stock_bidon.decrementar(4)
+        otro_operador.decrementar(5)  # su copia aún dice 10
+
+        self.assertEqual(self._cantidad(self.stock_bidon), 1)
+        self.assertEqual(otro_operador.cantidad, 1)  # recargado al leerlo
+        with self.assertRaises(ValueError):
+            otro_operador.decrementar(2)
+        self.assertEqual(self._cantidad(self.stock_bidon), 1)
+
+    def test_operaciones_del_queryset_retornan_exito(self):
+        objetos = StockUbicacion.objects
+        self.assertTrue(objetos.incrementar(self.bodega.pk, self.tapa.pk, 2))
+        self.assertFalse(objetos.decrementar(self.bodega.pk, self.tapa.pk, 6))
+        self.assertTrue(objetos.decrementar(self.bodega.pk, self.tapa.pk, 5))
+        self.assertEqual(self._cantidad(self.stock_tapa), 0)
+        with self.assertRaises(ValueError):
+            objetos.incrementar(self.bodega.pk, self.tapa.pk, 0)
+
+    def test_updates_marcan_updated_at(self):
+        antes = StockUbicacion.objects.get(pk=self.stock_tapa.pk).updated_at
+
+        StockUbicacion.objects.aplicar_deltas(self.bodega.pk, {self.tapa.pk: 1})
+        self.stock_tapa.incrementar(1)
+
+        self.assertGreater(StockUbicacion.objects.get(pk=self.stock_tapa.pk).updated_at, antes)
+
+    def test_incrementar_crea_el_stock_que_no_existe(self):
+        camion = Ubicacion.objects.create(codigo="VEH-1", nombre="Camión", tipo="VEHICULO")
+        nuevo = StockUbicacion(ubicacion=camion, producto=self.tapa)
+
+        nuevo.incrementar(3)
+        nuevo.incrementar(2)
+
+        self.assertIsNotNone(nuevo.pk)
+        self.assertEqual(self._cantidad(nuevo), 5)
+        self.assertEqual(nuevo.cantidad, 5)
+
+    def test_aplicar_deltas_es_todo_o_nada(self):
+        with CaptureQueriesContext(connection) as capturadas:
+            self.assertTrue(
+                StockUbicacion.objects.aplicar_deltas(self.bodega.pk, {self.bidon.pk: -2, self.tapa.pk: 1})
+            )
+        self.assertEqual(len(self._sentencias(capturadas)), 1)
+        self.assertEqual((self._cantidad(self.stock_bidon), self._cantidad(self.stock_tapa)), (8, 4))
+
+        self.assertFalse(
+            StockUbicacion.objects.aplicar_deltas(self.bodega.pk, {self.bidon.pk: -1, self.tapa.pk: -5})
+        )
+        self.assertEqual((self._cantidad(self.stock_bidon), self._cantidad(self.stock_tapa)), (8, 4))
+
+    def test_descontar_pedido_en_un_solo_update(self):
+        sector = SectorEntrega.objects.create(nombre="Centro", direccion_referencia="Plaza")
+        cliente = Cliente.objects.create(
+            rut_numero=12345678, rut_dv="5", nombre_razon_social="Cliente", direccion_cobranza="X 1"
+        )
+        pedido = Pedido.objects.create(cliente=cliente, sector_entrega=sector)
+        for cantidad in (3, 4):
+            DetallePedido.objects.create(
+                pedido=pedido, producto=self.bidon, cantidad=cantidad, precio_unitario=2500
+            )
+        DetallePedido.objects.create(pedido=pedido, producto=self.tapa, cantidad=2, precio_unitario=50)
+
+        with CaptureQueriesContext(connection) as capturadas:
+            self.assertTrue(StockUbicacion.objects.descontar_pedido(pedido, self.bodega.pk))
+        self.assertEqual(len(self._sentencias(capturadas)), 2)
+
+        self.assertEqual((self._cantidad(self.stock_bidon), self._cantidad(self.stock_tapa)), (3, 1))
+        self.assertFalse(StockUbicacion.objects.descontar_pedido(pedido, self.bodega.pk))
@@ -1,3 +1,10 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Notificacion
+
+
+@admin.register(Notificacion)
+class NotificacionAdmin(admin.ModelAdmin):
+    list_display = ("asunto", "tipo", "backend", "enviada_en")
+    list_filter = ("tipo", "backend")
+    search_fields = ("asunto", "clave")
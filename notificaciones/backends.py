@@ -0,0 +1,77 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Backends de entrega de notificaciones
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+"""
+Backends de entrega: cualquier clase con enviar(notificacion). El activo se
+elige con NOTIFICACIONES_BACKEND (ruta "modulo.Clase", como EMAIL_BACKEND)
+y recibe NOTIFICACIONES_BACKEND_OPCIONES como argumentos.
+"""
+from __future__ import annotations
+
+import json
+import sys
+from typing import IO, Protocol
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from notificaciones.models import Notificacion
+
+
+class Backend(Protocol):
+    def enviar(self, notificacion: Notificacion) -> None:
+        """Entrega la notificación; lanza una excepción si falla."""
+
+
+class BackendConsola:
+    """Escribe la notificación en la salida estándar (desarrollo local)."""
+
+    def __init__(self, stream: IO[str] | None = None):
+        self.stream = stream or sys.stdout
+
+    def enviar(self, notificacion: Notificacion) -> None:
+        self.stream.write(f"{notificacion.asunto}\n{notificacion.cuerpo}\n{'-' * 40}\n")
+        self.stream.flush()
+
+
+class BackendArchivo:
+    """Agrega cada notificación como una línea JSON al archivo 'ruta'."""
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+
+    def enviar(self, notificacion: Notificacion) -> None:
+        linea = {
+            "tipo": notificacion.tipo,
+            "clave": notificacion.clave,
+            "asunto": notificacion.asunto,
+            "cuerpo": notificacion.cuerpo,
+            "datos": notificacion.datos,
+            "enviada_en": notificacion.enviada_en.isoformat(),
+        }
+        with open(self.ruta, "a", encoding="utf-8") as archivo:
+            archivo.write(json.dumps(linea, ensure_ascii=False) + "\n")
+
+
+class BackendMemoria:
+    """Guarda lo enviado en una lista (pruebas)."""
+
+    def __init__(self):
+        self.enviadas: list[Notificacion] = []
+
+    def enviar(self, notificacion: Notificacion) -> None:
+        self.enviadas.append(notificacion)
+
+
+def nombre_backend(backend: Backend) -> str:
+    return type(backend).__name__
+
+
+def obtener_backend() -> Backend:
+    ruta = getattr(settings, "NOTIFICACIONES_BACKEND", "notificaciones.backends.BackendConsola")
+    opciones = getattr(settings, "NOTIFICACIONES_BACKEND_OPCIONES", {})
+    return import_string(ruta)(**opciones)
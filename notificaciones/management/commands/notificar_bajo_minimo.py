@@ -0,0 +1,28 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Comando para notificar los stocks bajo mínimo por ubicación
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from django.core.management.base import BaseCommand
+
+from notificaciones.services import notificar_bajo_minimo
+
+
+class Command(BaseCommand):
+    help = (
+        "Envía un resumen por ubicación con los productos bajo su stock mínimo "
+        "(backend NOTIFICACIONES_BACKEND, con límite de frecuencia por ubicación). "
+        "Pensado para ejecutarse periódicamente (ej: cada 15 minutos)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ubicacion", type=int, action="append", dest="ubicaciones")
+
+    def handle(self, *args, **options):
+        resultado = notificar_bajo_minimo(ubicacion_ids=options["ubicaciones"])
+        self.stdout.write(self.style.SUCCESS(
+            f"{resultado['enviadas']} resúmenes enviados ({resultado['productos']} productos bajo mínimo, "
+            f"{resultado['omitidas']} ubicaciones omitidas por frecuencia, {resultado['fallidas']} fallidas)."
+        ))
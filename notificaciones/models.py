@@ -1,3 +1,32 @@
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class Notificacion(models.Model):
+    """
+    Notificación entregada por un backend (ver notificaciones.backends), ej: un
+    resumen de stocks bajo mínimo por ubicación. La última de cada clave
+    define el límite de frecuencia (NOTIFICACIONES_INTERVALO_MINIMO).
+    """
+    TIPO_NOTIFICACION = [
+        ("BAJO_MINIMO", "Stock bajo mínimo"),
+    ]
+
+    tipo = models.CharField(max_length=20, choices=TIPO_NOTIFICACION)
+    clave = models.CharField(max_length=100, help_text="Agrupa las notificaciones del mismo asunto")
+    asunto = models.CharField(max_length=200)
+    cuerpo = models.TextField()
+    datos = models.JSONField(default=dict, blank=True)
+    backend = models.CharField(max_length=100)
+    enviada_en = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Notificación"
+        verbose_name_plural = "Notificaciones"
+        ordering = ["-enviada_en"]
+        indexes = [
+            models.Index(fields=["clave", "-enviada_en"], name="notificacion_clave_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.asunto} ({self.enviada_en:%Y-%m-%d %H:%M})"
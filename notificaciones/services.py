@@ -0,0 +1,121 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Servicios de notificaciones (resúmenes de stock bajo mínimo)
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from itertools import groupby
+from typing import Iterable
+
+from django.conf import settings
+from django.utils import timezone
+
+from inventario.models import StockUbicacion
+from notificaciones.backends import Backend, nombre_backend, obtener_backend
+from notificaciones.models import Notificacion
+
+
+def _intervalo_minimo() -> timedelta:
+    return timedelta(seconds=getattr(settings, "NOTIFICACIONES_INTERVALO_MINIMO", 3600))
+
+
+# ================================================================
+# 1) LÍMITE DE FRECUENCIA
+# ================================================================
+def claves_recientes(claves: Iterable[str], ahora: datetime | None = None) -> set[str]:
+    """Claves con una notificación enviada dentro del intervalo mínimo."""
+    ahora = ahora or timezone.now()
+    return set(
+        Notificacion.objects.filter(clave__in=list(claves), enviada_en__gt=ahora - _intervalo_minimo())
+        .values_list("clave", flat=True)
+        .distinct()
+    )
+
+
+# ================================================================
+# 2) RESUMEN DE STOCK BAJO MÍNIMO
+# ================================================================
+def _clave_bajo_minimo(ubicacion_id: int) -> str:
+    return f"bajo_minimo:{ubicacion_id}"
+
+
+def _resumen_ubicacion(ubicacion, stocks: list[StockUbicacion], ahora: datetime) -> Notificacion:
+    lineas = [
+        f"- {stock.producto.nombre}: {stock.cantidad} ud. (mínimo {stock.stock_minimo})"
+        for stock in stocks
+    ]
+    return Notificacion(
+        tipo="BAJO_MINIMO",
+        clave=_clave_bajo_minimo(ubicacion.pk),
+        asunto=f"Stock bajo mínimo en {ubicacion.nombre}: {len(stocks)} productos",
+        cuerpo="\n".join(lineas),
+        datos={
+            "ubicacion_id": ubicacion.pk,
+            "productos": [
+                {"producto_id": s.producto_id, "cantidad": s.cantidad, "stock_minimo": s.stock_minimo}
+                for s in stocks
+            ],
+        },
+        enviada_en=ahora,
+    )
+
+
+def notificar_bajo_minimo(
+    backend: Backend | None = None,
+    ubicacion_ids: Iterable[int] | None = None,
+    ahora: datetime | None = None,
+) -> dict:
+    """
+    Un resumen por ubicación con todos sus productos bajo mínimo.
+
+    - Los stocks se buscan con una consulta (StockUbicacion.objects.bajo_minimo()).
+    - Una ubicación notificada hace menos de NOTIFICACIONES_INTERVALO_MINIMO
+      segundos se omite (límite de frecuencia por ubicación).
+    - Cada resumen entregado queda en Notificacion (una inserción por lote).
+
+    Retorna {"ok": True, "enviadas": int, "omitidas": int, "fallidas": int, "productos": int}
+    """
+    backend = backend or obtener_backend()
+    ahora = ahora or timezone.now()
+
+    stocks = StockUbicacion.objects.bajo_minimo().select_related("ubicacion", "producto")
+    if ubicacion_ids is not None:
+        stocks = stocks.filter(ubicacion_id__in=list(ubicacion_ids))
+    stocks = list(stocks.order_by("ubicacion_id", "producto__nombre"))
+
+    por_ubicacion = [
+        (ubicacion_id, list(grupo))
+        for ubicacion_id, grupo in groupby(stocks, key=lambda stock: stock.ubicacion_id)
+    ]
+    recientes = claves_recientes(
+        [_clave_bajo_minimo(ubicacion_id) for ubicacion_id, _ in por_ubicacion], ahora
+    ) if por_ubicacion else set()
+
+    enviadas: list[Notificacion] = []
+    omitidas = fallidas = 0
+    for ubicacion_id, grupo in por_ubicacion:
+        if _clave_bajo_minimo(ubicacion_id) in recientes:
+            omitidas += 1
+            continue
+        notificacion = _resumen_ubicacion(grupo[0].ubicacion, grupo, ahora)
+        notificacion.backend = nombre_backend(backend)
+        try:
+            backend.enviar(notificacion)
+        except Exception:
+            # Sin registro: se reintenta en la próxima ejecución
+            fallidas += 1
+            continue
+        enviadas.append(notificacion)
+
+    Notificacion.objects.bulk_create(enviadas)
+    return {
+        "ok": True,
+        "enviadas": len(enviadas),
+        "omitidas": omitidas,
+        "fallidas": fallidas,
+        "productos": len(stocks),
+    }
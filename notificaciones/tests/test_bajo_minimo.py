@@ -0,0 +1,88 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Pruebas unitarias para las notificaciones de stock bajo mínimo
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+import json
+import os
+import tempfile
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from inventario.models import StockUbicacion, Ubicacion
+from notificaciones.backends import BackendArchivo, BackendMemoria, obtener_backend
+from notificaciones.models import Notificacion
+from notificaciones.services import notificar_bajo_minimo
+from productos.models import Producto
+
+
+class NotificacionBajoMinimoTests(TestCase):
+
+    def setUp(self):
+        self.bodega = Ubicacion.objects.create(codigo="BOD-N", nombre="Bodega", tipo="BODEGA")
+        self.camion = Ubicacion.objects.create(codigo="VEH-N", nombre="Camión", tipo="VEHICULO")
+        productos = [
+            Producto.objects.create(
+                codigo=f"P-N{i}", nombre=f"Producto {i}", presentacion_litros=20, precio_lista=1000
+            )
+            for i in range(3)
+        ]
+        # Bodega: 2 bajo mínimo y 1 sin mínimo; camión: 1 bajo mínimo
+        StockUbicacion.objects.create(ubicacion=self.bodega, producto=productos[0], cantidad=2, stock_minimo=10)
+        StockUbicacion.objects.create(ubicacion=self.bodega, producto=productos[1], cantidad=9, stock_minimo=10)
+        StockUbicacion.objects.create(ubicacion=self.bodega, producto=productos[2], cantidad=0)
+        StockUbicacion.objects.create(ubicacion=self.camion, producto=productos[0], cantidad=1, stock_minimo=5)
+        StockUbicacion.objects.create(ubicacion=self.camion, producto=productos[1], cantidad=5, stock_minimo=5)
+
+    def test_bajo_minimo_filtra_en_la_base(self):
+        stocks = StockUbicacion.objects.bajo_minimo()
+
+        self.assertEqual(stocks.count(), 3)
+        self.assertTrue(all(stock.esta_bajo_minimo() for stock in stocks))
+
+    def test_un_resumen_por_ubicacion_con_limite_de_frecuencia(self):
+        backend = BackendMemoria()
+
+        with self.assertNumQueries(3):
+            resultado = notificar_bajo_minimo(backend)
+
+        self.assertEqual((resultado["enviadas"], resultado["productos"]), (2, 3))
+        resumen_bodega = next(n for n in backend.enviadas if n.datos["ubicacion_id"] == self.bodega.pk)
+        self.assertEqual(len(resumen_bodega.datos["productos"]), 2)
+        self.assertIn("Producto 0: 2 ud. (mínimo 10)", resumen_bodega.cuerpo)
+        self.assertEqual(Notificacion.objects.count(), 2)
+
+        repetido = notificar_bajo_minimo(backend)
+        self.assertEqual((repetido["enviadas"], repetido["omitidas"]), (0, 2))
+
+        despues = notificar_bajo_minimo(backend, ahora=timezone.now() + timedelta(hours=2))
+        self.assertEqual(despues["enviadas"], 2)
+
+    def test_backend_que_falla_no_registra_y_se_reintenta(self):
+        class BackendCaido:
+            def enviar(self, notificacion):
+                raise ConnectionError("sin red")
+
+        resultado = notificar_bajo_minimo(BackendCaido(), ubicacion_ids=[self.camion.pk])
+
+        self.assertEqual((resultado["enviadas"], resultado["fallidas"]), (0, 1))
+        self.assertEqual(notificar_bajo_minimo(BackendMemoria(), ubicacion_ids=[self.camion.pk])["enviadas"], 1)
+
+    def test_backend_archivo_desde_settings(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "avisos.jsonl")
+            with override_settings(
+                NOTIFICACIONES_BACKEND="notificaciones.backends.BackendArchivo",
+                NOTIFICACIONES_BACKEND_OPCIONES={"ruta": ruta},
+            ):
+                self.assertIsInstance(obtener_backend(), BackendArchivo)
+                notificar_bajo_minimo()
+
+            with open(ruta, encoding="utf-8") as archivo:
+                lineas = [json.loads(linea) for linea in archivo]
+        self.assertEqual(len(lineas), 2)
+        self.assertEqual(Notificacion.objects.filter(backend="BackendArchivo").count(), 2)
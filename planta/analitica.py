@@ -0,0 +1,319 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Consumo, llenado y proyección de vaciado por estanque
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+"""
+Analítica de estanques a partir de las lecturas de NIVEL.
+
+- calcular_consumos(): recorre las lecturas en streaming (iterator con
+  chunk_size), las convierte a litros (planta.geometria), las suaviza con
+  una media móvil y suma las variaciones negativas (consumo) y positivas
+  (llenado) de cada día. Persiste ConsumoDiarioEstanque.
+- proyectar_vaciado(): tasa reciente (pendiente de la serie suavizada) y
+  horas hasta vaciar el estanque.
+- panel_estanques(): lectura barata de lo precalculado para el panel.
+
+Con NumPy instalado, suavizado, derivadas y pendiente se calculan
+vectorizados; sin NumPy se usa la misma lógica en Python puro.
+"""
+from __future__ import annotations
+
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Iterable
+
+from django.conf import settings
+from django.utils import timezone
+
+from planta.geometria import curva_estanque
+from planta.models import ConsumoDiarioEstanque, Estanque
+from sensores.models import Lectura, Sensor
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+
+def _ventana_defecto() -> int:
+    return getattr(settings, "PLANTA_CONSUMO_VENTANA", 5)
+
+
+def _decimal(valor: float) -> Decimal:
+    return Decimal(str(round(valor, 2)))
+
+
+# ================================================================
+# 1) CÁLCULO NUMÉRICO
+# ================================================================
+def suavizar(valores: list[float], ventana: int, previos: list[float] = ()) -> list[float]:
+    """
+    Media móvil "hacia atrás" de 'ventana' puntos. 'previos' son los últimos
+    valores crudos del tramo anterior (continuidad entre días); el resultado
+    tiene un valor por cada elemento de 'valores'.
+    """
+    previos = list(previos)
+    if np is not None:
+        serie = np.asarray(previos + list(valores), dtype=float)
+        acumulada = np.concatenate(([0.0], np.cumsum(serie)))
+        idx = np.arange(len(serie))
+        desde = np.maximum(0, idx - ventana + 1)
+        medias = (acumulada[idx + 1] - acumulada[desde]) / (idx + 1 - desde)
+        return medias[len(previos):].tolist()
+
+    resultado = []
+    buffer = deque(previos[-(ventana - 1):] if ventana > 1 else [], maxlen=ventana)
+    suma = sum(buffer)
+    for valor in valores:
+        if len(buffer) == ventana:
+            suma -= buffer[0]
+        buffer.append(valor)
+        suma += valor
+        resultado.append(suma / len(buffer))
+    return resultado
+
+
+def variaciones(suavizados: list[float], anterior: float | None = None) -> tuple[float, float]:
+    """(litros consumidos, litros llenados): suma de bajadas y de subidas."""
+    serie = ([anterior] if anterior is not None else []) + list(suavizados)
+    if len(serie) < 2:
+        return 0.0, 0.0
+    if np is not None:
+        diferencias = np.diff(np.asarray(serie, dtype=float))
+        return float(-diferencias[diferencias < 0].sum()), float(diferencias[diferencias > 0].sum())
+
+    consumido = llenado = 0.0
+    for previo, actual in zip(serie, serie[1:]):
+        delta = actual - previo
+        if delta < 0:
+            consumido -= delta
+        else:
+            llenado += delta
+    return consumido, llenado
+
+
+def pendiente(horas: list[float], valores: list[float]) -> float:
+    """Pendiente por mínimos cuadrados (unidades de 'valores' por hora)."""
+    n = len(horas)
+    if n < 2:
+        return 0.0
+    if np is not None:
+        x = np.asarray(horas, dtype=float)
+        y = np.asarray(valores, dtype=float)
+        dx = x - x.mean()
+        denominador = float((dx * dx).sum())
+        return float((dx * (y - y.mean())).sum() / denominador) if denominador else 0.0
+
+    media_x = sum(horas) / n
+    media_y = sum(valores) / n
+    denominador = sum((x - media_x) ** 2 for x in horas)
+    if not denominador:
+        return 0.0
+    return sum((x - media_x) * (y - media_y) for x, y in zip(horas, valores)) / denominador
+
+
+# ================================================================
+# 2) CONSUMO DIARIO (persistido)
+# ================================================================
+@dataclass
+class _Continuidad:
+    """Lo que un día necesita del anterior para suavizar y derivar sin saltos."""
+    crudos: list[float] = field(default_factory=list)
+    ultimo_suavizado: float | None = None
+    ultima_fecha: datetime | None = None
+
+
+def sensor_nivel(estanque_id: int) -> int | None:
+    """Sensor de NIVEL del estanque (el activo más antiguo si hay varios)."""
+    return (
+        Sensor.objects.filter(estanque_id=estanque_id, tipo="NIVEL")
+        .order_by("-activo", "pk")
+        .values_list("pk", flat=True)
+        .first()
+    )
+
+
+def _resumir_dia(
+    estanque_id: int, dia: date, fechas: list[datetime], volumenes: list[float],
+    continuidad: _Continuidad, ventana: int,
+) -> ConsumoDiarioEstanque:
+    suavizados = suavizar(volumenes, ventana, continuidad.crudos)
+    consumido, llenado = variaciones(suavizados, continuidad.ultimo_suavizado)
+
+    inicio = continuidad.ultima_fecha or fechas[0]
+    horas = (fechas[-1] - inicio).total_seconds() / 3600
+
+    continuidad.crudos = (continuidad.crudos + volumenes)[-(ventana - 1):] if ventana > 1 else []
+    continuidad.ultimo_suavizado = suavizados[-1]
+    continuidad.ultima_fecha = fechas[-1]
+
+    return ConsumoDiarioEstanque(
+        estanque_id=estanque_id,
+        fecha=dia,
+        litros_consumidos=_decimal(consumido),
+        litros_llenados=_decimal(llenado),
+        consumo_litros_hora=_decimal(consumido / horas) if horas > 0 else Decimal("0"),
+        llenado_litros_hora=_decimal(llenado / horas) if horas > 0 else Decimal("0"),
+        volumen_final_litros=_decimal(suavizados[-1]),
+        lecturas=len(volumenes),
+    )
+
+
+def _guardar(filas: list[ConsumoDiarioEstanque]) -> None:
+    ConsumoDiarioEstanque.objects.bulk_create(
+        filas,
+        update_conflicts=True,
+        unique_fields=["estanque", "fecha"],
+        update_fields=[
+            "litros_consumidos", "litros_llenados", "consumo_litros_hora",
+            "llenado_litros_hora", "volumen_final_litros", "lecturas", "calculado_en",
+        ],
+    )
+
+
+def calcular_consumo_estanque(
+    estanque_id: int,
+    desde: datetime,
+    hasta: datetime,
+    ventana: int | None = None,
+    chunk_size: int = 5000,
+) -> int:
+    """
+    Calcula y guarda el consumo diario del estanque en [desde, hasta).
+    Las lecturas se leen en streaming y se procesan día a día (hora local),
+    así que la memoria depende de las lecturas de un día, no del rango.
+    Retorna la cantidad de días escritos.
+    """
+    ventana = ventana or _ventana_defecto()
+    sensor_id = sensor_nivel(estanque_id)
+    if sensor_id is None:
+        return 0
+    curva = curva_estanque(estanque_id)
+
+    # Continuidad con lo anterior a 'desde' (suavizado y primera variación)
+    continuidad = _Continuidad()
+    previas = list(
+        Lectura.objects.filter(sensor_id=sensor_id, fecha_hora__lt=desde)
+        .order_by("-fecha_hora")
+        .values_list("fecha_hora", "valor")[:ventana]
+    )[::-1]
+    if previas:
+        volumenes, _ = curva.convertir_valores(v for _, v in previas)
+        continuidad.crudos = volumenes[-(ventana - 1):] if ventana > 1 else []
+        continuidad.ultimo_suavizado = suavizar(volumenes, ventana)[-1]
+        continuidad.ultima_fecha = previas[-1][0]
+
+    lecturas = (
+        Lectura.objects.filter(sensor_id=sensor_id, fecha_hora__gte=desde, fecha_hora__lt=hasta)
+        .order_by("fecha_hora")
+        .values_list("fecha_hora", "valor")
+        .iterator(chunk_size=chunk_size)
+    )
+
+    filas: list[ConsumoDiarioEstanque] = []
+    dia_actual: date | None = None
+    fechas: list[datetime] = []
+    valores: list = []
+
+    def cerrar_dia():
+        volumenes, _ = curva.convertir_valores(valores)
+        filas.append(_resumir_dia(estanque_id, dia_actual, fechas, volumenes, continuidad, ventana))
+
+    for fecha, valor in lecturas:
+        dia = timezone.localdate(fecha)
+        if dia != dia_actual:
+            if fechas:
+                cerrar_dia()
+            dia_actual, fechas, valores = dia, [], []
+        fechas.append(fecha)
+        valores.append(valor)
+    if fechas:
+        cerrar_dia()
+
+    for i in range(0, len(filas), 500):
+        _guardar(filas[i:i + 500])
+    return len(filas)
+
+
+def calcular_consumos(
+    desde: datetime,
+    hasta: datetime,
+    estanque_ids: Iterable[int] | None = None,
+    ventana: int | None = None,
+    chunk_size: int = 5000,
+) -> int:
+    """calcular_consumo_estanque para cada estanque (o los indicados). Retorna días escritos."""
+    estanques = Estanque.objects.filter(sensores__tipo="NIVEL").distinct()
+    if estanque_ids is not None:
+        estanques = estanques.filter(pk__in=list(estanque_ids))
+
+    total = 0
+    for estanque_id in estanques.values_list("pk", flat=True):
+        total += calcular_consumo_estanque(estanque_id, desde, hasta, ventana, chunk_size)
+    return total
+
+
+# ================================================================
+# 3) PROYECCIÓN Y PANEL
+# ================================================================
+def proyectar_vaciado(estanque_id: int, horas: float = 6, ventana: int | None = None) -> dict:
+    """
+    Tasa reciente (L/h, negativa = consumo) según la pendiente de la serie
+    suavizada de las últimas 'horas', y horas hasta vaciar al ritmo actual.
+    """
+    ventana = ventana or _ventana_defecto()
+    sensor_id = sensor_nivel(estanque_id)
+    if sensor_id is None:
+        return {"ok": False, "error": "El estanque no tiene sensor de NIVEL"}
+
+    ahora = timezone.now()
+    puntos = list(
+        Lectura.objects.filter(sensor_id=sensor_id, fecha_hora__gte=ahora - timedelta(hours=horas))
+        .order_by("fecha_hora")
+        .values_list("fecha_hora", "valor")
+    )
+    if len(puntos) < 2:
+        return {"ok": False, "error": "Lecturas insuficientes"}
+
+    volumenes, _ = curva_estanque(estanque_id).convertir_valores(v for _, v in puntos)
+    suavizados = suavizar(volumenes, ventana)
+    inicio = puntos[0][0]
+    tasa = pendiente([(f - inicio).total_seconds() / 3600 for f, _ in puntos], suavizados)
+
+    volumen = suavizados[-1]
+    return {
+        "ok": True,
+        "volumen_litros": round(volumen, 2),
+        "tasa_litros_hora": round(tasa, 2),
+        "horas_para_vaciar": round(volumen / -tasa, 1) if tasa < 0 else None,
+    }
+
+
+def panel_estanques(dias: int = 7) -> list[dict]:
+    """
+    Datos del panel: volumen actual y consumos de los últimos 'dias' por
+    estanque, en dos consultas (nada se calcula aquí).
+    """
+    desde = timezone.localdate() - timedelta(days=dias - 1)
+    consumos: dict[int, list[dict]] = defaultdict(list)
+    for fila in ConsumoDiarioEstanque.objects.filter(fecha__gte=desde).order_by("fecha").values(
+        "estanque_id", "fecha", "litros_consumidos", "litros_llenados", "consumo_litros_hora"
+    ):
+        consumos[fila.pop("estanque_id")].append(fila)
+
+    return [
+        {
+            "id": estanque.pk,
+            "codigo": estanque.codigo,
+            "nombre": estanque.nombre,
+            "volumen_actual_litros": estanque.volumen_actual_litros,
+            "porcentaje": estanque.porcentaje_actual(),
+            "consumos": consumos.get(estanque.pk, []),
+        }
+        for estanque in Estanque.objects.filter(activo=True).order_by("codigo")
+    ]
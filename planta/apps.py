@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class PlantaConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'planta'
+
+    def ready(self):
+        # Señales que invalidan el caché de curvas altura -> volumen
+        from . import signals  # noqa
@@ -0,0 +1,185 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Conversión de lecturas de nivel (cm) a volumen (L) por estanque
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+"""
+Geometría de estanques: curva altura -> volumen (lineal por tramos, desde
+PuntoCalibracionEstanque) y conversión de lecturas del sensor de NIVEL.
+
+Las curvas se cachean por proceso (las invalidan las señales de planta).
+convertir_valores() convierte una serie completa en una pasada: con NumPy
+instalado usa numpy.interp; si no, bisect por valor.
+"""
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterable
+
+from django.conf import settings
+from django.db.models import Q
+
+from planta.models import Estanque, PuntoCalibracionEstanque
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+
+class CurvaVolumen:
+    """Curva altura (cm) -> volumen (L) de un estanque, con su modo de lectura."""
+
+    def __init__(
+        self,
+        alturas: list[float],
+        volumenes: list[float],
+        capacidad_litros: float,
+        modo_lectura: str = "ALTURA",
+        altura_sensor_cm: float | None = None,
+    ):
+        self.alturas = alturas
+        self.volumenes = volumenes
+        self.capacidad_litros = capacidad_litros
+        self.modo_lectura = modo_lectura
+        self.altura_sensor_cm = altura_sensor_cm if altura_sensor_cm is not None else alturas[-1]
+
+    @classmethod
+    def de_estanque(cls, estanque: Estanque, puntos: Iterable[tuple] = ()) -> "CurvaVolumen":
+        """Curva desde la calibración (pares altura, volumen); sin puntos, lineal."""
+        pares = sorted((float(h), float(v)) for h, v in puntos)
+        if not pares:
+            pares = [(float(estanque.altura_cm), float(estanque.capacidad_litros))]
+        if pares[0][0] > 0:
+            pares.insert(0, (0.0, 0.0))
+        return cls(
+            [h for h, _ in pares],
+            [v for _, v in pares],
+            float(estanque.capacidad_litros),
+            estanque.modo_lectura_nivel,
+            float(estanque.altura_sensor_cm) if estanque.altura_sensor_cm is not None else float(estanque.altura_cm),
+        )
+
+    def altura_liquido(self, valor_cm: float) -> float:
+        if self.modo_lectura == "DISTANCIA":
+            return self.altura_sensor_cm - valor_cm
+        return valor_cm
+
+    def volumen(self, altura_cm: float) -> float:
+        """Interpolación lineal; fuera de la curva se usa el extremo más cercano."""
+        if altura_cm <= self.alturas[0]:
+            return self.volumenes[0]
+        if altura_cm >= self.alturas[-1]:
+            return self.volumenes[-1]
+        i = bisect.bisect_right(self.alturas, altura_cm)
+        h0, h1 = self.alturas[i - 1], self.alturas[i]
+        v0, v1 = self.volumenes[i - 1], self.volumenes[i]
+        return v0 + (v1 - v0) * (altura_cm - h0) / (h1 - h0)
+
+    def volumen_de_lectura(self, valor_cm) -> float:
+        return self.volumen(self.altura_liquido(float(valor_cm)))
+
+    def porcentaje(self, volumen_litros: float) -> float:
+        if self.capacidad_litros <= 0:
+            return 0.0
+        return volumen_litros / self.capacidad_litros * 100
+
+    def convertir_valores(self, valores: Iterable) -> tuple[list[float], list[float]]:
+        """Serie de lecturas (cm) -> (volúmenes en L, porcentajes), en una pasada."""
+        if np is not None:
+            crudos = np.fromiter((float(v) for v in valores), dtype=float)
+            if self.modo_lectura == "DISTANCIA":
+                crudos = self.altura_sensor_cm - crudos
+            volumenes = np.interp(crudos, self.alturas, self.volumenes)
+            if self.capacidad_litros > 0:
+                porcentajes = volumenes / self.capacidad_litros * 100
+            else:
+                porcentajes = np.zeros_like(volumenes)
+            return volumenes.tolist(), porcentajes.tolist()
+
+        volumenes = [self.volumen_de_lectura(v) for v in valores]
+        return volumenes, [self.porcentaje(v) for v in volumenes]
+
+
+# ================================================================
+# 1) CACHÉ DE CURVAS
+# ================================================================
+# estanque_id -> (instante de expiración, CurvaVolumen)
+_curvas: dict[int, tuple[float, CurvaVolumen]] = {}
+_lock = threading.Lock()
+
+
+def _ttl() -> float:
+    return getattr(settings, "PLANTA_CURVAS_CACHE_TTL", 300)
+
+
+def curva_estanque(estanque_id: int) -> CurvaVolumen:
+    """Curva cacheada del estanque (dos consultas la primera vez)."""
+    entrada = _curvas.get(estanque_id)
+    if entrada is not None and entrada[0] > time.monotonic():
+        return entrada[1]
+
+    estanque = Estanque.objects.get(pk=estanque_id)
+    puntos = PuntoCalibracionEstanque.objects.filter(estanque_id=estanque_id).values_list(
+        "altura_cm", "volumen_litros"
+    )
+    curva = CurvaVolumen.de_estanque(estanque, puntos)
+    with _lock:
+        _curvas[estanque_id] = (time.monotonic() + _ttl(), curva)
+    return curva
+
+
+def invalidar_curva(estanque_id: int) -> None:
+    with _lock:
+        _curvas.pop(estanque_id, None)
+
+
+def limpiar_curvas() -> None:
+    with _lock:
+        _curvas.clear()
+
+
+# ================================================================
+# 2) VOLUMEN ACTUAL (ingesta)
+# ================================================================
+def actualizar_volumen_estanque(estanque_id: int, valor_cm, fecha_hora: datetime) -> bool:
+    """
+    Guarda el volumen correspondiente a la lectura de nivel en el estanque,
+    salvo que ya tenga uno más reciente (lecturas atrasadas). Una sola
+    sentencia UPDATE; retorna True si se actualizó.
+
+    Un estanque eliminado (o un estanque_id desactualizado en la caché de
+    sensores) no interrumpe la ingesta: se omite y retorna False.
+    """
+    try:
+        curva = curva_estanque(estanque_id)
+    except Estanque.DoesNotExist:
+        return False
+    volumen = curva.volumen_de_lectura(valor_cm)
+    return bool(
+        Estanque.objects.filter(pk=estanque_id)
+        .filter(Q(volumen_actualizado_en__isnull=True) | Q(volumen_actualizado_en__lte=fecha_hora))
+        .update(
+            volumen_actual_litros=Decimal(str(round(volumen, 2))),
+            volumen_actualizado_en=fecha_hora,
+        )
+    )
+
+
+def convertir_serie(estanque_id: int, puntos: Iterable[tuple[datetime, object]]) -> list[dict]:
+    """
+    Serie (fecha_hora, valor_cm) -> [{"fecha_hora", "volumen_litros", "porcentaje"}],
+    ej: Lectura.objects.filter(sensor=...).values_list("fecha_hora", "valor").
+    """
+    puntos = list(puntos)
+    volumenes, porcentajes = curva_estanque(estanque_id).convertir_valores(v for _, v in puntos)
+    return [
+        {"fecha_hora": fecha, "volumen_litros": round(volumen, 2), "porcentaje": round(porcentaje, 2)}
+        for (fecha, _), volumen, porcentaje in zip(puntos, volumenes, porcentajes)
+    ]
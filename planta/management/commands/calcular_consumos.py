@@ -0,0 +1,54 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Comando para calcular el consumo diario de los estanques
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from datetime import date, datetime, time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from planta.analitica import calcular_consumos
+
+
+def _parsear_dia(valor: str) -> datetime:
+    try:
+        dia = date.fromisoformat(valor)
+    except ValueError:
+        raise CommandError(f"Fecha inválida (use AAAA-MM-DD): {valor}")
+    return timezone.make_aware(datetime.combine(dia, time.min))
+
+
+class Command(BaseCommand):
+    help = (
+        "Calcula el consumo y llenado diario (L y L/h) de cada estanque desde "
+        "las lecturas de NIVEL y lo guarda en ConsumoDiarioEstanque "
+        "(por defecto, ayer y hoy)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--desde", help="Día inicial AAAA-MM-DD (incluido)")
+        parser.add_argument("--hasta", help="Día final AAAA-MM-DD (incluido)")
+        parser.add_argument("--estanque", type=int, action="append", dest="estanques")
+        parser.add_argument("--ventana", type=int, default=None, help="Puntos de la media móvil")
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        hoy = timezone.localdate()
+        desde = _parsear_dia(options["desde"]) if options["desde"] else _parsear_dia(
+            (hoy - timedelta(days=1)).isoformat()
+        )
+        hasta = _parsear_dia(options["hasta"] or hoy.isoformat()) + timedelta(days=1)
+        if hasta <= desde:
+            raise CommandError("--hasta debe ser igual o posterior a --desde.")
+
+        total = calcular_consumos(
+            desde,
+            hasta,
+            estanque_ids=options["estanques"],
+            ventana=options["ventana"],
+            chunk_size=options["chunk_size"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"{total} días de consumo escritos."))
@@ -18,6 +18,24 @@ class Estanque(BaseModel):
         help_text="Altura física aproximada del estanque (para cálculo de nivel)"
     )
 
+    # Cómo interpretar el valor del sensor de NIVEL (cm), ver planta.geometria
+    MODO_LECTURA_NIVEL = [
+        ("ALTURA", "Altura del líquido desde el fondo"),
+        ("DISTANCIA", "Distancia del sensor a la superficie (ultrasónico arriba)"),
+    ]
+    modo_lectura_nivel = models.CharField(max_length=10, choices=MODO_LECTURA_NIVEL, default="ALTURA")
+    altura_sensor_cm = models.DecimalField(
+        max_digits=8,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        help_text="Altura del sensor sobre el fondo (modo DISTANCIA). Vacío = altura_cm",
+    )
+
+    # Volumen actual, mantenido en la ingesta de lecturas de NIVEL
+    volumen_actual_litros = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    volumen_actualizado_en = models.DateTimeField(null=True, blank=True)
+
     class Meta:
         verbose_name = "Estanque"
         verbose_name_plural = "Estanques"
@@ -41,4 +59,60 @@ class Estanque(BaseModel):
         """
         Indica si el volumen actual supera la capacidad nominal del estanque.
         """
-        return float(volumen_actual_litros) > float(self.capacidad_litros)
\ No newline at end of file
+        return float(volumen_actual_litros) > float(self.capacidad_litros)
+
+    def porcentaje_actual(self) -> float | None:
+        """Nivel en % según el volumen cacheado (None si aún no hay lecturas)."""
+        if self.volumen_actual_litros is None:
+            return None
+        return self.nivel_porcentaje(float(self.volumen_actual_litros))
+
+
+class PuntoCalibracionEstanque(models.Model):
+    """
+    Punto de la curva altura -> volumen de un estanque. Entre puntos se
+    interpola linealmente; sin puntos se asume un estanque de sección
+    constante (0 cm = 0 L, altura_cm = capacidad_litros).
+    """
+    estanque = models.ForeignKey(Estanque, on_delete=models.CASCADE, related_name="calibracion")
+    altura_cm = models.DecimalField(max_digits=8, decimal_places=2)
+    volumen_litros = models.DecimalField(max_digits=10, decimal_places=2)
+
+    class Meta:
+        verbose_name = "Punto de calibración"
+        verbose_name_plural = "Puntos de calibración"
+        ordering = ["estanque", "altura_cm"]
+        constraints = [
+            models.UniqueConstraint(fields=["estanque", "altura_cm"], name="calibracion_altura_unica"),
+        ]
+
+    def __str__(self):
+        return f"{self.estanque.codigo}: {self.altura_cm} cm = {self.volumen_litros} L"
+
+
+class ConsumoDiarioEstanque(models.Model):
+    """
+    Resumen diario (hora local) de consumo y llenado de un estanque, calculado
+    desde las lecturas de NIVEL por planta.analitica. Lo lee el panel.
+    """
+    estanque = models.ForeignKey(Estanque, on_delete=models.CASCADE, related_name="consumos_diarios")
+    fecha = models.DateField()
+    litros_consumidos = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    litros_llenados = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    # Tasas sobre las horas cubiertas por lecturas (primera a última del día)
+    consumo_litros_hora = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    llenado_litros_hora = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    volumen_final_litros = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    lecturas = models.PositiveIntegerField(default=0)
+    calculado_en = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Consumo diario de estanque"
+        verbose_name_plural = "Consumos diarios de estanques"
+        ordering = ["estanque", "-fecha"]
+        constraints = [
+            models.UniqueConstraint(fields=["estanque", "fecha"], name="consumo_diario_unico"),
+        ]
+
+    def __str__(self):
+        return f"{self.estanque.codigo} {self.fecha}: -{self.litros_consumidos} L / +{self.litros_llenados} L"
@@ -0,0 +1,24 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Señales para mantener coherente el caché de curvas de estanques
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .geometria import invalidar_curva
+from .models import Estanque, PuntoCalibracionEstanque
+
+
+@receiver(post_save, sender=Estanque)
+@receiver(post_delete, sender=Estanque)
+def invalidar_curva_por_cambio_estanque(sender, instance, **kwargs):
+    invalidar_curva(instance.pk)
+
+
+@receiver(post_save, sender=PuntoCalibracionEstanque)
+@receiver(post_delete, sender=PuntoCalibracionEstanque)
+def invalidar_curva_por_cambio_calibracion(sender, instance, **kwargs):
+    invalidar_curva(instance.estanque_id)
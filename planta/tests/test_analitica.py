@@ -0,0 +1,112 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Pruebas unitarias para la analítica de consumo de estanques
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from datetime import datetime, timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from inventario.models import Ubicacion
+from planta import analitica
+from planta.analitica import (
+    calcular_consumo_estanque,
+    panel_estanques,
+    proyectar_vaciado,
+    suavizar,
+)
+from planta.models import ConsumoDiarioEstanque, Estanque
+from sensores.models import Lectura, Sensor
+
+
+def _local(dia: int, hora: int) -> datetime:
+    return timezone.make_aware(datetime(2026, 10, dia, hora))
+
+
+class AnaliticaEstanqueTests(TestCase):
+
+    def setUp(self):
+        self.ubic = Ubicacion.objects.create(codigo="UB-AN", nombre="Zona AN")
+        # 1000 L en 100 cm: 1 cm = 10 L
+        self.estanque = Estanque.objects.create(
+            codigo="EST-AN", nombre="Estanque AN", capacidad_litros=1000,
+            ubicacion=self.ubic, altura_cm=100,
+        )
+        self.sensor = Sensor.objects.create(
+            codigo="S-AN", nombre="Nivel", tipo="NIVEL", unidad="cm",
+            ubicacion=self.ubic, estanque=self.estanque,
+        )
+
+    def cargar(self, puntos):
+        Lectura.objects.bulk_create([
+            Lectura(sensor=self.sensor, valor=valor, unidad="cm", fecha_hora=fecha, origen="SIMULADA")
+            for fecha, valor in puntos
+        ])
+
+    def test_suavizar_con_y_sin_numpy(self):
+        self.assertEqual(suavizar([1, 2, 3, 4], 2), [1, 1.5, 2.5, 3.5])
+        self.assertEqual(suavizar([1, 2, 3, 4], 2, previos=[0]), [0.5, 1.5, 2.5, 3.5])
+        with mock.patch.object(analitica, "np", None):
+            self.assertEqual(suavizar([1, 2, 3, 4], 2, previos=[0]), [0.5, 1.5, 2.5, 3.5])
+
+    def test_consumo_y_llenado_diario(self):
+        # Baja de 80 a 60 cm en 10 h (200 L) y luego se llena hasta 90 cm (300 L)
+        puntos = [(_local(1, h), 80 - 2 * h) for h in range(11)]
+        puntos += [(_local(1, 11 + h), 70 + 10 * h) for h in range(3)]
+        self.cargar(puntos)
+
+        dias = calcular_consumo_estanque(self.estanque.pk, _local(1, 0), _local(2, 0), ventana=1)
+
+        self.assertEqual(dias, 1)
+        consumo = ConsumoDiarioEstanque.objects.get(estanque=self.estanque)
+        self.assertEqual(consumo.litros_consumidos, 200)
+        self.assertEqual(consumo.litros_llenados, 300)
+        self.assertEqual(consumo.lecturas, 14)
+        self.assertEqual(consumo.volumen_final_litros, 900)
+
+    def test_dias_consecutivos_sin_salto_en_el_borde(self):
+        # Consumo constante de 1 cm/h durante dos días
+        self.cargar([(_local(1, 0) + timedelta(hours=h), 90 - h) for h in range(48)])
+
+        calcular_consumo_estanque(self.estanque.pk, _local(1, 0), _local(3, 0), ventana=3)
+        por_dia = dict(ConsumoDiarioEstanque.objects.values_list("fecha", "litros_consumidos"))
+
+        # 900 -> 430 L crudos; la media móvil de 3 puntos termina en 440 L.
+        # El segundo día incluye la bajada entre las 23:00 y las 00:00
+        self.assertEqual(sum(por_dia.values()), 460)
+        self.assertEqual(por_dia[_local(2, 0).date()], 240)
+
+        # Recalcular sólo el segundo día da lo mismo (continuidad desde las lecturas previas)
+        calcular_consumo_estanque(self.estanque.pk, _local(2, 0), _local(3, 0), ventana=3)
+        self.assertEqual(
+            ConsumoDiarioEstanque.objects.get(fecha=_local(2, 0).date()).litros_consumidos, 240
+        )
+
+    def test_proyeccion_de_vaciado(self):
+        ahora = timezone.now()
+        # 50 cm y bajando 5 cm/h: 500 L a 50 L/h
+        self.cargar([(ahora - timedelta(hours=4 - h), 70 - 5 * h) for h in range(5)])
+
+        proyeccion = proyectar_vaciado(self.estanque.pk, horas=6, ventana=1)
+
+        self.assertEqual(proyeccion["tasa_litros_hora"], -50)
+        self.assertEqual(proyeccion["horas_para_vaciar"], 10)
+
+    def test_comando_y_panel(self):
+        hoy = timezone.localdate()
+        inicio = timezone.make_aware(datetime.combine(hoy, datetime.min.time()))
+        self.cargar([(inicio + timedelta(minutes=10 * i), 50 - i) for i in range(3)])
+
+        salida = StringIO()
+        call_command("calcular_consumos", stdout=salida)
+        self.assertIn("1 días de consumo escritos", salida.getvalue())
+
+        panel = panel_estanques(dias=7)
+        fila = next(e for e in panel if e["codigo"] == "EST-AN")
+        self.assertEqual(len(fila["consumos"]), 1)
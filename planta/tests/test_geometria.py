@@ -0,0 +1,83 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Pruebas unitarias para la conversión nivel -> volumen de estanques
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils.timezone import now
+
+from inventario.models import Ubicacion
+from planta import geometria
+from planta.geometria import convertir_serie, curva_estanque
+from planta.models import Estanque, PuntoCalibracionEstanque
+from sensores.models import Sensor
+from sensores.services import registrar_lectura
+
+
+class GeometriaEstanqueTests(TestCase):
+
+    def setUp(self):
+        self.ubic = Ubicacion.objects.create(codigo="UB-GE", nombre="Zona GE")
+        self.estanque = Estanque.objects.create(
+            codigo="EST-GE",
+            nombre="Estanque GE",
+            capacidad_litros=1000,
+            ubicacion=self.ubic,
+            altura_cm=100,
+        )
+
+    def test_curva_lineal_sin_calibracion(self):
+        curva = curva_estanque(self.estanque.pk)
+        self.assertEqual(curva.volumen_de_lectura(50), 500)
+        self.assertEqual(curva.volumen_de_lectura(150), 1000)  # tope de la curva
+
+    def test_calibracion_por_tramos(self):
+        # Fondo cónico: los primeros 20 cm sólo contienen 100 L
+        PuntoCalibracionEstanque.objects.create(estanque=self.estanque, altura_cm=20, volumen_litros=100)
+        PuntoCalibracionEstanque.objects.create(estanque=self.estanque, altura_cm=100, volumen_litros=1000)
+
+        curva = curva_estanque(self.estanque.pk)
+        self.assertEqual(curva.volumen_de_lectura(10), 50)
+        self.assertAlmostEqual(curva.volumen_de_lectura(60), 550)
+
+    def test_modo_distancia(self):
+        self.estanque.modo_lectura_nivel = "DISTANCIA"
+        self.estanque.altura_sensor_cm = 110
+        self.estanque.save()
+
+        # Sensor a 110 cm del fondo que mide 30 cm hasta la superficie: 80 cm de agua
+        self.assertEqual(curva_estanque(self.estanque.pk).volumen_de_lectura(30), 800)
+
+    def test_convertir_serie_con_y_sin_numpy(self):
+        ahora = now()
+        puntos = [(ahora + timedelta(minutes=i), v) for i, v in enumerate([0, 25, 50, 100])]
+
+        serie = convertir_serie(self.estanque.pk, puntos)
+        with mock.patch.object(geometria, "np", None):
+            serie_python = convertir_serie(self.estanque.pk, puntos)
+
+        self.assertEqual([p["volumen_litros"] for p in serie], [0, 250, 500, 1000])
+        self.assertEqual([p["porcentaje"] for p in serie], [0, 25, 50, 100])
+        self.assertEqual(serie, serie_python)
+
+    def test_ingesta_actualiza_volumen_actual(self):
+        sensor = Sensor.objects.create(
+            codigo="S-GE", nombre="Nivel", tipo="NIVEL", unidad="cm",
+            ubicacion=self.ubic, estanque=self.estanque,
+        )
+        ahora = now()
+        registrar_lectura(sensor, 40, "cm", ahora)
+        # Lectura atrasada: no pisa el volumen actual
+        registrar_lectura(sensor, 90, "cm", ahora - timedelta(minutes=5))
+
+        self.estanque.refresh_from_db()
+        self.assertEqual(self.estanque.volumen_actual_litros, 400)
+        self.assertEqual(self.estanque.porcentaje_actual(), 40)
+
+    def test_estanque_inexistente_no_interrumpe_la_ingesta(self):
+        self.assertFalse(geometria.actualizar_volumen_estanque(self.estanque.pk + 1000, 40, now()))
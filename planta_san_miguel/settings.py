@@ -58,6 +58,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricasRequestMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -140,3 +141,93 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# ───────────────────────────────────────────────
+#   Sensores IoT
+# ───────────────────────────────────────────────
+# Máximo de lecturas aceptadas por POST en /sensores/api/lecturas/lote/
+SENSORES_LOTE_MAXIMO = 1000
+
+# Segundos de vida del caché de reglas compiladas (sensores.motor_reglas).
+# Las señales invalidan el proceso local; el TTL acota el desfase entre workers.
+SENSORES_REGLAS_CACHE_TTL = 300
+
+# Broker MQTT para la ingesta de lecturas (manage.py ingesta_mqtt)
+MQTT_HOST = os.getenv("MQTT_HOST", "localhost")
+MQTT_PORT = int(os.getenv("MQTT_PORT", "1883"))
+MQTT_USER = os.getenv("MQTT_USER", "")
+MQTT_PASSWORD = os.getenv("MQTT_PASSWORD", "")
+
+# True: /sensores/api/lectura/ usa la vista async nativa (desplegar con ASGI,
+# ej: uvicorn planta_san_miguel.asgi:application). False: vista sync (WSGI).
+SENSORES_INGESTA_ASYNC = os.getenv("SENSORES_INGESTA_ASYNC", "0") == "1"
+
+# Caché de metadatos de sensores (sensores.cache_sensores): TTL en segundos y
+# alias opcional de CACHES para compartirlo entre workers (ej: "default" con Redis).
+SENSORES_INFO_CACHE_TTL = 300
+SENSORES_INFO_CACHE_ALIAS = os.getenv("SENSORES_INFO_CACHE_ALIAS") or None
+
+# Mantener los resúmenes 1m/1h/1d (ResumenLectura) en cada ingesta.
+# Con False se actualizan sólo con manage.py recalcular_resumenes.
+SENSORES_RESUMENES_EN_INGESTA = True
+
+# Retención de lecturas crudas por tipo de sensor (manage.py purgar_lecturas).
+#   dias_crudos: días que se conservan las filas de Lectura (None = siempre)
+#   dias_payload: días que se conserva raw_payload (None = siempre)
+# Los resúmenes 1m/1h/1d (ResumenLectura) se conservan siempre.
+SENSORES_RETENCION = {
+    "default": {"dias_crudos": None, "dias_payload": None},
+    # Ejemplo: "IR": {"dias_crudos": 90, "dias_payload": 7},
+}
+
+# Segundos de vida del estado encendido/apagado cacheado por actuador
+# (sensores.estado_actuadores). Acota el desfase si otro worker cambia el estado.
+SENSORES_ACTUADORES_CACHE_TTL = 30
+
+# Entrega de comandos a actuadores (manage.py despachar_comandos --transporte http).
+# Plantilla de URL del dispositivo; admite {codigo} y {gpio}.
+SENSORES_COMANDOS_HTTP_URL = os.getenv("SENSORES_COMANDOS_HTTP_URL", "http://{codigo}.local/comando")
+
+# Idempotencia de la ingesta (sensores.idempotencia): claves recientes que
+# cada proceso recuerda para responder reintentos sin consultar la base, y
+# si se deriva una clave del hash del payload cuando no trae "seq".
+SENSORES_IDEMPOTENCIA_MAX_CLAVES = 10000
+SENSORES_IDEMPOTENCIA_HASH = False
+
+
+# ───────────────────────────────────────────────
+#   Observabilidad (core.middleware.MetricasRequestMiddleware)
+# ───────────────────────────────────────────────
+# Métricas por vista en /metricas/ (JSON) y /metricas/prometheus/ (sólo staff)
+METRICAS_REQUESTS_ACTIVAS = os.getenv("METRICAS_REQUESTS_ACTIVAS", "1") == "1"
+# Muestras recientes que se guardan por vista (buffer circular)
+METRICAS_CAPACIDAD = 1000
+# Consultas SQL por request sobre las que se registra un warning
+METRICAS_PRESUPUESTO_CONSULTAS = 50
+
+# ───────────────────────────────────────────────
+#   Planta
+# ───────────────────────────────────────────────
+# Segundos de vida del caché de curvas altura -> volumen (planta.geometria)
+PLANTA_CURVAS_CACHE_TTL = 300
+# Puntos de la media móvil con que planta.analitica suaviza el nivel
+PLANTA_CONSUMO_VENTANA = 5
+
+# ───────────────────────────────────────────────
+#   Inventario (manage.py snapshot_stock)
+# ───────────────────────────────────────────────
+# Segundos que un snapshot debe quedar en el pasado: created_at de un
+# movimiento se fija antes del commit, así que una transacción más larga que
+# este margen podría confirmar después de leído el snapshot y quedar fuera.
+INVENTARIO_SNAPSHOT_MARGEN = 600
+
+# ───────────────────────────────────────────────
+#   Notificaciones (manage.py notificar_bajo_minimo)
+# ───────────────────────────────────────────────
+# Backend de entrega ("modulo.Clase") y sus argumentos. Incluidos:
+# notificaciones.backends.BackendConsola y BackendArchivo ({"ruta": "..."}).
+NOTIFICACIONES_BACKEND = os.getenv("NOTIFICACIONES_BACKEND", "notificaciones.backends.BackendConsola")
+NOTIFICACIONES_BACKEND_OPCIONES = {}
+# Segundos mínimos entre dos resúmenes de la misma ubicación
+NOTIFICACIONES_INTERVALO_MINIMO = 3600
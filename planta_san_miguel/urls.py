@@ -19,7 +19,7 @@ Including another URLconf
 # FECHA DE CREACIÓN: 01-09-2025
 # LICENCIA: Uso Educacional-No Comercial
 # PROPÓSITO: Configuración de URLs para el proyecto Django
-# FECHA ÚLTIMA MODIFICACIÓN: 18-11-2025
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
 # ---------------------------------------------------------
 from django.contrib import admin
 from django.urls import path, include
@@ -27,4 +27,5 @@ from django.urls import path, include
 urlpatterns = [
     path('admin/', admin.site.urls),
     path("sensores/", include("sensores.urls")),
+    path("", include("core.urls")),
 ]
@@ -0,0 +1,124 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Registro de alertas con deduplicación por (sensor, regla)
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from sensores.models import Alerta, Lectura, ReglaControl
+
+# Índice de alertas abiertas: (sensor_id, regla_id) -> alerta_id,
+# o None si se verificó que no hay alerta abierta.
+_abiertas: dict[tuple[int, int], int | None] = {}
+
+
+def _incrementar(alerta_id: int, fecha) -> bool:
+    """Suma una ocurrencia a la alerta si sigue abierta."""
+    return bool(
+        Alerta.objects.filter(pk=alerta_id, estado__in=Alerta.ESTADOS_ABIERTOS).update(
+            ocurrencias=F("ocurrencias") + 1,
+            ultima_vez=fecha,
+        )
+    )
+
+
+def _alerta_abierta_en_bd(sensor_id: int, regla_id: int) -> int | None:
+    return (
+        Alerta.objects.filter(
+            sensor_id=sensor_id,
+            regla_id=regla_id,
+            estado__in=Alerta.ESTADOS_ABIERTOS,
+        )
+        .values_list("pk", flat=True)
+        .first()
+    )
+
+
+def _disparo_reciente(regla: ReglaControl, fecha) -> bool:
+    """
+    True si una alerta de la regla tuvo una ocurrencia a menos de
+    intervalo_minimo_seg de 'fecha'. Se mide con la hora de las lecturas, no
+    la del servidor: vale igual para lecturas atrasadas o importadas.
+    """
+    intervalo = timedelta(seconds=regla.intervalo_minimo_seg)
+    return Alerta.objects.filter(
+        regla_id=regla.pk, ultima_vez__gt=fecha - intervalo, ultima_vez__lt=fecha + intervalo
+    ).exists()
+
+
+def registrar_alerta(
+    regla: ReglaControl,
+    sensor_id: int,
+    lectura: Lectura,
+    inicio_episodio: bool = True,
+) -> str:
+    """
+    Registra que la regla se cumplió para la lectura:
+
+    - Si hay una alerta abierta de (sensor, regla): suma ocurrencias y
+      actualiza ultima_vez (UPDATE, sin nueva fila).
+    - Si no hay alerta abierta: crea una sólo al inicio de un episodio y si
+      pasó intervalo_minimo_seg desde la última alerta de la regla.
+
+    Retorna "actualizada", "creada" o "suprimida".
+    """
+    clave = (sensor_id, regla.pk)
+    fecha = lectura.fecha_hora
+
+    if clave in _abiertas:
+        alerta_id = _abiertas[clave]
+        if alerta_id is None and not inicio_episodio:
+            return "suprimida"
+        if alerta_id is not None and _incrementar(alerta_id, fecha):
+            return "actualizada"
+
+    alerta_id = _alerta_abierta_en_bd(sensor_id, regla.pk)
+    if alerta_id is not None and _incrementar(alerta_id, fecha):
+        _abiertas[clave] = alerta_id
+        return "actualizada"
+
+    _abiertas[clave] = None
+    if not inicio_episodio:
+        return "suprimida"
+    if regla.intervalo_minimo_seg and _disparo_reciente(regla, fecha):
+        return "suprimida"
+
+    try:
+        with transaction.atomic():
+            alerta = Alerta.objects.create(
+                sensor_id=sensor_id,
+                lectura=lectura,
+                regla=regla,
+                severidad=regla.severidad,
+                mensaje=regla.mensaje_accion,
+                ultima_vez=fecha,
+            )
+    except IntegrityError:
+        # Otro worker abrió la alerta entre la consulta y el INSERT
+        alerta_id = _alerta_abierta_en_bd(sensor_id, regla.pk)
+        if alerta_id is not None:
+            _incrementar(alerta_id, fecha)
+        _abiertas[clave] = alerta_id
+        return "actualizada"
+
+    _abiertas[clave] = alerta.pk
+    return "creada"
+
+
+def olvidar_alerta(sensor_id: int, regla_id: int | None) -> None:
+    """Descarta la entrada del índice (alerta resuelta/eliminada o regla modificada)."""
+    if regla_id is None:
+        return
+    _abiertas.pop((sensor_id, regla_id), None)
+
+
+def olvidar_alertas_de_regla(regla_id: int) -> None:
+    for clave in [c for c in _abiertas if c[1] == regla_id]:
+        del _abiertas[clave]
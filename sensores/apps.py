@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class SensoresConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'sensores'
+
+    def ready(self):
+        # Señales que invalidan los cachés en memoria (reglas, sensores)
+        from . import signals  # noqa
@@ -0,0 +1,192 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Utilidades para medir el rendimiento de la ingesta de lecturas
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+"""
+Piezas del benchmark de ingesta (manage.py benchmark_lecturas): datos
+sembrados reproducibles, medición por lectura (latencia y consultas SQL),
+resumen con percentiles y comparación contra una línea base en JSON.
+"""
+from __future__ import annotations
+
+import json
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable
+
+from django.db import connection
+from django.utils import timezone
+
+from inventario.models import Ubicacion
+from sensores.models import Lectura, ReglaControl, Sensor
+
+PREFIJO = "BENCH-"
+
+
+# ================================================================
+# 1) DATOS SEMBRADOS
+# ================================================================
+def sembrar(sensores: int, reglas: int, historicas: int, semilla: int = 1) -> list[str]:
+    """
+    Crea N sensores, M reglas (repartidas entre ellos, umbral 90 para que
+    ~10% de las lecturas las dispare) y K lecturas históricas del último día.
+    Todo con prefijo BENCH-; retorna los códigos de los sensores.
+    """
+    azar = random.Random(semilla)
+    ubicacion, _ = Ubicacion.objects.get_or_create(
+        codigo=f"{PREFIJO}UB", defaults={"nombre": "Benchmark", "tipo": "OTRO"}
+    )
+    codigos = [f"{PREFIJO}S{i:04d}" for i in range(sensores)]
+    Sensor.objects.bulk_create(
+        [
+            Sensor(codigo=codigo, nombre=codigo, tipo="NIVEL", unidad="cm", ubicacion=ubicacion)
+            for codigo in codigos
+        ],
+        ignore_conflicts=True,
+    )
+    ids = list(Sensor.objects.filter(codigo__in=codigos).order_by("codigo").values_list("id", flat=True))
+
+    ReglaControl.objects.bulk_create([
+        ReglaControl(
+            sensor_id=ids[i % len(ids)],
+            condicion="MAYOR",
+            umbral=90,
+            mensaje_accion=f"{PREFIJO}regla {i}",
+        )
+        for i in range(reglas)
+    ])
+
+    ahora = timezone.now()
+    paso = timedelta(days=1) / max(historicas, 1)
+    lote: list[Lectura] = []
+    for i in range(historicas):
+        lote.append(Lectura(
+            sensor_id=ids[i % len(ids)],
+            valor=azar.randint(0, 100),
+            unidad="cm",
+            fecha_hora=ahora - timedelta(days=1) + paso * i,
+            origen="SIMULADA",
+        ))
+        if len(lote) >= 5000:
+            Lectura.objects.bulk_create(lote)
+            lote = []
+    Lectura.objects.bulk_create(lote)
+    return codigos
+
+
+def payloads(codigos: list[str], cantidad: int, semilla: int = 1) -> list[dict]:
+    """Lecturas a ingerir, repartidas entre los sensores sembrados."""
+    azar = random.Random(semilla)
+    return [
+        {"sensor_codigo": codigos[i % len(codigos)], "valor": azar.randint(0, 100), "unidad": "cm"}
+        for i in range(cantidad)
+    ]
+
+
+def limpiar() -> None:
+    Sensor.objects.filter(codigo__startswith=PREFIJO).delete()
+    Ubicacion.objects.filter(codigo__startswith=PREFIJO).delete()
+
+
+# ================================================================
+# 2) MEDICIÓN
+# ================================================================
+def percentil(valores: list[float], p: float) -> float:
+    """Percentil por rango más cercano (valores ya ordenados)."""
+    if not valores:
+        return 0.0
+    rango = max(1, math.ceil(p / 100 * len(valores)))
+    return valores[rango - 1]
+
+
+@dataclass
+class Medicion:
+    latencias_ms: list[float] = field(default_factory=list)
+    consultas: int = 0
+    errores: int = 0
+    segundos: float = 0.0
+
+    def resumen(self) -> dict:
+        ordenadas = sorted(self.latencias_ms)
+        n = len(ordenadas)
+        return {
+            "lecturas": n,
+            "errores": self.errores,
+            "segundos": round(self.segundos, 3),
+            "lecturas_por_segundo": round(n / self.segundos, 1) if self.segundos else 0.0,
+            "p50_ms": round(percentil(ordenadas, 50), 3),
+            "p95_ms": round(percentil(ordenadas, 95), 3),
+            "p99_ms": round(percentil(ordenadas, 99), 3),
+            "consultas_por_lectura": round(self.consultas / n, 2) if n else 0.0,
+        }
+
+
+def medir(enviar: Callable[[dict], bool], cargas: list[dict]) -> Medicion:
+    """
+    Ejecuta enviar(payload) una vez por carga, en serie, midiendo latencia y
+    consultas SQL de cada una. enviar retorna True si la lectura se registró.
+    """
+    medicion = Medicion()
+    forzado = connection.force_debug_cursor
+    connection.force_debug_cursor = True  # registrar consultas aunque DEBUG = False
+    inicio = time.perf_counter()
+    try:
+        for carga in cargas:
+            connection.queries_log.clear()
+            t0 = time.perf_counter()
+            ok = enviar(carga)
+            medicion.latencias_ms.append((time.perf_counter() - t0) * 1000)
+            medicion.consultas += len(connection.queries_log)
+            if not ok:
+                medicion.errores += 1
+    finally:
+        connection.force_debug_cursor = forzado
+    medicion.segundos = time.perf_counter() - inicio
+    return medicion
+
+
+# ================================================================
+# 3) LÍNEA BASE
+# ================================================================
+# Métrica -> True si "más alto es mejor"
+METRICAS_COMPARADAS = {
+    "lecturas_por_segundo": True,
+    "p95_ms": False,
+    "p99_ms": False,
+    "consultas_por_lectura": False,
+}
+
+
+def guardar_base(ruta: str | Path, resultados: dict) -> None:
+    Path(ruta).write_text(json.dumps(resultados, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def comparar_con_base(ruta: str | Path, resultados: dict, tolerancia: float = 0.2) -> list[str]:
+    """
+    Compara contra la línea base guardada. Retorna las regresiones
+    (peor que la base en más de 'tolerancia', ej: 0.2 = 20%). Las consultas
+    por lectura no dependen del ruido de la máquina: sólo admiten un 5%.
+    """
+    base = json.loads(Path(ruta).read_text(encoding="utf-8"))
+    regresiones = []
+    for modo, actual in resultados.items():
+        anterior = base.get(modo)
+        if not anterior:
+            continue
+        for metrica, mas_es_mejor in METRICAS_COMPARADAS.items():
+            antes, ahora = anterior.get(metrica), actual.get(metrica)
+            if antes is None or ahora is None:
+                continue
+            margen = 0.05 if metrica == "consultas_por_lectura" else tolerancia
+            if mas_es_mejor and ahora < antes * (1 - margen):
+                regresiones.append(f"{modo}.{metrica}: {antes} -> {ahora}")
+            elif not mas_es_mejor and ahora > antes * (1 + margen):
+                regresiones.append(f"{modo}.{metrica}: {antes} -> {ahora}")
+    return regresiones
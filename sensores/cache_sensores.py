@@ -0,0 +1,162 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Caché de metadatos de sensores para la ingesta de lecturas
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from __future__ import annotations
+
+import threading
+import time
+from decimal import Decimal
+from typing import Iterable, NamedTuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+from sensores.models import Sensor
+
+
+class SensorInfo(NamedTuple):
+    """
+    Registro liviano de un sensor: lo necesario para validar y registrar
+    una lectura sin cargar el modelo completo.
+    """
+    id: int
+    codigo: str
+    tipo: str
+    unidad: str
+    rango_min: Decimal | None
+    rango_max: Decimal | None
+    es_critico: bool
+    activo: bool
+    estanque_id: int | None
+
+    @property
+    def pk(self) -> int:
+        return self.id
+
+
+CAMPOS_INFO = SensorInfo._fields
+
+# codigo -> (instante de expiración, SensorInfo)
+_cache: dict[str, tuple[float, SensorInfo]] = {}
+_lock = threading.Lock()
+
+
+def _ttl() -> float:
+    return getattr(settings, "SENSORES_INFO_CACHE_TTL", 300)
+
+
+def _cache_compartido():
+    """
+    Caché de Django opcional (ej: Redis/Memcached) para que varios workers
+    compartan los metadatos. Se activa con SENSORES_INFO_CACHE_ALIAS.
+    """
+    alias = getattr(settings, "SENSORES_INFO_CACHE_ALIAS", None)
+    return caches[alias] if alias else None
+
+
+def _clave(codigo: str) -> str:
+    return f"sensores:info:{codigo}"
+
+
+def _guardar_local(infos: Iterable[SensorInfo]) -> None:
+    expira = time.monotonic() + _ttl()
+    with _lock:
+        for info in infos:
+            _cache[info.codigo] = (expira, info)
+
+
+def _buscar_local(codigos: Iterable[str]) -> tuple[dict[str, SensorInfo], set[str]]:
+    ahora = time.monotonic()
+    encontrados: dict[str, SensorInfo] = {}
+    faltantes: set[str] = set()
+    for codigo in codigos:
+        entrada = _cache.get(codigo)
+        if entrada is not None and entrada[0] > ahora:
+            encontrados[codigo] = entrada[1]
+        else:
+            faltantes.add(codigo)
+    return encontrados, faltantes
+
+
+def obtener_sensores_info(codigos: Iterable[str]) -> dict[str, SensorInfo]:
+    """
+    Resuelve varios códigos de sensor: primero en memoria, luego en el caché
+    compartido (si está configurado) y por último con una sola consulta.
+    Los códigos inexistentes no aparecen en el resultado.
+    """
+    encontrados, faltantes = _buscar_local(set(codigos))
+    if not faltantes:
+        return encontrados
+
+    compartido = _cache_compartido()
+    if compartido is not None:
+        desde_compartido = compartido.get_many([_clave(codigo) for codigo in faltantes])
+        infos = [SensorInfo(*valores) for valores in desde_compartido.values()]
+        _guardar_local(infos)
+        for info in infos:
+            encontrados[info.codigo] = info
+            faltantes.discard(info.codigo)
+        if not faltantes:
+            return encontrados
+
+    infos = [
+        SensorInfo(*valores)
+        for valores in Sensor.objects.filter(codigo__in=faltantes).values_list(*CAMPOS_INFO)
+    ]
+    _guardar_local(infos)
+    if compartido is not None and infos:
+        compartido.set_many({_clave(info.codigo): tuple(info) for info in infos}, _ttl())
+    for info in infos:
+        encontrados[info.codigo] = info
+    return encontrados
+
+
+def obtener_sensor_info(codigo: str) -> SensorInfo | None:
+    """SensorInfo del código, o None si el sensor no existe."""
+    return obtener_sensores_info([codigo]).get(codigo)
+
+
+async def aobtener_sensor_info(codigo: str) -> SensorInfo | None:
+    """Versión async de obtener_sensor_info (para la ingesta ASGI)."""
+    encontrados, faltantes = _buscar_local([codigo])
+    if not faltantes:
+        return encontrados[codigo]
+
+    compartido = _cache_compartido()
+    if compartido is not None:
+        valores = await compartido.aget(_clave(codigo))
+        if valores is not None:
+            info = SensorInfo(*valores)
+            _guardar_local([info])
+            return info
+
+    valores = await Sensor.objects.filter(codigo=codigo).values_list(*CAMPOS_INFO).afirst()
+    if valores is None:
+        return None
+    info = SensorInfo(*valores)
+    _guardar_local([info])
+    if compartido is not None:
+        await compartido.aset(_clave(codigo), tuple(info), _ttl())
+    return info
+
+
+def invalidar_sensor(sensor_id: int, codigo: str) -> None:
+    """
+    Elimina el sensor del caché local (por id, por si cambió su código)
+    y del caché compartido.
+    """
+    with _lock:
+        for clave in [c for c, (_, info) in _cache.items() if info.id == sensor_id or c == codigo]:
+            del _cache[clave]
+    compartido = _cache_compartido()
+    if compartido is not None:
+        compartido.delete(_clave(codigo))
+
+
+def limpiar_cache_sensores() -> None:
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,269 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Despacho de comandos a actuadores (ESP32) vía MQTT o HTTP
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+"""
+Entrega de ComandoActuador a los dispositivos.
+
+Actuador.encender()/apagar() sólo inserta el comando (outbox) dentro de su
+transacción; este módulo lo entrega después, agrupando los pendientes por
+dispositivo en un único mensaje. La entrega es "al menos una vez": cada
+comando viaja con su id y el dispositivo lo devuelve en el ack
+(confirmar_comandos); un ENVIADO sin ack se reenvía pasado plazo_ack, si
+sigue siendo el último comando de su actuador, hasta max_intentos. El
+dispositivo debe ignorar ids ya aplicados.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import urllib.request
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Iterable, Protocol
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Case, Count, Exists, F, Max, OuterRef, Q, Value, When
+from django.utils import timezone
+
+from sensores.estado_actuadores import olvidar_actuador
+from sensores.models import Actuador, ComandoActuador
+
+logger = logging.getLogger(__name__)
+
+
+# ================================================================
+# 1) TRANSPORTES
+# ================================================================
+class Transporte(Protocol):
+    def enviar(self, actuador: Actuador, mensajes: list[dict]) -> None:
+        """Entrega los mensajes al dispositivo; lanza una excepción si falla."""
+
+
+class TransporteMqtt:
+    """Publica en planta/<codigo_actuador>/comando (paho-mqtt o cliente compatible)."""
+
+    def __init__(self, cliente, topico: str = "planta/{codigo}/comando", qos: int = 1, timeout: float = 5.0):
+        self.cliente = cliente
+        self.topico = topico
+        self.qos = qos
+        self.timeout = timeout
+
+    def enviar(self, actuador: Actuador, mensajes: list[dict]) -> None:
+        info = self.cliente.publish(
+            self.topico.format(codigo=actuador.codigo), json.dumps(mensajes), qos=self.qos
+        )
+        if hasattr(info, "wait_for_publish"):
+            info.wait_for_publish(self.timeout)
+        if getattr(info, "rc", 0) != 0:
+            raise ConnectionError(f"MQTT publish rc={info.rc}")
+
+
+class TransporteHttp:
+    """POST JSON al dispositivo. url: plantilla con {codigo} y/o {gpio}."""
+
+    def __init__(self, url: str | None = None, timeout: float = 5.0):
+        self.url = url or getattr(settings, "SENSORES_COMANDOS_HTTP_URL", "http://{codigo}.local/comando")
+        self.timeout = timeout
+
+    def enviar(self, actuador: Actuador, mensajes: list[dict]) -> None:
+        peticion = urllib.request.Request(
+            self.url.format(codigo=actuador.codigo, gpio=actuador.gpio),
+            data=json.dumps(mensajes).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(peticion, timeout=self.timeout) as respuesta:
+            if respuesta.status >= 300:
+                raise ConnectionError(f"HTTP {respuesta.status}")
+
+
+class TransporteFalso:
+    """
+    Dispositivo simulado para pruebas: guarda lo enviado y puede fallar
+    para ciertos códigos de actuador.
+    """
+
+    def __init__(self, fallar: Iterable[str] = ()):
+        self.fallar = set(fallar)
+        self.enviados: list[tuple[str, list[dict]]] = []
+
+    def enviar(self, actuador: Actuador, mensajes: list[dict]) -> None:
+        if actuador.codigo in self.fallar:
+            raise ConnectionError(f"{actuador.codigo} no responde")
+        self.enviados.append((actuador.codigo, mensajes))
+
+
+# ================================================================
+# 2) DESPACHO
+# ================================================================
+def _sin_ack_vencidos(ahora: datetime, plazo_ack: float):
+    """
+    ENVIADO sin ack pasado plazo_ack segundos. Sólo el último comando de cada
+    actuador: reenviar uno ya reemplazado (ej: ENCENDER tras un APAGAR)
+    dejaría el dispositivo en el estado equivocado.
+    """
+    posteriores = ComandoActuador.objects.filter(
+        actuador_id=OuterRef("actuador_id"), creado_en__gt=OuterRef("creado_en")
+    )
+    return ComandoActuador.objects.filter(
+        ~Exists(posteriores),
+        estado="ENVIADO",
+        enviado_en__lt=ahora - timedelta(seconds=plazo_ack),
+    )
+
+
+def _reclamar(
+    tamano_lote: int, plazo_reclamo: float, plazo_ack: float, max_intentos: int
+) -> list[ComandoActuador]:
+    """
+    Transacción corta: bloquea hasta tamano_lote comandos con SKIP LOCKED
+    (PostgreSQL) y los marca EN_CURSO. Así pueden correr varios
+    despachadores, y ninguno envía con la transacción abierta. Los EN_CURSO
+    de un despachador caído se retoman pasado plazo_reclamo segundos, y los
+    ENVIADO sin ack pasado plazo_ack.
+    """
+    ahora = timezone.now()
+    sin_ack = _sin_ack_vencidos(ahora, plazo_ack).filter(intentos__lt=max_intentos)
+    with transaction.atomic():
+        comandos = list(
+            ComandoActuador.objects.select_for_update(skip_locked=True, of=("self",))
+            .filter(
+                Q(estado="PENDIENTE")
+                | Q(estado="EN_CURSO", reclamado_en__lt=ahora - timedelta(seconds=plazo_reclamo))
+                | Q(pk__in=sin_ack.values("pk"))
+            )
+            .select_related("actuador")
+            .order_by("creado_en")[:tamano_lote]
+        )
+        ComandoActuador.objects.filter(pk__in=[c.pk for c in comandos]).update(
+            estado="EN_CURSO", reclamado_en=ahora
+        )
+    return comandos
+
+
+def despachar_pendientes(
+    transporte: Transporte,
+    tamano_lote: int = 200,
+    max_intentos: int = 5,
+    plazo_reclamo: float = 60,
+    plazo_ack: float = 30,
+) -> dict:
+    """
+    Reclama hasta tamano_lote comandos pendientes, los agrupa por actuador y
+    envía un mensaje por dispositivo, sin transacción abierta; después
+    registra el resultado de cada envío.
+
+    Un envío fallido deja el comando PENDIENTE para reintentar, salvo que
+    alcance max_intentos (queda FALLIDO). Un ENVIADO sin ack en plazo_ack
+    segundos se reenvía; si ya agotó max_intentos queda FALLIDO. Un ack que
+    llegue antes de registrar el envío no se pisa: sólo se actualizan los
+    EN_CURSO.
+    """
+    enviados = fallidos = 0
+
+    agotados_sin_ack = _sin_ack_vencidos(timezone.now(), plazo_ack).filter(intentos__gte=max_intentos)
+    actuadores_sin_ack = set(agotados_sin_ack.values_list("actuador_id", flat=True))
+    if actuadores_sin_ack:
+        fallidos += agotados_sin_ack.update(estado="FALLIDO", error="Sin ack del dispositivo")
+        for actuador_id in actuadores_sin_ack:
+            olvidar_actuador(actuador_id)
+
+    comandos = _reclamar(tamano_lote, plazo_reclamo, plazo_ack, max_intentos)
+    por_actuador: dict[int, list[ComandoActuador]] = defaultdict(list)
+    for comando in comandos:
+        por_actuador[comando.actuador_id].append(comando)
+
+    for lista in por_actuador.values():
+        actuador = lista[0].actuador
+        en_curso = ComandoActuador.objects.filter(pk__in=[c.pk for c in lista], estado="EN_CURSO")
+        try:
+            transporte.enviar(actuador, [c.como_mensaje() for c in lista])
+        except Exception as exc:
+            logger.warning("No se pudo enviar comandos a %s: %s", actuador.codigo, exc)
+            agotados = [c.pk for c in lista if c.intentos + 1 >= max_intentos]
+            en_curso.update(
+                intentos=F("intentos") + 1,
+                error=str(exc)[:255],
+                estado=Case(When(pk__in=agotados, then=Value("FALLIDO")), default=Value("PENDIENTE")),
+            )
+            if agotados:
+                # El motor de reglas debe volver a pedir el estado (re-encola)
+                olvidar_actuador(actuador.pk)
+            fallidos += len(agotados)
+            continue
+
+        en_curso.update(
+            intentos=F("intentos") + 1, estado="ENVIADO", enviado_en=timezone.now(), error=""
+        )
+        enviados += len(lista)
+
+    return {
+        "ok": fallidos == 0,
+        "tomados": len(comandos),
+        "enviados": enviados,
+        "fallidos": fallidos,
+        "dispositivos": len(por_actuador),
+    }
+
+
+# ================================================================
+# 3) ACKS Y MÉTRICAS
+# ================================================================
+def confirmar_comandos(ids: Iterable[int], ahora: datetime | None = None) -> int:
+    """
+    Marca como CONFIRMADO los comandos del ack y guarda su latencia
+    (creación -> ack). Ids repetidos o ya confirmados se ignoran.
+    Retorna cuántos comandos se confirmaron.
+    """
+    ahora = ahora or timezone.now()
+    comandos = list(
+        ComandoActuador.objects.filter(pk__in=set(ids), estado__in=["PENDIENTE", "EN_CURSO", "ENVIADO"])
+    )
+    for comando in comandos:
+        comando.estado = "CONFIRMADO"
+        comando.confirmado_en = ahora
+        comando.latencia_ms = max(0, int((ahora - comando.creado_en).total_seconds() * 1000))
+    ComandoActuador.objects.bulk_update(comandos, ["estado", "confirmado_en", "latencia_ms"])
+    return len(comandos)
+
+
+def parsear_ack(payload: bytes) -> list[int] | None:
+    """
+    Ack del dispositivo: {"id": 12}, {"ids": [12, 13]} o [12, 13].
+    Retorna None si no es válido.
+    """
+    try:
+        data = json.loads(payload.decode("utf-8") if isinstance(payload, bytes) else payload)
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        return None
+
+    if isinstance(data, dict):
+        data = data.get("ids", [data.get("id")])
+    if not isinstance(data, list):
+        return None
+    try:
+        return [int(i) for i in data if i is not None]
+    except (TypeError, ValueError):
+        return None
+
+
+def metricas_comandos(desde: datetime | None = None) -> dict:
+    """Conteo por estado y latencia (promedio/máxima, ms) de los comandos confirmados."""
+    qs = ComandoActuador.objects.all()
+    if desde is not None:
+        qs = qs.filter(creado_en__gte=desde)
+
+    por_estado = dict(qs.values_list("estado").annotate(n=Count("id")).order_by())
+    latencia = qs.filter(estado="CONFIRMADO").aggregate(
+        promedio=Avg("latencia_ms"), maxima=Max("latencia_ms")
+    )
+    return {
+        "por_estado": {estado: por_estado.get(estado, 0) for estado, _ in ComandoActuador.ESTADOS},
+        "latencia_promedio_ms": latencia["promedio"],
+        "latencia_maxima_ms": latencia["maxima"],
+    }
@@ -0,0 +1,52 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Caché en memoria del estado conocido de los actuadores
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+"""
+Estado encendido/apagado de cada actuador visto por este proceso.
+
+El motor de reglas lo consulta antes de mandar un comando: si el actuador ya
+está en el estado pedido, el comando se omite sin tocar la base de datos.
+Las escrituras de Actuador (encender/apagar y señales) lo mantienen al día;
+el TTL acota el desfase cuando otro worker cambia el estado.
+"""
+from __future__ import annotations
+
+import threading
+import time
+
+from django.conf import settings
+
+# actuador_id -> (instante de expiración, encendido)
+_estados: dict[int, tuple[float, bool]] = {}
+_lock = threading.Lock()
+
+
+def _ttl() -> float:
+    return getattr(settings, "SENSORES_ACTUADORES_CACHE_TTL", 30)
+
+
+def estado_conocido(actuador_id: int) -> bool | None:
+    """Estado cacheado del actuador, o None si no se conoce o expiró."""
+    entrada = _estados.get(actuador_id)
+    if entrada is None or entrada[0] <= time.monotonic():
+        return None
+    return entrada[1]
+
+
+def recordar_estado(actuador_id: int, encendido: bool) -> None:
+    with _lock:
+        _estados[actuador_id] = (time.monotonic() + _ttl(), encendido)
+
+
+def olvidar_actuador(actuador_id: int) -> None:
+    with _lock:
+        _estados.pop(actuador_id, None)
+
+
+def limpiar_estados() -> None:
+    with _lock:
+        _estados.clear()
@@ -0,0 +1,150 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Exportación en streaming de lecturas (CSV, Arrow, Parquet)
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+"""
+Exportación de Lectura con memoria constante: values_list + iterator()
+(cursor del lado del servidor en PostgreSQL) y escritura por bloques.
+
+- CSV: siempre disponible.
+- Arrow (IPC stream) y Parquet: sólo con pyarrow instalado. Arrow se puede
+  transmitir por HTTP bloque a bloque; Parquet necesita el pie del archivo,
+  así que se escribe a un archivo (temporal en la vista).
+"""
+from __future__ import annotations
+
+import csv
+import io
+from datetime import datetime
+from typing import IO, Iterable, Iterator
+
+from sensores.models import Lectura
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow es opcional
+    pa = None
+    pq = None
+
+COLUMNAS = ("fecha_hora", "sensor", "valor", "unidad", "origen")
+FORMATOS = ("csv", "arrow", "parquet")
+FORMATOS_ARROW = ("arrow", "parquet")
+
+
+def formato_disponible(formato: str) -> bool:
+    return formato == "csv" or (formato in FORMATOS_ARROW and pa is not None)
+
+
+def consulta_exportacion(
+    sensor_codigos: Iterable[str] | None = None,
+    estanque_id: int | None = None,
+    desde: datetime | None = None,
+    hasta: datetime | None = None,
+):
+    """values_list de las lecturas filtradas, en orden cronológico."""
+    qs = Lectura.objects.entre(desde, hasta)
+    if sensor_codigos:
+        qs = qs.filter(sensor__codigo__in=list(sensor_codigos))
+    if estanque_id is not None:
+        qs = qs.filter(sensor__estanque_id=estanque_id)
+    return qs.order_by("fecha_hora", "id").values_list(
+        "fecha_hora", "sensor__codigo", "valor", "unidad", "origen"
+    )
+
+
+def _bloques(filas: Iterator[tuple], tamano: int) -> Iterator[list[tuple]]:
+    bloque = []
+    for fila in filas:
+        bloque.append(fila)
+        if len(bloque) >= tamano:
+            yield bloque
+            bloque = []
+    if bloque:
+        yield bloque
+
+
+# ================================================================
+# 1) CSV
+# ================================================================
+class _Eco:
+    """'Archivo' que devuelve lo escrito: csv.writer sin buffer intermedio."""
+
+    def write(self, valor):
+        return valor
+
+
+def filas_csv(qs, chunk_size: int = 5000) -> Iterator[str]:
+    """Líneas CSV (encabezado incluido), una por lectura."""
+    escritor = csv.writer(_Eco())
+    yield escritor.writerow(COLUMNAS)
+    for fecha, sensor, valor, unidad, origen in qs.iterator(chunk_size=chunk_size):
+        yield escritor.writerow((fecha.isoformat(), sensor, valor, unidad, origen))
+
+
+def escribir_csv(qs, destino: IO[str], chunk_size: int = 5000) -> int:
+    """Escribe el CSV en un archivo de texto. Retorna las lecturas escritas."""
+    total = -1  # sin contar el encabezado
+    for linea in filas_csv(qs, chunk_size):
+        destino.write(linea)
+        total += 1
+    return total
+
+
+# ================================================================
+# 2) ARROW / PARQUET (pyarrow)
+# ================================================================
+def _esquema():
+    return pa.schema([
+        ("fecha_hora", pa.timestamp("us", tz="UTC")),
+        ("sensor", pa.string()),
+        ("valor", pa.decimal128(12, 4)),
+        ("unidad", pa.string()),
+        ("origen", pa.string()),
+    ])
+
+
+def _lotes_arrow(qs, chunk_size: int):
+    esquema = _esquema()
+    for bloque in _bloques(qs.iterator(chunk_size=chunk_size), chunk_size):
+        columnas = list(zip(*bloque))
+        yield pa.record_batch(
+            [
+                pa.array(columnas[0], type=esquema.field("fecha_hora").type),
+                pa.array(columnas[1], type=pa.string()),
+                pa.array(columnas[2], type=esquema.field("valor").type),
+                pa.array(columnas[3], type=pa.string()),
+                pa.array(columnas[4], type=pa.string()),
+            ],
+            schema=esquema,
+        )
+
+
+def _vaciar(buffer: io.BytesIO) -> bytes:
+    datos = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return datos
+
+
+def bloques_arrow(qs, chunk_size: int = 5000) -> Iterator[bytes]:
+    """Formato Arrow IPC stream: se entrega lo escrito después de cada bloque."""
+    buffer = io.BytesIO()
+    with pa.ipc.new_stream(buffer, _esquema()) as escritor:
+        for lote in _lotes_arrow(qs, chunk_size):
+            escritor.write_batch(lote)
+            yield _vaciar(buffer)
+    yield _vaciar(buffer)  # marca de fin del stream
+
+
+def escribir_parquet(qs, destino, chunk_size: int = 5000) -> int:
+    """Escribe un Parquet (un row group por bloque). Retorna las lecturas escritas."""
+    total = 0
+    with pq.ParquetWriter(destino, _esquema()) as escritor:
+        for lote in _lotes_arrow(qs, chunk_size):
+            escritor.write_batch(lote)
+            total += lote.num_rows
+    return total
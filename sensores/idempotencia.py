@@ -0,0 +1,95 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Claves de idempotencia para la ingesta de lecturas
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+"""
+Reintentos del ESP32 (timeout sin respuesta) sin lecturas duplicadas.
+
+Cada lectura puede traer una clave de idempotencia:
+  - "clave_idempotencia": clave durable, se usa tal cual.
+  - "seq" (número de secuencia del dispositivo): el contador vuelve a cero al
+    reiniciar el ESP32, así que sólo identifica la lectura junto a "boot" (o
+    "sesion", id del arranque) o, si no viene, a su fecha_hora (el reintento
+    repite la misma). Un "seq" sin ninguno de los dos no da clave.
+  - con SENSORES_IDEMPOTENCIA_HASH = True, un hash del payload con fecha_hora.
+La restricción única (sensor, clave_idempotencia) de Lectura es la garantía;
+este módulo guarda además las últimas claves vistas por el proceso (LRU
+acotado por SENSORES_IDEMPOTENCIA_MAX_CLAVES), así la mayoría de los
+reintentos se responden con el id original sin ir a la base de datos.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+# (sensor_id, clave) -> lectura_id, del menos al más reciente
+_claves: OrderedDict[tuple[int, str], int] = OrderedDict()
+_lock = threading.Lock()
+
+LARGO_CLAVE = 64
+
+
+def _maximo() -> int:
+    return getattr(settings, "SENSORES_IDEMPOTENCIA_MAX_CLAVES", 10000)
+
+
+def _acotar(clave: str) -> str:
+    """Claves más largas que la columna se reemplazan por su hash (no se truncan)."""
+    if len(clave) <= LARGO_CLAVE:
+        return clave
+    return hashlib.sha256(clave.encode("utf-8")).hexdigest()
+
+
+def clave_de_payload(payload: dict) -> str | None:
+    """Clave de idempotencia del payload, o None si no trae ni se puede derivar."""
+    clave = payload.get("clave_idempotencia")
+    if clave not in (None, ""):
+        return _acotar(str(clave))
+
+    seq = payload.get("seq")
+    if seq not in (None, ""):
+        arranque = payload.get("boot", payload.get("sesion"))
+        if arranque not in (None, ""):
+            return _acotar(f"{arranque}:{seq}")
+        if payload.get("fecha_hora"):
+            return _acotar(f"{seq}@{payload['fecha_hora']}")
+        return None
+
+    # Sin fecha_hora el servidor pone la hora de llegada: dos lecturas
+    # iguales en distintos momentos no son un reintento.
+    if getattr(settings, "SENSORES_IDEMPOTENCIA_HASH", False) and payload.get("fecha_hora"):
+        base = json.dumps(
+            [payload.get(c) for c in ("sensor_codigo", "valor", "unidad", "fecha_hora")],
+            default=str,
+        )
+        return hashlib.sha256(base.encode("utf-8")).hexdigest()
+    return None
+
+
+def buscar_clave(sensor_id: int, clave: str) -> int | None:
+    """Id de la lectura ya registrada con la clave, si este proceso la vio."""
+    with _lock:
+        lectura_id = _claves.get((sensor_id, clave))
+        if lectura_id is not None:
+            _claves.move_to_end((sensor_id, clave))
+        return lectura_id
+
+
+def recordar_clave(sensor_id: int, clave: str, lectura_id: int) -> None:
+    with _lock:
+        _claves[(sensor_id, clave)] = lectura_id
+        _claves.move_to_end((sensor_id, clave))
+        while len(_claves) > _maximo():
+            _claves.popitem(last=False)
+
+
+def limpiar_claves() -> None:
+    with _lock:
+        _claves.clear()
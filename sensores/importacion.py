@@ -0,0 +1,343 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Importación masiva de lecturas históricas (CSV / JSONL)
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+"""
+Importación de lecturas recuperadas (ej: tarjeta SD de un ESP32 sin red).
+
+El archivo se lee en streaming y se procesa por bloques:
+  1. Validación con las reglas de procesar_payload_lectura; además la fecha
+     es obligatoria (sin ella la lectura no es histórica).
+  2. Descarte de duplicados (sensor, fecha_hora) contra la base y el archivo.
+  3. Inserción en una transacción por bloque: COPY en PostgreSQL, bulk_create
+     en otros motores o si se reproducen las reglas (necesitan los ids).
+  4. Checkpoint con la última línea confirmada, para reanudar tras un fallo.
+
+Al terminar se recalculan los derivados de lo importado: último valor por
+sensor, volumen de estanques y resúmenes 1m/1h/1d.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import json
+import os
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import IO, Iterator
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from sensores.cache_sensores import SensorInfo, obtener_sensores_info
+from sensores.models import Lectura
+from sensores.resumenes import recalcular_resumenes
+from sensores.services import (
+    _nueva_lectura,
+    _payload_json_safe,
+    _validar_campos_lectura,
+    actualizar_volumenes,
+    evaluar_reglas_lote,
+    reconstruir_ultimos_valores,
+)
+
+FORMATOS = ("csv", "jsonl")
+_LARGO_UNIDAD = Lectura._meta.get_field("unidad").max_length
+COLUMNAS_COPY = (
+    "sensor_id", "valor", "unidad", "fecha_hora", "origen",
+    "raw_payload", "activo", "created_at", "updated_at",
+)
+
+
+@dataclass
+class ResultadoImportacion:
+    linea: int = 0            # última línea confirmada (checkpoint)
+    insertadas: int = 0
+    duplicadas: int = 0
+    rechazadas: int = 0
+    sensores: set[int] = field(default_factory=set)
+    desde: datetime | None = None
+    hasta: datetime | None = None
+    dias: set[date] = field(default_factory=set)   # días locales con filas insertadas
+
+    def como_dict(self) -> dict:
+        return {
+            "linea": self.linea,
+            "insertadas": self.insertadas,
+            "duplicadas": self.duplicadas,
+            "rechazadas": self.rechazadas,
+            "sensores": sorted(self.sensores),
+            "desde": self.desde.isoformat() if self.desde else None,
+            "hasta": self.hasta.isoformat() if self.hasta else None,
+            "dias": sorted(dia.isoformat() for dia in self.dias),
+        }
+
+    @classmethod
+    def desde_dict(cls, datos: dict) -> "ResultadoImportacion":
+        return cls(
+            linea=datos["linea"],
+            insertadas=datos["insertadas"],
+            duplicadas=datos["duplicadas"],
+            rechazadas=datos["rechazadas"],
+            sensores=set(datos["sensores"]),
+            desde=datetime.fromisoformat(datos["desde"]) if datos["desde"] else None,
+            hasta=datetime.fromisoformat(datos["hasta"]) if datos["hasta"] else None,
+            dias={date.fromisoformat(dia) for dia in datos.get("dias", [])},
+        )
+
+
+# ================================================================
+# 1) LECTURA DEL ARCHIVO Y CHECKPOINT
+# ================================================================
+def formato_de(ruta: str) -> str:
+    return "jsonl" if ruta.endswith((".jsonl", ".json")) else "csv"
+
+
+def leer_filas(ruta: str, formato: str | None = None) -> Iterator[tuple[int, dict | None]]:
+    """
+    (número de línea, payload) por fila, sin cargar el archivo en memoria.
+    CSV: encabezado con sensor_codigo, valor, unidad, fecha_hora.
+    JSONL: un objeto por línea; las líneas que no son JSON dan payload None.
+    """
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        if (formato or formato_de(ruta)) == "csv":
+            lector = csv.DictReader(archivo)
+            for fila in lector:
+                yield lector.line_num, fila
+            return
+
+        for numero, linea in enumerate(archivo, start=1):
+            if not linea.strip():
+                continue
+            try:
+                yield numero, json.loads(linea)
+            except json.JSONDecodeError:
+                yield numero, None
+
+
+def leer_checkpoint(ruta: str) -> ResultadoImportacion | None:
+    if not os.path.exists(ruta):
+        return None
+    with open(ruta, encoding="utf-8") as archivo:
+        return ResultadoImportacion.desde_dict(json.load(archivo))
+
+
+def guardar_checkpoint(ruta: str, resultado: ResultadoImportacion) -> None:
+    # Escritura atómica: un corte a medio escribir no deja un JSON truncado
+    temporal = f"{ruta}.tmp"
+    with open(temporal, "w", encoding="utf-8") as archivo:
+        json.dump(resultado.como_dict(), archivo)
+    os.replace(temporal, ruta)
+
+
+# ================================================================
+# 2) INSERCIÓN
+# ================================================================
+def _usa_copy() -> bool:
+    return connection.vendor == "postgresql"
+
+
+def _insertar_copy(lecturas: list[Lectura]) -> None:
+    """
+    COPY FROM STDIN (psycopg 3 o psycopg2): sin ids de vuelta. En CSV un
+    campo vacío sin comillas es NULL (raw_payload None); las columnas NOT NULL
+    de texto llegan no vacías desde _importar_bloque.
+    """
+    ahora = timezone.now().isoformat()
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    for lectura in lecturas:
+        raw_payload = json.dumps(lectura.raw_payload) if lectura.raw_payload is not None else None
+        escritor.writerow((
+            lectura.sensor_id, lectura.valor, lectura.unidad, lectura.fecha_hora.isoformat(),
+            lectura.origen, raw_payload, "t", ahora, ahora,
+        ))
+    buffer.seek(0)
+
+    sql = f"COPY {Lectura._meta.db_table} ({', '.join(COLUMNAS_COPY)}) FROM STDIN WITH (FORMAT csv)"
+    with connection.cursor() as cursor:
+        crudo = cursor.cursor
+        if hasattr(crudo, "copy_expert"):  # psycopg2
+            crudo.copy_expert(sql, buffer)
+        else:
+            with crudo.copy(sql) as copia:
+                copia.write(buffer.getvalue())
+
+
+def _existentes(lecturas: list[Lectura], tamano_in: int = 500) -> set[tuple[int, datetime]]:
+    """
+    Pares (sensor_id, fecha_hora) del bloque que ya están en la base. Busca
+    sólo las fechas exactas de cada sensor (fecha_hora__in, usando el índice
+    sensor + fecha), no todo el rango que abarca el bloque.
+    """
+    fechas_por_sensor: dict[int, set[datetime]] = defaultdict(set)
+    for lectura in lecturas:
+        fechas_por_sensor[lectura.sensor_id].add(lectura.fecha_hora)
+
+    existentes: set[tuple[int, datetime]] = set()
+    for sensor_id, fechas in fechas_por_sensor.items():
+        fechas = sorted(fechas)
+        for i in range(0, len(fechas), tamano_in):
+            existentes.update(
+                Lectura.objects.filter(sensor_id=sensor_id, fecha_hora__in=fechas[i:i + tamano_in])
+                .values_list("sensor_id", "fecha_hora")
+            )
+    return existentes
+
+
+def _importar_bloque(
+    filas: list[tuple[int, dict | None]],
+    resultado: ResultadoImportacion,
+    origen: str,
+    reproducir_reglas: bool,
+    rechazos: IO[str] | None,
+) -> None:
+    def rechazar(linea: int, error: str) -> None:
+        resultado.rechazadas += 1
+        if rechazos is not None:
+            rechazos.write(json.dumps({"linea": linea, "error": error}) + "\n")
+
+    validas: list[tuple[int, dict, dict]] = []
+    for linea, payload in filas:
+        datos = _validar_campos_lectura(payload) if payload is not None else {
+            "ok": False, "error": "JSON inválido"
+        }
+        if datos["ok"] and not payload.get("fecha_hora"):
+            datos = {"ok": False, "error": "Falta el campo 'fecha_hora'"}
+        # Un error de la base aborta el bloque entero: se rechaza antes
+        if datos["ok"] and not datos["unidad"]:
+            datos = {"ok": False, "error": "El campo 'unidad' está vacío"}
+        if datos["ok"] and len(datos["unidad"]) > _LARGO_UNIDAD:
+            datos = {"ok": False, "error": f"El campo 'unidad' supera {_LARGO_UNIDAD} caracteres"}
+        if not datos["ok"]:
+            rechazar(linea, datos["error"])
+            continue
+        validas.append((linea, payload, datos))
+
+    sensores = obtener_sensores_info({datos["sensor_codigo"] for _, _, datos in validas})
+    pares: list[tuple[Lectura, SensorInfo]] = []
+    for linea, payload, datos in validas:
+        sensor = sensores.get(datos["sensor_codigo"])
+        if sensor is None:
+            rechazar(linea, "Sensor no encontrado")
+            continue
+        lectura = _nueva_lectura(
+            sensor,
+            valor=datos["valor"],
+            unidad=datos["unidad"],
+            fecha_hora=datos["fecha_hora"],
+            origen=origen,
+            raw_payload=_payload_json_safe(payload),
+        )
+        pares.append((lectura, sensor))
+
+    if pares:
+        vistos = _existentes([lectura for lectura, _ in pares])
+        nuevas = []
+        for lectura, sensor in pares:
+            clave = (lectura.sensor_id, lectura.fecha_hora)
+            if clave in vistos:
+                resultado.duplicadas += 1
+                continue
+            vistos.add(clave)
+            nuevas.append((lectura, sensor))
+        pares = nuevas
+
+    if pares:
+        lecturas = [lectura for lectura, _ in pares]
+        if reproducir_reglas or not _usa_copy():
+            Lectura.objects.bulk_create(lecturas)
+        else:
+            _insertar_copy(lecturas)
+        if reproducir_reglas:
+            evaluar_reglas_lote(pares)
+
+        fechas = [lectura.fecha_hora for lectura in lecturas]
+        resultado.insertadas += len(lecturas)
+        resultado.sensores.update(lectura.sensor_id for lectura in lecturas)
+        resultado.desde = min([resultado.desde, *fechas] if resultado.desde else fechas)
+        resultado.hasta = max([resultado.hasta, *fechas] if resultado.hasta else fechas)
+        resultado.dias.update(timezone.localdate(fecha) for fecha in fechas)
+
+    resultado.linea = filas[-1][0]
+
+
+# ================================================================
+# 3) IMPORTACIÓN COMPLETA
+# ================================================================
+def recalcular_derivados(resultado: ResultadoImportacion) -> None:
+    """Último valor, volumen de estanques y resúmenes de lo importado."""
+    if not resultado.sensores:
+        return
+    sensor_ids = sorted(resultado.sensores)
+    reconstruir_ultimos_valores(sensor_ids)
+    # Sólo los días que recibieron filas: los demás del rango pueden tener
+    # resúmenes retenidos de lecturas crudas ya purgadas.
+    for dia in sorted(resultado.dias):
+        inicio = timezone.make_aware(datetime.combine(dia, time.min))
+        recalcular_resumenes(inicio, inicio + timedelta(microseconds=1), sensor_ids)
+
+    niveles = Lectura.objects.filter(sensor__tipo="NIVEL", sensor__estanque__isnull=False)
+    ultimas = [
+        niveles.filter(sensor_id=sensor_id).select_related("sensor").order_by("-fecha_hora").first()
+        for sensor_id in sensor_ids
+    ]
+    actualizar_volumenes([(lectura, lectura.sensor) for lectura in ultimas if lectura is not None])
+
+
+def importar_lecturas(
+    ruta: str,
+    formato: str | None = None,
+    origen: str = "ESP32",
+    chunk_size: int = 5000,
+    reproducir_reglas: bool = False,
+    checkpoint: str | None = None,
+    rechazos: IO[str] | None = None,
+) -> dict:
+    """
+    Importa el archivo por bloques de chunk_size filas, una transacción por
+    bloque. Con checkpoint (ruta de un JSON), retoma desde la última línea
+    confirmada y borra el checkpoint al terminar.
+
+    Retorna {"ok": True, "insertadas", "duplicadas", "rechazadas", "sensores",
+    "reanudada", "usa_copy"}.
+    """
+    previo = leer_checkpoint(checkpoint) if checkpoint else None
+    resultado = previo or ResultadoImportacion()
+    desde_linea = resultado.linea
+
+    bloque: list[tuple[int, dict | None]] = []
+
+    def confirmar() -> None:
+        with transaction.atomic():
+            _importar_bloque(bloque, resultado, origen, reproducir_reglas, rechazos)
+        if checkpoint:
+            guardar_checkpoint(checkpoint, resultado)
+        bloque.clear()
+
+    for linea, payload in leer_filas(ruta, formato):
+        if linea <= desde_linea:
+            continue
+        bloque.append((linea, payload))
+        if len(bloque) >= chunk_size:
+            confirmar()
+    if bloque:
+        confirmar()
+
+    recalcular_derivados(resultado)
+    if checkpoint and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+
+    return {
+        "ok": True,
+        "insertadas": resultado.insertadas,
+        "duplicadas": resultado.duplicadas,
+        "rechazadas": resultado.rechazadas,
+        "sensores": len(resultado.sensores),
+        "reanudada": previo is not None,
+        "usa_copy": _usa_copy() and not reproducir_reglas,
+    }
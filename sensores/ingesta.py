@@ -0,0 +1,198 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Ingesta de lecturas por micro-lotes con cola acotada
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from typing import Callable
+
+from django.db import close_old_connections
+
+from sensores.services import registrar_lecturas_lote
+
+logger = logging.getLogger(__name__)
+
+
+class MetricasIngesta:
+    """
+    Contadores de la ingesta (se leen desde otros hilos sólo para reportar).
+
+    - recibidas: payloads entregados a encolar()
+    - descartadas: payloads perdidos porque la cola siguió llena (backpressure)
+    - creadas / rechazadas: resultado por item de registrar_lecturas_lote
+    - errores: lecturas cuya escritura falló aun reintentadas de a una
+    - profundidad_maxima: mayor tamaño observado de la cola
+    - espera_maxima_s: mayor tiempo que una lectura esperó en la cola
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.recibidas = 0
+        self.descartadas = 0
+        self.creadas = 0
+        self.rechazadas = 0
+        self.errores = 0
+        self.lotes = 0
+        self.profundidad_maxima = 0
+        self.espera_maxima_s = 0.0
+        self.duracion_ultimo_lote_s = 0.0
+
+    def sumar(self, **valores):
+        with self._lock:
+            for campo, valor in valores.items():
+                setattr(self, campo, getattr(self, campo) + valor)
+
+    def maximo(self, campo: str, valor):
+        with self._lock:
+            if valor > getattr(self, campo):
+                setattr(self, campo, valor)
+
+    def como_dict(self) -> dict:
+        with self._lock:
+            return {
+                campo: getattr(self, campo)
+                for campo in (
+                    "recibidas",
+                    "descartadas",
+                    "creadas",
+                    "rechazadas",
+                    "errores",
+                    "lotes",
+                    "profundidad_maxima",
+                    "espera_maxima_s",
+                    "duracion_ultimo_lote_s",
+                )
+            }
+
+
+class IngestorLotes:
+    """
+    Cola acotada de payloads de lectura que se escriben en micro-lotes.
+
+    Un lote se cierra al alcanzar 'tamano_lote' lecturas o cuando pasan
+    'intervalo_flush' segundos desde la primera lectura del lote.
+    Si la cola está llena, encolar() espera hasta 'timeout_encolar' segundos
+    (frenando al productor) y luego descarta la lectura.
+    """
+
+    def __init__(
+        self,
+        tamano_lote: int = 200,
+        intervalo_flush: float = 1.0,
+        capacidad_cola: int = 10000,
+        timeout_encolar: float = 0.5,
+        registrar: Callable[[list[dict]], dict] = registrar_lecturas_lote,
+    ):
+        self.tamano_lote = tamano_lote
+        self.intervalo_flush = intervalo_flush
+        self.timeout_encolar = timeout_encolar
+        self.registrar = registrar
+        self.cola: queue.Queue = queue.Queue(maxsize=capacidad_cola)
+        self.metricas = MetricasIngesta()
+        self._detener = threading.Event()
+        self._hilo: threading.Thread | None = None
+
+    # ──────────────────────────────
+    #   Productor
+    # ──────────────────────────────
+    def encolar(self, payload: dict) -> bool:
+        """Encola un payload. Retorna False si fue descartado por cola llena."""
+        self.metricas.sumar(recibidas=1)
+        try:
+            self.cola.put((time.monotonic(), payload), timeout=self.timeout_encolar)
+        except queue.Full:
+            self.metricas.sumar(descartadas=1)
+            logger.warning("Cola de ingesta llena: lectura descartada")
+            return False
+        self.metricas.maximo("profundidad_maxima", self.cola.qsize())
+        return True
+
+    # ──────────────────────────────
+    #   Consumidor
+    # ──────────────────────────────
+    def _tomar_lote(self, espera_inicial: float) -> list[tuple[float, dict]]:
+        try:
+            lote = [self.cola.get(timeout=espera_inicial)]
+        except queue.Empty:
+            return []
+
+        limite = time.monotonic() + self.intervalo_flush
+        while len(lote) < self.tamano_lote:
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                break
+            try:
+                lote.append(self.cola.get(timeout=restante))
+            except queue.Empty:
+                break
+        return lote
+
+    def procesar_lote(self, lote: list[tuple[float, dict]]) -> None:
+        if not lote:
+            return
+        inicio = time.monotonic()
+        self.metricas.maximo("espera_maxima_s", inicio - min(t for t, _ in lote))
+        payloads = [payload for _, payload in lote]
+        try:
+            resultados = [self.registrar(payloads)]
+        except Exception:
+            logger.exception("Error escribiendo lote de %s lecturas: se reintentan de a una", len(lote))
+            close_old_connections()
+            resultados = self._registrar_individualmente(payloads)
+
+        self.metricas.sumar(
+            creadas=sum(r["creadas"] for r in resultados),
+            rechazadas=sum(r["rechazadas"] for r in resultados),
+            lotes=1,
+        )
+        self.metricas.duracion_ultimo_lote_s = time.monotonic() - inicio
+
+    def _registrar_individualmente(self, payloads: list[dict]) -> list[dict]:
+        """Tras fallar un lote: sólo se pierde la lectura que vuelve a fallar."""
+        resultados = []
+        for payload in payloads:
+            try:
+                resultados.append(self.registrar([payload]))
+            except Exception:
+                logger.exception("Error escribiendo lectura: %r", payload)
+                self.metricas.sumar(errores=1)
+                close_old_connections()
+        return resultados
+
+    def vaciar(self) -> None:
+        """Procesa en el hilo actual todo lo que quede en la cola."""
+        while True:
+            lote = []
+            while len(lote) < self.tamano_lote:
+                try:
+                    lote.append(self.cola.get_nowait())
+                except queue.Empty:
+                    break
+            if not lote:
+                return
+            self.procesar_lote(lote)
+
+    def _bucle(self) -> None:
+        while not self._detener.is_set():
+            self.procesar_lote(self._tomar_lote(espera_inicial=self.intervalo_flush))
+        self.vaciar()
+        close_old_connections()
+
+    def iniciar(self) -> None:
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._bucle, name="ingesta-lotes", daemon=True)
+        self._hilo.start()
+
+    def detener(self) -> None:
+        """Detiene el hilo escritor después de vaciar la cola."""
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
@@ -0,0 +1,119 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Microbenchmark en proceso de las vistas de ingesta (sync vs async)
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+from django.test import AsyncRequestFactory, RequestFactory
+
+from sensores.benchmark import limpiar, sembrar
+from sensores.views_api import api_recibir_lectura, api_recibir_lectura_async
+
+URL = "/sensores/api/lectura/"
+VARIANTES = ("wsgi", "asgi-sync", "asgi")
+
+
+class Command(BaseCommand):
+    help = (
+        "Microbenchmark en proceso de las vistas de ingesta con N requests "
+        "concurrentes: wsgi (vista sync, un hilo por request), asgi-sync (vista "
+        "sync bajo un event loop, con saltos sync_to_async) y asgi (vista async "
+        "nativa). Llama a las vistas con RequestFactory/AsyncRequestFactory: no "
+        "levanta servidores ni mide su concurrencia (workers, sockets); para eso, "
+        "una herramienta de carga contra gunicorn/uvicorn. Crea sensores con "
+        "prefijo BENCH- y los elimina al terminar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=1000)
+        parser.add_argument("--concurrencia", type=int, default=50)
+        parser.add_argument("--sensores", type=int, default=10)
+        parser.add_argument(
+            "--variantes", default=",".join(VARIANTES),
+            help=f"Lista separada por comas de: {', '.join(VARIANTES)}",
+        )
+
+    def handle(self, *args, **options):
+        variantes = [v.strip() for v in options["variantes"].split(",") if v.strip()]
+        for variante in variantes:
+            if variante not in VARIANTES:
+                raise CommandError(f"Variante desconocida: {variante}")
+
+        codigos = sembrar(options["sensores"], reglas=0, historicas=0)
+        cuerpos = [
+            json.dumps({"sensor_codigo": codigos[i % len(codigos)], "valor": i % 100, "unidad": "cm"})
+            for i in range(options["requests"])
+        ]
+
+        resultados = {}
+        try:
+            for variante in variantes:
+                ejecutar = {
+                    "wsgi": self._wsgi,
+                    "asgi-sync": self._asgi_sync,
+                    "asgi": self._asgi,
+                }[variante]
+                inicio = time.perf_counter()
+                estados = ejecutar(cuerpos, options["concurrencia"])
+                duracion = time.perf_counter() - inicio
+                resultados[variante] = {
+                    "requests": len(cuerpos),
+                    "errores": sum(1 for estado in estados if estado != 201),
+                    "segundos": round(duracion, 3),
+                    "lecturas_por_segundo": round(len(cuerpos) / duracion, 1),
+                }
+                self.stdout.write(f"{variante}: {json.dumps(resultados[variante])}")
+        finally:
+            limpiar()
+
+        self.stdout.write(
+            "Vistas llamadas en proceso (sin servidor HTTP): compara el costo de "
+            "cada vista, no la concurrencia de un servidor WSGI/ASGI."
+        )
+        self.stdout.write(json.dumps(resultados, indent=2))
+
+    # ──────────────────────────────
+    #   Variantes
+    # ──────────────────────────────
+    def _wsgi(self, cuerpos, concurrencia):
+        factory = RequestFactory()
+
+        def enviar(cuerpo):
+            try:
+                request = factory.post(URL, data=cuerpo, content_type="application/json")
+                return api_recibir_lectura(request).status_code
+            finally:
+                close_old_connections()
+
+        with ThreadPoolExecutor(max_workers=concurrencia) as pool:
+            estados = list(pool.map(enviar, cuerpos))
+        connections.close_all()
+        return estados
+
+    def _asgi_sync(self, cuerpos, concurrencia):
+        vista = sync_to_async(api_recibir_lectura)
+        return asyncio.run(self._gather(vista, cuerpos, concurrencia))
+
+    def _asgi(self, cuerpos, concurrencia):
+        return asyncio.run(self._gather(api_recibir_lectura_async, cuerpos, concurrencia))
+
+    async def _gather(self, vista, cuerpos, concurrencia):
+        factory = AsyncRequestFactory()
+        semaforo = asyncio.Semaphore(concurrencia)
+
+        async def enviar(cuerpo):
+            async with semaforo:
+                request = factory.post(URL, data=cuerpo, content_type="application/json")
+                respuesta = await vista(request)
+                return respuesta.status_code
+
+        return await asyncio.gather(*(enviar(cuerpo) for cuerpo in cuerpos))
@@ -0,0 +1,116 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Benchmark reproducible de la ingesta con línea base en JSON
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from sensores import benchmark
+from sensores.cache_sensores import limpiar_cache_sensores
+from sensores.services import procesar_payload_lectura, registrar_lectura
+
+URL = "/sensores/api/lectura/"
+MODOS = ("cliente", "servicio")
+
+
+class Command(BaseCommand):
+    help = (
+        "Siembra N sensores, M reglas y K lecturas históricas (prefijo BENCH-) y "
+        "mide la ingesta lectura a lectura: 'cliente' pasa por middleware, URL y "
+        "vista (Django test client); 'servicio' llama directo a "
+        "procesar_payload_lectura + registrar_lectura. Reporta lecturas/s, "
+        "p50/p95/p99 y consultas por lectura, y compara contra una línea base."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sensores", type=int, default=50)
+        parser.add_argument("--reglas", type=int, default=100)
+        parser.add_argument("--historicas", type=int, default=10000)
+        parser.add_argument("--lecturas", type=int, default=2000, help="Lecturas a ingerir por modo")
+        parser.add_argument("--calentamiento", type=int, default=50, help="Lecturas previas no medidas")
+        parser.add_argument("--semilla", type=int, default=1)
+        parser.add_argument(
+            "--modos", default=",".join(MODOS),
+            help=f"Lista separada por comas de: {', '.join(MODOS)}",
+        )
+        parser.add_argument("--guardar-base", metavar="RUTA", help="Guardar los resultados como línea base")
+        parser.add_argument("--comparar", metavar="RUTA", help="Comparar contra una línea base")
+        parser.add_argument(
+            "--tolerancia", type=float, default=0.2,
+            help="Empeoramiento admitido antes de reportar regresión (0.2 = 20%%)",
+        )
+        parser.add_argument("--conservar", action="store_true", help="No eliminar los datos BENCH- al terminar")
+
+    def handle(self, *args, **options):
+        modos = [m.strip() for m in options["modos"].split(",") if m.strip()]
+        for modo in modos:
+            if modo not in MODOS:
+                raise CommandError(f"Modo desconocido: {modo}")
+
+        benchmark.limpiar()
+        limpiar_cache_sensores()
+        codigos = benchmark.sembrar(
+            options["sensores"], options["reglas"], options["historicas"], options["semilla"]
+        )
+        self.stdout.write(
+            f"Sembrados {len(codigos)} sensores, {options['reglas']} reglas, "
+            f"{options['historicas']} lecturas históricas"
+        )
+
+        resultados = {}
+        try:
+            for modo in modos:
+                enviar = {"cliente": self._por_cliente(), "servicio": self._por_servicio}[modo]
+                cargas = benchmark.payloads(codigos, options["calentamiento"] + options["lecturas"], options["semilla"])
+                for carga in cargas[:options["calentamiento"]]:
+                    enviar(carga)
+                medicion = benchmark.medir(enviar, cargas[options["calentamiento"]:])
+                resultados[modo] = medicion.resumen()
+                self.stdout.write(f"{modo}: {json.dumps(resultados[modo])}")
+        finally:
+            if not options["conservar"]:
+                benchmark.limpiar()
+
+        self.stdout.write(json.dumps(resultados, indent=2))
+
+        if options["guardar_base"]:
+            benchmark.guardar_base(options["guardar_base"], resultados)
+            self.stdout.write(f"Línea base guardada en {options['guardar_base']}")
+
+        if options["comparar"]:
+            regresiones = benchmark.comparar_con_base(options["comparar"], resultados, options["tolerancia"])
+            if regresiones:
+                raise CommandError("Regresiones respecto de la línea base:\n  " + "\n  ".join(regresiones))
+            self.stdout.write(self.style.SUCCESS("Sin regresiones respecto de la línea base"))
+
+    # ──────────────────────────────
+    #   Modos
+    # ──────────────────────────────
+    def _por_cliente(self):
+        hosts = [h for h in settings.ALLOWED_HOSTS if h and h[0] not in ".*"]
+        cliente = Client(HTTP_HOST=hosts[0] if hosts else "localhost")
+
+        def enviar(carga):
+            respuesta = cliente.post(URL, data=json.dumps(carga), content_type="application/json")
+            return respuesta.status_code == 201
+
+        return enviar
+
+    def _por_servicio(self, carga):
+        resultado = procesar_payload_lectura(carga)
+        if not resultado.get("ok"):
+            return False
+        registrar_lectura(
+            sensor=resultado["sensor"],
+            valor=resultado["valor"],
+            unidad=resultado["unidad"],
+            fecha_hora=resultado["fecha_hora"],
+            raw_payload=carga,
+        )
+        return True
@@ -0,0 +1,109 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Comando para entregar los comandos pendientes a los actuadores
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from sensores.comandos import (
+    TransporteHttp,
+    TransporteMqtt,
+    confirmar_comandos,
+    despachar_pendientes,
+    metricas_comandos,
+    parsear_ack,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Entrega los ComandoActuador pendientes a los dispositivos (MQTT o HTTP), "
+        "agrupados por actuador, y registra los acks con su latencia."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--transporte", choices=["mqtt", "http"], default="mqtt")
+        parser.add_argument("--host", default=getattr(settings, "MQTT_HOST", "localhost"))
+        parser.add_argument("--port", type=int, default=getattr(settings, "MQTT_PORT", 1883))
+        parser.add_argument("--topico", default="planta/{codigo}/comando")
+        parser.add_argument(
+            "--topico-ack", default="planta/+/ack",
+            help="Tópico donde los dispositivos confirman los comandos (sólo MQTT)",
+        )
+        parser.add_argument("--url", default=None, help="Plantilla de URL para HTTP ({codigo}, {gpio})")
+        parser.add_argument("--tamano-lote", type=int, default=200)
+        parser.add_argument("--max-intentos", type=int, default=5)
+        parser.add_argument(
+            "--plazo-ack", type=float, default=30,
+            help="Segundos sin ack tras los que un comando enviado se reenvía",
+        )
+        parser.add_argument(
+            "--intervalo", type=float, default=0.5,
+            help="Segundos de espera cuando no hay comandos pendientes",
+        )
+        parser.add_argument("--una-vez", action="store_true", help="Despachar una pasada y salir")
+
+    def _cliente_mqtt(self, options):
+        try:
+            import paho.mqtt.client as mqtt
+        except ImportError:
+            raise CommandError("Se requiere paho-mqtt (pip install paho-mqtt).")
+
+        if hasattr(mqtt, "CallbackAPIVersion"):
+            cliente = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
+        else:
+            cliente = mqtt.Client()
+
+        usuario = getattr(settings, "MQTT_USER", "")
+        if usuario:
+            cliente.username_pw_set(usuario, getattr(settings, "MQTT_PASSWORD", ""))
+
+        def on_connect(cliente, userdata, *args):
+            cliente.subscribe(options["topico_ack"], qos=1)
+
+        def on_message(cliente, userdata, mensaje):
+            ids = parsear_ack(mensaje.payload)
+            if ids:
+                confirmar_comandos(ids)
+
+        cliente.on_connect = on_connect
+        cliente.on_message = on_message
+        cliente.connect(options["host"], options["port"])
+        cliente.loop_start()
+        return cliente
+
+    def handle(self, *args, **options):
+        cliente = None
+        if options["transporte"] == "mqtt":
+            cliente = self._cliente_mqtt(options)
+            transporte = TransporteMqtt(cliente, topico=options["topico"])
+        else:
+            transporte = TransporteHttp(url=options["url"])
+
+        try:
+            while True:
+                resultado = despachar_pendientes(
+                    transporte,
+                    tamano_lote=options["tamano_lote"],
+                    max_intentos=options["max_intentos"],
+                    plazo_ack=options["plazo_ack"],
+                )
+                if resultado["tomados"]:
+                    self.stdout.write(json.dumps(resultado))
+                if options["una_vez"]:
+                    break
+                if resultado["tomados"] < options["tamano_lote"]:
+                    time.sleep(options["intervalo"])
+        except KeyboardInterrupt:
+            self.stdout.write("Deteniendo despacho...")
+        finally:
+            if cliente is not None:
+                cliente.loop_stop()
+                cliente.disconnect()
+            self.stdout.write(json.dumps(metricas_comandos(), default=str))
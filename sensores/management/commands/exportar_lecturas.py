@@ -0,0 +1,63 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Comando para exportar lecturas a CSV o Parquet
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from datetime import date, datetime, time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from sensores.exportacion import (
+    consulta_exportacion,
+    escribir_csv,
+    escribir_parquet,
+    formato_disponible,
+)
+
+
+def _parsear_dia(valor: str) -> datetime:
+    try:
+        dia = date.fromisoformat(valor)
+    except ValueError:
+        raise CommandError(f"Fecha inválida (use AAAA-MM-DD): {valor}")
+    return timezone.make_aware(datetime.combine(dia, time.min))
+
+
+class Command(BaseCommand):
+    help = (
+        "Exporta lecturas filtradas por sensor, estanque y rango de fechas a CSV "
+        "(o Parquet con pyarrow) leyendo por bloques, con memoria constante."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--salida", help="Archivo de destino (CSV: por defecto, la salida estándar)")
+        parser.add_argument("--formato", choices=["csv", "parquet"], default="csv")
+        parser.add_argument("--sensor", action="append", dest="sensores", help="Código de sensor (repetible)")
+        parser.add_argument("--estanque", type=int)
+        parser.add_argument("--desde", help="Día inicial AAAA-MM-DD (incluido)")
+        parser.add_argument("--hasta", help="Día final AAAA-MM-DD (incluido)")
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        formato = options["formato"]
+        if not formato_disponible(formato):
+            raise CommandError("El formato parquet requiere pyarrow (pip install pyarrow).")
+        if formato == "parquet" and not options["salida"]:
+            raise CommandError("--salida es obligatorio para parquet.")
+
+        desde = _parsear_dia(options["desde"]) if options["desde"] else None
+        hasta = _parsear_dia(options["hasta"]) + timedelta(days=1) if options["hasta"] else None
+        qs = consulta_exportacion(options["sensores"], options["estanque"], desde, hasta)
+
+        if formato == "parquet":
+            total = escribir_parquet(qs, options["salida"], options["chunk_size"])
+        elif options["salida"]:
+            with open(options["salida"], "w", newline="", encoding="utf-8") as archivo:
+                total = escribir_csv(qs, archivo, options["chunk_size"])
+        else:
+            total = escribir_csv(qs, self.stdout, options["chunk_size"])
+
+        self.stderr.write(f"{total} lecturas exportadas.")
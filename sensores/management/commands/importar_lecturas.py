@@ -0,0 +1,72 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Comando para importar lecturas históricas desde CSV o JSONL
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sensores.importacion import FORMATOS, importar_lecturas
+from sensores.models import Lectura
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa lecturas históricas (ej: logs de la tarjeta SD de un ESP32) desde "
+        "CSV o JSONL por bloques, descartando duplicados (sensor, fecha_hora) y "
+        "reanudando desde el checkpoint si una ejecución anterior falló."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("archivo", help="Archivo CSV o JSONL")
+        parser.add_argument("--formato", choices=FORMATOS, help="Por defecto, según la extensión")
+        parser.add_argument(
+            "--origen", choices=[clave for clave, _ in Lectura.ORIGEN_LECTURA], default="ESP32"
+        )
+        parser.add_argument("--chunk-size", type=int, default=5000)
+        parser.add_argument(
+            "--reglas",
+            choices=["omitir", "reproducir"],
+            default="omitir",
+            help="reproducir: evalúa las reglas de control sobre lo importado (sin COPY)",
+        )
+        parser.add_argument("--checkpoint", help="Por defecto, <archivo>.checkpoint")
+        parser.add_argument("--sin-checkpoint", action="store_true")
+        parser.add_argument("--rechazos", help="Archivo JSONL con las filas rechazadas")
+
+    def handle(self, *args, **options):
+        ruta = options["archivo"]
+        if not os.path.exists(ruta):
+            raise CommandError(f"No existe el archivo: {ruta}")
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size debe ser mayor que 0.")
+
+        checkpoint = None
+        if not options["sin_checkpoint"]:
+            checkpoint = options["checkpoint"] or f"{ruta}.checkpoint"
+
+        rechazos = open(options["rechazos"], "a", encoding="utf-8") if options["rechazos"] else None
+        try:
+            resultado = importar_lecturas(
+                ruta,
+                formato=options["formato"],
+                origen=options["origen"],
+                chunk_size=options["chunk_size"],
+                reproducir_reglas=options["reglas"] == "reproducir",
+                checkpoint=checkpoint,
+                rechazos=rechazos,
+            )
+        finally:
+            if rechazos is not None:
+                rechazos.close()
+
+        if resultado["reanudada"]:
+            self.stdout.write("Reanudada desde el checkpoint.")
+        self.stdout.write(self.style.SUCCESS(
+            f"{resultado['insertadas']} lecturas importadas "
+            f"({resultado['duplicadas']} duplicadas, {resultado['rechazadas']} rechazadas, "
+            f"{resultado['sensores']} sensores)."
+        ))
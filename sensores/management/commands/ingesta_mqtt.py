@@ -0,0 +1,80 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Comando para ingerir lecturas de sensores vía MQTT
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from sensores.ingesta import IngestorLotes
+from sensores.mqtt import ConsumidorMqtt
+
+
+class Command(BaseCommand):
+    help = (
+        "Se suscribe a un tópico MQTT (ej: planta/+/lectura) y registra las "
+        "lecturas en micro-lotes a través de una cola acotada."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default=getattr(settings, "MQTT_HOST", "localhost"))
+        parser.add_argument("--port", type=int, default=getattr(settings, "MQTT_PORT", 1883))
+        parser.add_argument("--topico", default="planta/+/lectura")
+        parser.add_argument("--qos", type=int, default=1, choices=[0, 1, 2])
+        parser.add_argument("--tamano-lote", type=int, default=200)
+        parser.add_argument(
+            "--intervalo", type=float, default=1.0,
+            help="Segundos máximos de espera antes de escribir un lote incompleto",
+        )
+        parser.add_argument("--capacidad-cola", type=int, default=10000)
+        parser.add_argument(
+            "--reporte", type=float, default=30.0,
+            help="Cada cuántos segundos imprimir métricas de la ingesta",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            import paho.mqtt.client as mqtt
+        except ImportError:
+            raise CommandError("Se requiere paho-mqtt (pip install paho-mqtt).")
+
+        if hasattr(mqtt, "CallbackAPIVersion"):
+            cliente = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
+        else:
+            cliente = mqtt.Client()
+
+        usuario = getattr(settings, "MQTT_USER", "")
+        if usuario:
+            cliente.username_pw_set(usuario, getattr(settings, "MQTT_PASSWORD", ""))
+
+        ingestor = IngestorLotes(
+            tamano_lote=options["tamano_lote"],
+            intervalo_flush=options["intervalo"],
+            capacidad_cola=options["capacidad_cola"],
+        )
+        consumidor = ConsumidorMqtt(cliente, ingestor, topico=options["topico"], qos=options["qos"])
+
+        ingestor.iniciar()
+        cliente.connect(options["host"], options["port"])
+        cliente.loop_start()
+        self.stdout.write(f"Escuchando {options['topico']} en {options['host']}:{options['port']}")
+
+        try:
+            while True:
+                time.sleep(options["reporte"])
+                metricas = ingestor.metricas.como_dict()
+                metricas["profundidad_cola"] = ingestor.cola.qsize()
+                metricas["invalidos"] = consumidor.invalidos
+                self.stdout.write(json.dumps(metricas))
+        except KeyboardInterrupt:
+            self.stdout.write("Deteniendo ingesta...")
+        finally:
+            cliente.loop_stop()
+            cliente.disconnect()
+            ingestor.detener()
+            self.stdout.write(json.dumps(ingestor.metricas.como_dict()))
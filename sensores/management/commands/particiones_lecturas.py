@@ -0,0 +1,100 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Comando para administrar las particiones mensuales de Lectura
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from sensores import particiones
+
+
+class Command(BaseCommand):
+    help = (
+        "Particionamiento mensual de la tabla de lecturas (sólo PostgreSQL). "
+        "Acciones: estado, brin, convertir, crear, desacoplar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "accion", choices=["estado", "brin", "convertir", "crear", "desacoplar"],
+        )
+        parser.add_argument(
+            "--meses", type=int, default=3,
+            help="crear: meses futuros a pre-crear (además del actual)",
+        )
+        parser.add_argument(
+            "--margen-meses", type=int, default=1,
+            help="convertir: meses futuros que también cubre la partición histórica",
+        )
+        parser.add_argument(
+            "--conservar-meses", type=int, default=12,
+            help="desacoplar: meses completos que se mantienen adjuntos",
+        )
+        parser.add_argument(
+            "--eliminar", action="store_true",
+            help="desacoplar: además eliminar (DROP) las particiones desacopladas",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Mostrar el SQL sin ejecutarlo",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("El particionamiento de lecturas requiere PostgreSQL.")
+
+        accion = options["accion"]
+        mes_actual = timezone.localdate().replace(day=1)
+
+        if accion == "estado":
+            self.stdout.write(f"Particionada: {'sí' if particiones.esta_particionada() else 'no'}")
+            for nombre, rango in particiones.listar_particiones():
+                self.stdout.write(f"  {nombre}: {rango}")
+            return
+
+        # Fase sin transacción (CONCURRENTLY) y fase transaccional
+        preparacion: list[str] = []
+        if accion == "brin":
+            if particiones.esta_particionada():
+                raise CommandError("La tabla particionada ya tiene su índice BRIN (lo crea 'convertir').")
+            preparacion = [particiones.sql_indice_brin()]
+            sentencias = []
+        elif accion == "convertir":
+            if particiones.esta_particionada():
+                raise CommandError("La tabla de lecturas ya está particionada.")
+            # La histórica cubre el mes en curso y el margen: el CHECK no
+            # rechaza la ingesta actual entre la preparación y la conversión
+            primer_mes = particiones.sumar_meses(mes_actual, 1 + options["margen_meses"])
+            preparacion = particiones.sql_preparar_conversion(primer_mes)
+            sentencias = particiones.sql_convertir(primer_mes) + [
+                particiones.sql_crear_particion(particiones.sumar_meses(primer_mes, i))
+                for i in range(options["meses"])
+            ]
+        else:
+            if not particiones.esta_particionada():
+                raise CommandError("La tabla no está particionada (ejecute 'convertir').")
+            if accion == "crear":
+                desde = max(mes_actual, particiones.limite_historica() or mes_actual)
+                sentencias = [
+                    particiones.sql_crear_particion(particiones.sumar_meses(mes_actual, i))
+                    for i in range(options["meses"] + 1)
+                    if particiones.sumar_meses(mes_actual, i) >= desde
+                ]
+            else:
+                limite = particiones.sumar_meses(mes_actual, -options["conservar_meses"])
+                sentencias = []
+                for nombre in particiones.particiones_mensuales_antes_de(limite):
+                    sentencias += particiones.sql_desacoplar_particion(nombre, options["eliminar"])
+
+        if options["dry_run"]:
+            for sentencia in preparacion + sentencias:
+                self.stdout.write(sentencia.strip() + ";")
+            return
+
+        particiones.ejecutar_sin_transaccion(preparacion)
+        particiones.ejecutar(sentencias)
+        total = len(preparacion) + len(sentencias)
+        self.stdout.write(self.style.SUCCESS(f"{accion}: {total} sentencias ejecutadas."))
@@ -0,0 +1,52 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Comando para aplicar la retención de lecturas crudas
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+import json
+
+from django.core.management.base import BaseCommand
+
+from sensores.retencion import purgar_lecturas
+
+
+class Command(BaseCommand):
+    help = (
+        "Aplica SENSORES_RETENCION: limpia raw_payload y elimina lecturas crudas "
+        "antiguas por tramos de pk (transacciones cortas). Los resúmenes se "
+        "conservan. Si se interrumpe, basta con volver a ejecutarlo."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk", type=int, default=5000, help="Tamaño de cada tramo de pk")
+        parser.add_argument("--desde-pk", type=int, help="Retomar desde este pk")
+        parser.add_argument("--pausa", type=float, default=0.0, help="Segundos entre tramos")
+        parser.add_argument("--tipo", action="append", dest="tipos", help="Tipo de sensor (repetible)")
+        parser.add_argument("--dry-run", action="store_true", help="Sólo contar filas y bytes")
+
+    def handle(self, *args, **options):
+        verbosity = options["verbosity"]
+
+        def avance(estado):
+            if verbosity > 1:
+                self.stdout.write(json.dumps(estado))
+
+        resultado = purgar_lecturas(
+            chunk=options["chunk"],
+            desde_pk=options["desde_pk"],
+            pausa=options["pausa"],
+            tipos=options["tipos"],
+            dry_run=options["dry_run"],
+            avance=avance,
+        )
+        datos = resultado.como_dict()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{'[dry-run] ' if options['dry_run'] else ''}"
+                f"Filas eliminadas: {datos['filas_eliminadas']}, "
+                f"payloads limpiados: {datos['payloads_limpiados']}, "
+                f"bytes liberados (aprox.): {datos['bytes_liberados']}"
+            )
+        )
@@ -0,0 +1,48 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Comando para recalcular los resúmenes de lecturas
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from datetime import date, datetime, time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from sensores.resumenes import recalcular_resumenes
+
+
+def _parsear_dia(valor: str) -> datetime:
+    try:
+        dia = date.fromisoformat(valor)
+    except ValueError:
+        raise CommandError(f"Fecha inválida (use AAAA-MM-DD): {valor}")
+    return timezone.make_aware(datetime.combine(dia, time.min))
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye los resúmenes 1m/1h/1d desde las lecturas crudas para los "
+        "días indicados (por defecto, ayer y hoy)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--desde", help="Día inicial AAAA-MM-DD (incluido)")
+        parser.add_argument("--hasta", help="Día final AAAA-MM-DD (incluido)")
+        parser.add_argument("--sensor", type=int, action="append", dest="sensores")
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        hoy = timezone.localdate()
+        desde = _parsear_dia(options["desde"]) if options["desde"] else _parsear_dia(
+            (hoy - timedelta(days=1)).isoformat()
+        )
+        hasta = _parsear_dia(options["hasta"] or hoy.isoformat()) + timedelta(days=1)
+        if hasta <= desde:
+            raise CommandError("--hasta debe ser igual o posterior a --desde.")
+
+        total = recalcular_resumenes(
+            desde, hasta, sensor_ids=options["sensores"], chunk_size=options["chunk_size"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"{total} resúmenes escritos."))
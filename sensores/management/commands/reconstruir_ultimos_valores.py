@@ -0,0 +1,24 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Comando para recalcular el último valor de cada sensor
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from django.core.management.base import BaseCommand
+
+from sensores.services import reconstruir_ultimos_valores
+
+
+class Command(BaseCommand):
+    help = "Recalcula la tabla UltimoValorSensor a partir de las lecturas existentes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sensor", type=int, action="append", dest="sensores",
+            help="Id de sensor a recalcular (repetible). Por defecto, todos.",
+        )
+
+    def handle(self, *args, **options):
+        total = reconstruir_ultimos_valores(options["sensores"])
+        self.stdout.write(self.style.SUCCESS(f"{total} sensores actualizados."))
@@ -3,13 +3,16 @@
 # FECHA DE CREACIÓN: 01-11-2025
 # LICENCIA: Uso Educacional-No Comercial
 # PROPÓSITO: Modelos para sensores y actuadores IoT
-# FECHA ÚLTIMA MODIFICACIÓN: 18-11-2025
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
 # ---------------------------------------------------------
-from django.db import models
+import operator
+
+from django.db import models, transaction
 from django.utils import timezone
 from core.models import BaseModel
 from planta.models import Estanque
 from inventario.models import Ubicacion
+from sensores.estado_actuadores import recordar_estado
 
 
 # ───────────────────────────────────────────────
@@ -35,6 +38,40 @@ class Dispositivo(BaseModel):
 # ───────────────────────────────────────────────
 #   Sensor IoT
 # ───────────────────────────────────────────────
+def condicion_fuera_de_rango(valor: str, prefijo_sensor: str = "") -> models.Q:
+    """
+    Q para "valor fuera del rango del sensor". Un límite NULL no se cumple
+    nunca (comparar con NULL es falso en SQL), igual que en esta_fuera_de_rango().
+    """
+    return (
+        models.Q(**{f"{valor}__lt": models.F(f"{prefijo_sensor}rango_min")})
+        | models.Q(**{f"{valor}__gt": models.F(f"{prefijo_sensor}rango_max")})
+    )
+
+
+def _anotacion_fuera_de_rango(condicion: models.Q):
+    return models.Case(
+        models.When(condicion, then=models.Value(True)),
+        default=models.Value(False),
+        output_field=models.BooleanField(),
+    )
+
+
+class SensorQuerySet(models.QuerySet):
+    def con_ultimo_valor(self):
+        """
+        Precarga el último valor de cada sensor (tabla UltimoValorSensor):
+        valor_actual() y esta_fuera_de_rango() no hacen consultas extra.
+        """
+        return self.select_related("ultimo_valor")
+
+    def con_fuera_de_rango(self):
+        """Anota fuera_de_rango según el último valor (mismo criterio que esta_fuera_de_rango)."""
+        return self.annotate(
+            fuera_de_rango=_anotacion_fuera_de_rango(condicion_fuera_de_rango("ultimo_valor__valor"))
+        )
+
+
 class Sensor(Dispositivo):
     TIPO_SENSOR = [
         ("NIVEL", "Nivel estanque (ultrasónico)"),
@@ -60,19 +97,40 @@ class Sensor(Dispositivo):
     # Sensor de pH inicialmente desactivado
     activo = models.BooleanField(default=True)
 
+    objects = SensorQuerySet.as_manager()
+
     def save(self, *args, **kwargs):
         if self.tipo == "PH" and self._state.adding:
             self.activo = False
         super().save(*args, **kwargs)
 
+    def _ultimo_valor_o_none(self):
+        try:
+            return self.ultimo_valor
+        except UltimoValorSensor.DoesNotExist:
+            return None
+
     def ultima_lectura(self):
+        ultimo = self._ultimo_valor_o_none()
+        if ultimo is not None and ultimo.lectura_id:
+            return ultimo.lectura
         return self.lecturas.order_by("-fecha_hora").first()
 
     def valor_actual(self):
-        ultima = self.ultima_lectura()
+        """
+        Usa el valor desnormalizado (UltimoValorSensor) que mantiene
+        registrar_lectura; si aún no existe, consulta las lecturas.
+        """
+        ultimo = self._ultimo_valor_o_none()
+        if ultimo is not None:
+            return ultimo.valor
+        ultima = self.lecturas.order_by("-fecha_hora").first()
         return ultima.valor if ultima else None
 
     def esta_fuera_de_rango(self) -> bool:
+        # Anotado por Sensor.objects.con_fuera_de_rango(): sin consultas
+        if hasattr(self, "fuera_de_rango"):
+            return self.fuera_de_rango
         valor = self.valor_actual()
         if valor is None:
             return False
@@ -111,13 +169,62 @@ class Actuador(Dispositivo):
     def es_bomba(self):
         return self.tipo == "BOMBA"
 
-    def encender(self):
-        self.encendido = True
-        self.save()
+    def _estados_comandos(self):
+        """Estados de los comandos del actuador, del más reciente al más antiguo."""
+        return (
+            ComandoActuador.objects.filter(actuador_id=self.pk)
+            .order_by("-creado_en", "-id")
+            .values_list("estado", flat=True)
+        )
 
-    def apagar(self):
-        self.encendido = False
-        self.save()
+    def _comando(self, encendido: bool, regla=None) -> "ComandoActuador":
+        return ComandoActuador(
+            actuador_id=self.pk, accion="ENCENDER" if encendido else "APAGAR", regla=regla
+        )
+
+    def _cambiar_estado(self, encendido: bool, regla=None) -> bool:
+        """
+        UPDATE condicional (WHERE encendido <> nuevo estado): sólo escribe si
+        el estado cambia. Devuelve True si hubo cambio.
+
+        Cada cambio deja su comando (ENCENDER/APAGAR) en la outbox en la misma
+        transacción. Sin cambio, el comando se vuelve a encolar si el último
+        del actuador quedó FALLIDO (el dispositivo no recibió el estado).
+        """
+        with transaction.atomic():
+            filas = Actuador.objects.filter(pk=self.pk).exclude(encendido=encendido).update(
+                encendido=encendido, updated_at=timezone.now()
+            )
+            if filas or self._estados_comandos().first() == "FALLIDO":
+                self._comando(encendido, regla).save()
+        self.encendido = encendido
+        # Si la transacción externa (ej: la de la lectura) se revierte, la
+        # caché no debe quedar con un estado que nunca se guardó
+        transaction.on_commit(lambda: recordar_estado(self.pk, encendido))
+        return filas > 0
+
+    async def _acambiar_estado(self, encendido: bool, regla=None) -> bool:
+        filas = await Actuador.objects.filter(pk=self.pk).exclude(encendido=encendido).aupdate(
+            encendido=encendido, updated_at=timezone.now()
+        )
+        if filas or await self._estados_comandos().afirst() == "FALLIDO":
+            await self._comando(encendido, regla).asave()
+        self.encendido = encendido
+        # aupdate() ya confirmó (la ruta async no abre transacciones)
+        recordar_estado(self.pk, encendido)
+        return filas > 0
+
+    def encender(self, regla=None) -> bool:
+        return self._cambiar_estado(True, regla)
+
+    def apagar(self, regla=None) -> bool:
+        return self._cambiar_estado(False, regla)
+
+    async def aencender(self, regla=None) -> bool:
+        return await self._acambiar_estado(True, regla)
+
+    async def aapagar(self, regla=None) -> bool:
+        return await self._acambiar_estado(False, regla)
 
     def estado_bomba(self) -> str:
         if not self.es_bomba():
@@ -128,6 +235,44 @@ class Actuador(Dispositivo):
 # ───────────────────────────────────────────────
 #   Lectura proveniente del sensor
 # ───────────────────────────────────────────────
+class LecturaQuerySet(models.QuerySet):
+    """
+    Evaluación de rangos en bloque: el límite del sensor se compara en SQL
+    (JOIN con Sensor), sin una consulta por lectura.
+    """
+
+    def entre(self, desde=None, hasta=None):
+        """Lecturas en [desde, hasta); cualquiera de los dos puede omitirse."""
+        qs = self
+        if desde is not None:
+            qs = qs.filter(fecha_hora__gte=desde)
+        if hasta is not None:
+            qs = qs.filter(fecha_hora__lt=hasta)
+        return qs
+
+    def con_fuera_de_rango(self):
+        """Anota fuera_de_rango en cada lectura; esta_fuera_de_rango() lo reutiliza."""
+        return self.annotate(fuera_de_rango=_anotacion_fuera_de_rango(condicion_fuera_de_rango("valor", "sensor__")))
+
+    def solo_fuera_de_rango(self):
+        return self.filter(condicion_fuera_de_rango("valor", "sensor__"))
+
+    def conteo_fuera_de_rango(self) -> dict[int, dict]:
+        """
+        Una consulta: {sensor_id: {"total": n, "fuera_de_rango": m}} para las
+        lecturas del queryset (ej: Lectura.objects.entre(inicio_mes, fin_mes)).
+        """
+        filas = (
+            self.order_by()
+            .values("sensor_id")
+            .annotate(
+                total=models.Count("id"),
+                fuera=models.Count("id", filter=condicion_fuera_de_rango("valor", "sensor__")),
+            )
+        )
+        return {f["sensor_id"]: {"total": f["total"], "fuera_de_rango": f["fuera"]} for f in filas}
+
+
 class Lectura(BaseModel):
     ORIGEN_LECTURA = [
         ("ESP32", "Lectura desde ESP32"),
@@ -141,14 +286,35 @@ class Lectura(BaseModel):
     fecha_hora = models.DateTimeField()
     origen = models.CharField(max_length=10, choices=ORIGEN_LECTURA, default="ESP32")
     raw_payload = models.JSONField(null=True, blank=True)
+    # Número de secuencia o hash del payload: los reintentos no duplican (ver sensores.idempotencia)
+    clave_idempotencia = models.CharField(max_length=64, null=True, blank=True)
+
+    objects = LecturaQuerySet.as_manager()
 
     class Meta:
+        # Con la tabla particionada (particiones_lecturas convertir) la PK y la
+        # unicidad de la clave incluyen fecha_hora: ver sensores.particiones
+        # antes de migrar cambios a este modelo.
         ordering = ["-fecha_hora"]
+        indexes = [
+            # ultima_lectura, rangos por sensor y gráficos
+            models.Index(fields=["sensor", "-fecha_hora"], name="lectura_sensor_fecha_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["sensor", "clave_idempotencia"],
+                condition=models.Q(clave_idempotencia__isnull=False),
+                name="lectura_clave_idempotencia_unica",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.sensor} = {self.valor} {self.unidad} ({self.fecha_hora})"
 
     def esta_fuera_de_rango(self) -> bool:
+        # Anotado por Lectura.objects.con_fuera_de_rango(): no carga el sensor
+        if hasattr(self, "fuera_de_rango"):
+            return self.fuera_de_rango
         sensor = self.sensor
         if sensor.rango_min is None and sensor.rango_max is None:
             return False
@@ -159,6 +325,85 @@ class Lectura(BaseModel):
         return False
 
 
+# ───────────────────────────────────────────────
+#   Último valor por sensor (desnormalizado)
+# ───────────────────────────────────────────────
+class UltimoValorSensor(models.Model):
+    """
+    Última lectura conocida de cada sensor, mantenida por registrar_lectura
+    en cada inserción (las lecturas con fecha anterior se ignoran).
+    Permite obtener el valor actual de toda la planta en una sola consulta.
+    """
+    sensor = models.OneToOneField(
+        Sensor,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="ultimo_valor",
+    )
+    # Sin FK en BD: Lectura puede estar particionada (ver particiones_lecturas)
+    lectura = models.ForeignKey(
+        Lectura,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        db_constraint=False,
+    )
+    valor = models.DecimalField(max_digits=12, decimal_places=4)
+    unidad = models.CharField(max_length=20)
+    fecha_hora = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Último valor de sensor"
+        verbose_name_plural = "Últimos valores de sensores"
+
+    def __str__(self):
+        return f"{self.sensor_id} = {self.valor} {self.unidad} ({self.fecha_hora})"
+
+
+# ───────────────────────────────────────────────
+#   Resúmenes de lecturas por intervalo (rollups)
+# ───────────────────────────────────────────────
+class ResumenLectura(models.Model):
+    """
+    Agregado de lecturas de un sensor en un intervalo (1 minuto, 1 hora, 1 día).
+    Se mantiene en la ingesta y con el comando recalcular_resumenes;
+    los gráficos de largo plazo leen estos registros en vez de Lectura.
+    """
+    RESOLUCIONES = [
+        ("1m", "1 minuto"),
+        ("1h", "1 hora"),
+        ("1d", "1 día"),
+    ]
+
+    sensor = models.ForeignKey(Sensor, on_delete=models.CASCADE, related_name="resumenes")
+    resolucion = models.CharField(max_length=3, choices=RESOLUCIONES)
+    inicio = models.DateTimeField(help_text="Inicio del intervalo (hora local de la planta)")
+    minimo = models.DecimalField(max_digits=12, decimal_places=4)
+    maximo = models.DecimalField(max_digits=12, decimal_places=4)
+    suma = models.DecimalField(max_digits=20, decimal_places=4)
+    cantidad = models.PositiveIntegerField()
+    ultimo_valor = models.DecimalField(max_digits=12, decimal_places=4)
+    ultima_fecha = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Resumen de lecturas"
+        verbose_name_plural = "Resúmenes de lecturas"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["sensor", "resolucion", "inicio"],
+                name="resumen_lectura_unico_por_intervalo",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.sensor_id} [{self.resolucion}] {self.inicio}: {self.promedio}"
+
+    @property
+    def promedio(self):
+        return self.suma / self.cantidad if self.cantidad else None
+
+
 # ───────────────────────────────────────────────
 #   Modelo de alertas
 # ───────────────────────────────────────────────
@@ -175,10 +420,46 @@ class Alerta(BaseModel):
     ]
 
     sensor = models.ForeignKey(Sensor, on_delete=models.CASCADE, related_name="alertas")
-    lectura = models.ForeignKey(Lectura, on_delete=models.SET_NULL, null=True, blank=True)
+    # Sin FK en BD: Lectura puede estar particionada (ver particiones_lecturas)
+    lectura = models.ForeignKey(
+        Lectura,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        db_constraint=False,
+    )
+    regla = models.ForeignKey(
+        "ReglaControl",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="alertas",
+    )
     severidad = models.CharField(max_length=10, choices=SEVERIDAD)
     mensaje = models.CharField(max_length=255)
     estado = models.CharField(max_length=15, choices=ESTADO, default="NUEVA")
+    # Deduplicación: coincidencias repetidas de la misma regla suman aquí
+    ocurrencias = models.PositiveIntegerField(default=1)
+    ultima_vez = models.DateTimeField(null=True, blank=True)
+
+    ESTADOS_ABIERTOS = ("NUEVA", "EN_PROCESO")
+
+    class Meta:
+        indexes = [
+            # alertas abiertas por sensor, más recientes primero
+            models.Index(
+                fields=["sensor", "estado", "-created_at"],
+                name="alerta_sensor_estado_idx",
+            ),
+        ]
+        constraints = [
+            # A lo más una alerta abierta por (sensor, regla)
+            models.UniqueConstraint(
+                fields=["sensor", "regla"],
+                condition=models.Q(estado__in=["NUEVA", "EN_PROCESO"], regla__isnull=False),
+                name="alerta_abierta_unica_por_regla",
+            ),
+        ]
 
     def __str__(self):
         return f"[{self.severidad}] {self.mensaje}"
@@ -187,12 +468,29 @@ class Alerta(BaseModel):
 # ───────────────────────────────────────────────
 #   Reglas automáticas de control (IoT)
 # ───────────────────────────────────────────────
+# Condición de la regla -> función de comparación (valor, umbral)
+OPERADORES_CONDICION = {
+    "MAYOR": operator.gt,
+    ">": operator.gt,
+    "MENOR": operator.lt,
+    "<": operator.lt,
+    "MAYOR_IGUAL": operator.ge,
+    ">=": operator.ge,
+    "MENOR_IGUAL": operator.le,
+    "<=": operator.le,
+    "IGUAL": operator.eq,
+    "==": operator.eq,
+}
+
+
 class ReglaControl(BaseModel):
     """
     Regla simple de automatización:
     - condicion: cómo comparar (MAYOR, MENOR, etc.)
     - umbral: valor de referencia
     - actuador opcional: si se cumple, se enciende (por ahora sólo ENCENDER)
+    - histeresis / intervalo_minimo_seg: evitan alertas repetidas cuando el
+      valor oscila alrededor del umbral
     """
     CONDICION_CHOICES = [
         ("MAYOR", "Mayor que"),
@@ -225,6 +523,16 @@ class ReglaControl(BaseModel):
     mensaje_accion = models.CharField(max_length=255)
     severidad = models.CharField(max_length=10, choices=SEVERIDAD_CHOICES, default="WARN")
     activo = models.BooleanField(default=True)
+    histeresis = models.DecimalField(
+        max_digits=12,
+        decimal_places=4,
+        default=0,
+        help_text="Margen que el valor debe retroceder bajo/sobre el umbral para dar la condición por terminada",
+    )
+    intervalo_minimo_seg = models.PositiveIntegerField(
+        default=0,
+        help_text="Segundos mínimos entre dos alertas nuevas de esta regla",
+    )
 
     class Meta:
         verbose_name = "Regla de control"
@@ -238,20 +546,76 @@ class ReglaControl(BaseModel):
         Evalúa si el valor cumple la condición de la regla.
         Acepta tanto float/Decimal como string convertible.
         """
+        operador = OPERADORES_CONDICION.get(self.condicion)
+        if operador is None:
+            return False
+
         try:
             v = float(valor)
             u = float(self.umbral)
         except Exception:
             return False
 
-        if self.condicion in ("MAYOR", ">"):
-            return v > u
-        if self.condicion in ("MENOR", "<"):
-            return v < u
-        if self.condicion in ("MAYOR_IGUAL", ">="):
-            return v >= u
-        if self.condicion in ("MENOR_IGUAL", "<="):
-            return v <= u
-        if self.condicion in ("IGUAL", "=="):
-            return v == u
-        return False
+        return operador(v, u)
+
+
+# ───────────────────────────────────────────────
+#   Comandos a actuadores (outbox)
+# ───────────────────────────────────────────────
+class ComandoActuador(models.Model):
+    """
+    Comando pendiente de entregar a un dispositivo. Lo inserta
+    Actuador.encender()/apagar() en la transacción del cambio de estado; la
+    entrega la hace manage.py despachar_comandos (ver sensores.comandos).
+    """
+    ACCIONES = [
+        ("ENCENDER", "Encender"),
+        ("APAGAR", "Apagar"),
+    ]
+    ESTADOS = [
+        ("PENDIENTE", "Pendiente"),
+        ("EN_CURSO", "En curso"),
+        ("ENVIADO", "Enviado"),
+        ("CONFIRMADO", "Confirmado"),
+        ("FALLIDO", "Fallido"),
+    ]
+
+    actuador = models.ForeignKey(Actuador, on_delete=models.CASCADE, related_name="comandos")
+    regla = models.ForeignKey(
+        ReglaControl,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="comandos",
+    )
+    accion = models.CharField(max_length=10, choices=ACCIONES)
+    estado = models.CharField(max_length=10, choices=ESTADOS, default="PENDIENTE")
+    intentos = models.PositiveSmallIntegerField(default=0)
+    error = models.CharField(max_length=255, blank=True)
+
+    creado_en = models.DateTimeField(default=timezone.now)
+    # Tomado por un despachador (EN_CURSO); vencido el plazo, otro lo retoma
+    reclamado_en = models.DateTimeField(null=True, blank=True)
+    enviado_en = models.DateTimeField(null=True, blank=True)
+    confirmado_en = models.DateTimeField(null=True, blank=True)
+    # Desde la creación hasta el ack del dispositivo
+    latencia_ms = models.PositiveIntegerField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Comando de actuador"
+        verbose_name_plural = "Comandos de actuadores"
+        indexes = [
+            # cola del despachador: pendientes en orden de llegada
+            models.Index(
+                fields=["creado_en"],
+                name="comando_pendiente_idx",
+                condition=models.Q(estado="PENDIENTE"),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.accion} {self.actuador_id} ({self.estado})"
+
+    def como_mensaje(self) -> dict:
+        """Cuerpo que recibe el dispositivo; 'id' se devuelve en el ack."""
+        return {"id": self.pk, "accion": self.accion, "gpio": self.actuador.gpio}
@@ -0,0 +1,197 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Caché en memoria de reglas de control compiladas por sensor
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Iterable, NamedTuple
+
+from django.conf import settings
+
+from sensores.models import OPERADORES_CONDICION, ReglaControl
+
+
+class ReglaCompilada(NamedTuple):
+    """
+    Regla lista para evaluar sin tocar la base de datos:
+    - operador: función de comparación (valor, umbral) -> bool
+    - umbral: umbral ya convertido a float
+    - histeresis: margen para dar por terminada la condición (float)
+    - regla: instancia de ReglaControl (acción a ejecutar si se cumple)
+    """
+    operador: Callable[[float, float], bool]
+    umbral: float
+    histeresis: float
+    regla: ReglaControl
+
+
+class Disparo(NamedTuple):
+    """Regla que se cumple para una lectura; inicio_episodio indica que antes no se cumplía."""
+    regla: ReglaControl
+    inicio_episodio: bool
+
+
+# sensor_id -> (instante de expiración, reglas compiladas)
+_cache: dict[int, tuple[float, list[ReglaCompilada]]] = {}
+_lock = threading.Lock()
+
+# regla_id presente mientras su condición está activa (episodio en curso)
+_episodios: set[int] = set()
+
+
+def _ttl() -> float:
+    """
+    Segundos de vida de una entrada. Las señales invalidan el caché del
+    proceso que guarda la regla; el TTL acota el desfase en otros workers.
+    """
+    return getattr(settings, "SENSORES_REGLAS_CACHE_TTL", 300)
+
+
+def compilar_regla(regla: ReglaControl) -> ReglaCompilada | None:
+    """Convierte una ReglaControl en ReglaCompilada (None si no es evaluable)."""
+    operador = OPERADORES_CONDICION.get(regla.condicion)
+    if operador is None:
+        return None
+    try:
+        umbral = float(regla.umbral)
+        histeresis = float(regla.histeresis or 0)
+    except Exception:
+        return None
+    return ReglaCompilada(operador, umbral, histeresis, regla)
+
+
+def _sensores_sin_cache(sensor_ids: Iterable[int]) -> set[int]:
+    ahora = time.monotonic()
+    with _lock:
+        return {
+            sensor_id
+            for sensor_id in sensor_ids
+            if sensor_id not in _cache or _cache[sensor_id][0] <= ahora
+        }
+
+
+def _guardar_compiladas(
+    faltantes: set[int], reglas: Iterable[ReglaControl]
+) -> dict[int, list[ReglaCompilada]]:
+    compiladas: dict[int, list[ReglaCompilada]] = {sensor_id: [] for sensor_id in faltantes}
+    for regla in reglas:
+        compilada = compilar_regla(regla)
+        if compilada is not None:
+            compiladas[regla.sensor_id].append(compilada)
+
+    expira = time.monotonic() + _ttl()
+    with _lock:
+        for sensor_id, lista in compiladas.items():
+            _cache[sensor_id] = (expira, lista)
+    return compiladas
+
+
+def _consulta_reglas(sensor_ids: set[int]):
+    return ReglaControl.objects.filter(
+        sensor_id__in=sensor_ids, activo=True
+    ).select_related("actuador")
+
+
+def precargar_reglas(sensor_ids: Iterable[int]) -> dict[int, list[ReglaCompilada]]:
+    """
+    Compila en una sola consulta las reglas activas de los sensores
+    que aún no están en caché (o cuya entrada expiró).
+    Retorna las reglas recién compiladas por sensor.
+    """
+    faltantes = _sensores_sin_cache(sensor_ids)
+    if not faltantes:
+        return {}
+    return _guardar_compiladas(faltantes, _consulta_reglas(faltantes))
+
+
+async def aprecargar_reglas(sensor_ids: Iterable[int]) -> None:
+    """Versión async de precargar_reglas (para la ingesta ASGI)."""
+    faltantes = _sensores_sin_cache(sensor_ids)
+    if faltantes:
+        reglas = [regla async for regla in _consulta_reglas(faltantes)]
+        _guardar_compiladas(faltantes, reglas)
+
+
+def reglas_compiladas(sensor_id: int) -> list[ReglaCompilada]:
+    """Reglas activas compiladas del sensor (consulta la BD sólo si no hay caché)."""
+    entrada = _cache.get(sensor_id)
+    if entrada is not None and entrada[0] > time.monotonic():
+        return entrada[1]
+    return _guardar_compiladas({sensor_id}, _consulta_reglas({sensor_id}))[sensor_id]
+
+
+def reglas_que_se_cumplen(sensor_id: int, valor) -> list[ReglaControl]:
+    """Retorna las reglas del sensor cuya condición se cumple para 'valor'."""
+    try:
+        v = float(valor)
+    except Exception:
+        return []
+    return [
+        compilada.regla
+        for compilada in reglas_compiladas(sensor_id)
+        if compilada.operador(v, compilada.umbral)
+    ]
+
+
+def _sigue_en_banda(compilada: ReglaCompilada, v: float) -> bool:
+    """True si el valor aún no retrocede 'histeresis' más allá del umbral."""
+    condicion = compilada.regla.condicion
+    if condicion in ("MAYOR", ">", "MAYOR_IGUAL", ">="):
+        return v > compilada.umbral - compilada.histeresis
+    if condicion in ("MENOR", "<", "MENOR_IGUAL", "<="):
+        return v < compilada.umbral + compilada.histeresis
+    return abs(v - compilada.umbral) <= compilada.histeresis
+
+
+def evaluar_lectura(sensor_id: int, valor) -> list[Disparo]:
+    """
+    Evalúa las reglas del sensor y mantiene el estado de episodio de cada una:
+    - la regla se cumple: Disparo (inicio_episodio si antes no estaba activa)
+    - deja de cumplirse: el episodio termina sólo cuando el valor sale de la
+      banda de histéresis; dentro de la banda no hay disparo ni cambio de estado
+    """
+    try:
+        v = float(valor)
+    except Exception:
+        return []
+
+    disparos = []
+    for compilada in reglas_compiladas(sensor_id):
+        regla_id = compilada.regla.pk
+        activa = regla_id in _episodios
+        if compilada.operador(v, compilada.umbral):
+            _episodios.add(regla_id)
+            disparos.append(Disparo(compilada.regla, not activa))
+        elif activa and not (compilada.histeresis > 0 and _sigue_en_banda(compilada, v)):
+            _episodios.discard(regla_id)
+    return disparos
+
+
+def olvidar_episodio(regla_id: int) -> None:
+    _episodios.discard(regla_id)
+
+
+def invalidar_reglas(sensor_id: int | None = None) -> None:
+    """Invalida las reglas de un sensor, o todo el caché si sensor_id es None."""
+    with _lock:
+        if sensor_id is None:
+            _cache.clear()
+        else:
+            _cache.pop(sensor_id, None)
+
+
+def invalidar_reglas_de_actuador(actuador_id: int) -> None:
+    """Invalida las entradas que contienen reglas asociadas al actuador."""
+    with _lock:
+        afectados = [
+            sensor_id
+            for sensor_id, (_, lista) in _cache.items()
+            if any(compilada.regla.actuador_id == actuador_id for compilada in lista)
+        ]
+        for sensor_id in afectados:
+            del _cache[sensor_id]
@@ -0,0 +1,70 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Consumidor MQTT de lecturas de sensores
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from __future__ import annotations
+
+import json
+import logging
+
+from sensores.ingesta import IngestorLotes
+
+logger = logging.getLogger(__name__)
+
+
+def parsear_mensaje_mqtt(topico: str, payload: bytes) -> list[dict] | None:
+    """
+    Convierte un mensaje MQTT en una lista de payloads de lectura.
+
+    - El cuerpo puede ser un objeto JSON o una lista de objetos (buffer).
+    - Si falta 'sensor_codigo', se toma del tópico: planta/<sensor_codigo>/lectura
+
+    La validación de campos la hace registrar_lecturas_lote con las
+    mismas reglas que procesar_payload_lectura. Retorna None si no es JSON.
+    """
+    try:
+        data = json.loads(payload.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        return None
+
+    items = data if isinstance(data, list) else [data]
+    partes = topico.split("/")
+    codigo_topico = partes[-2] if len(partes) >= 3 else None
+
+    for item in items:
+        if isinstance(item, dict) and "sensor_codigo" not in item and codigo_topico:
+            item["sensor_codigo"] = codigo_topico
+    return items
+
+
+class ConsumidorMqtt:
+    """
+    Conecta un cliente MQTT (paho-mqtt o un sustituto con la misma interfaz:
+    on_connect, on_message, subscribe) al IngestorLotes.
+    """
+
+    def __init__(self, cliente, ingestor: IngestorLotes, topico: str = "planta/+/lectura", qos: int = 1):
+        self.cliente = cliente
+        self.ingestor = ingestor
+        self.topico = topico
+        self.qos = qos
+        self.invalidos = 0
+        cliente.on_connect = self._on_connect
+        cliente.on_message = self._on_message
+
+    def _on_connect(self, cliente, userdata, *args):
+        # paho 1.x: (flags, rc) / paho 2.x: (flags, reason_code, properties)
+        logger.info("Conectado al broker MQTT, suscribiendo a %s", self.topico)
+        cliente.subscribe(self.topico, qos=self.qos)
+
+    def _on_message(self, cliente, userdata, mensaje):
+        items = parsear_mensaje_mqtt(mensaje.topic, mensaje.payload)
+        if items is None:
+            self.invalidos += 1
+            logger.warning("Mensaje MQTT inválido en %s", mensaje.topic)
+            return
+        for item in items:
+            self.ingestor.encolar(item)
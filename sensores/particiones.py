@@ -0,0 +1,269 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Particionamiento mensual de Lectura en PostgreSQL
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+"""
+Particionamiento declarativo (RANGE por fecha_hora, un mes por partición)
+de la tabla de lecturas. Sólo PostgreSQL 12+.
+
+- La tabla existente se conserva como partición "histórica" (sin copiar filas).
+- La conversión tiene dos fases. sql_preparar_conversion() construye en la
+  tabla actual, con CREATE INDEX CONCURRENTLY y un CHECK NOT VALID validado
+  después, los índices y la restricción de rango que exigirá el padre: corre
+  fuera de transacción (ejecutar_sin_transaccion) y no bloquea la ingesta.
+  sql_convertir() es la transacción corta que crea el padre y adjunta la
+  tabla: ATTACH reutiliza esos índices y no vuelve a recorrer las filas.
+- La histórica cubre el mes en curso y 'margen_meses' meses más: el CHECK
+  ya rige para las inserciones entre ambas fases, y así no rechaza lecturas
+  actuales ni las de un reloj de dispositivo algo adelantado. Una lectura
+  posterior a ese límite sí se rechaza hasta convertir (tras la conversión
+  va a la partición DEFAULT).
+- Los límites son timestamptz con el desfase de TIME_ZONE explícito (inicio
+  del mes en hora local), no fechas que PostgreSQL leería en la zona de la
+  sesión.
+- La PK pasa a ser (id, fecha_hora), por exigencia de PostgreSQL; por eso
+  Alerta.lectura y UltimoValorSensor.lectura no tienen FK en la BD.
+- Una partición DEFAULT recibe lecturas de meses sin partición creada.
+- Por la misma exigencia, la unicidad de (sensor, clave_idempotencia) queda
+  como (sensor, clave_idempotencia, fecha_hora): sólo se garantiza para
+  reintentos con la misma fecha_hora (el ESP32 la envía en cada reintento).
+
+Esquema vs. Lectura.Meta: el padre conserva los nombres que usa Django
+(sensores_lectura_pkey, lectura_sensor_fecha_idx,
+lectura_clave_idempotencia_unica), así RemoveIndex/RemoveConstraint siguen
+funcionando, pero la PK y la unicidad incluyen fecha_hora. Tras convertir,
+las migraciones que alteren Lectura (PK, esa restricción, tipos de columna)
+deben escribirse a mano con SeparateDatabaseAndState/RunSQL: las que genera
+makemigrations asumen la tabla sin particionar.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, time
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from sensores.models import Alerta, Lectura, UltimoValorSensor
+
+TABLA = Lectura._meta.db_table
+HISTORICA = f"{TABLA}_historica"
+DEFAULT = f"{TABLA}_default"
+SECUENCIA = f"{TABLA}_id_seq"
+
+# Nombres de Django (Lectura.Meta y PK) que pasan de la histórica al padre
+INDICE_SENSOR_FECHA = "lectura_sensor_fecha_idx"
+INDICE_CLAVE = "lectura_clave_idempotencia_unica"
+INDICE_BRIN = "lectura_fecha_brin"
+PK = f"{TABLA}_pkey"
+
+
+def sumar_meses(dia: date, meses: int) -> date:
+    """Primer día del mes que está 'meses' meses después del mes de 'dia'."""
+    indice = dia.year * 12 + (dia.month - 1) + meses
+    return date(indice // 12, indice % 12 + 1, 1)
+
+
+def nombre_particion(mes: date) -> str:
+    return f"{TABLA}_p{mes.year}_{mes.month:02d}"
+
+
+def inicio_mes(mes: date) -> str:
+    """Literal timestamptz del inicio del mes en hora local, con su desfase."""
+    inicio = timezone.make_aware(datetime.combine(mes.replace(day=1), time.min))
+    return f"'{inicio.isoformat()}'::timestamptz"
+
+
+def sql_preparar_conversion(primer_mes: date) -> list[str]:
+    """
+    Fase 1, fuera de transacción (cada sentencia por separado): índices y
+    CHECK de rango en la tabla actual, equivalentes a los del futuro padre.
+    Si un CREATE INDEX CONCURRENTLY falla deja el índice INVALID: eliminarlo
+    (DROP INDEX CONCURRENTLY) antes de reintentar.
+    """
+    return [
+        f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {HISTORICA}_pk_idx ON {TABLA} (id, fecha_hora)",
+        f"""
+        CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {HISTORICA}_clave_idx
+            ON {TABLA} (sensor_id, clave_idempotencia, fecha_hora)
+            WHERE clave_idempotencia IS NOT NULL
+        """,
+        sql_indice_brin(),
+        # NOT VALID: agregarla es inmediato; VALIDATE recorre la tabla sin
+        # bloquear lecturas ni escrituras. Con ella ATTACH no valida el rango.
+        f"""
+        ALTER TABLE {TABLA} ADD CONSTRAINT {HISTORICA}_rango
+            CHECK (fecha_hora IS NOT NULL AND fecha_hora < {inicio_mes(primer_mes)}) NOT VALID
+        """,
+        f"ALTER TABLE {TABLA} VALIDATE CONSTRAINT {HISTORICA}_rango",
+    ]
+
+
+def sql_convertir(primer_mes: date) -> list[str]:
+    """
+    Fase 2, una transacción corta (requiere sql_preparar_conversion con el
+    mismo primer_mes): convierte la tabla actual en particionada. Las
+    lecturas existentes quedan en la partición histórica (MINVALUE, primer_mes).
+    """
+    return [
+        # Quitar FKs que apuntan a la tabla (PK deja de ser sólo id)
+        f"""
+        DO $$
+        DECLARE r record;
+        BEGIN
+            FOR r IN SELECT conname, conrelid::regclass AS tabla
+                     FROM pg_constraint
+                     WHERE contype = 'f' AND confrelid = '{TABLA}'::regclass
+            LOOP
+                EXECUTE format('ALTER TABLE %s DROP CONSTRAINT %I', r.tabla, r.conname);
+            END LOOP;
+        END $$
+        """,
+        # PK (id, fecha_hora) con el índice ya construido; libera los nombres de Django
+        f"ALTER TABLE {TABLA} DROP CONSTRAINT {PK}",
+        f"ALTER TABLE {TABLA} ADD CONSTRAINT {HISTORICA}_pkey PRIMARY KEY USING INDEX {HISTORICA}_pk_idx",
+        f"ALTER INDEX {INDICE_SENSOR_FECHA} RENAME TO {HISTORICA}_sensor_fecha_idx",
+        f"ALTER INDEX {INDICE_CLAVE} RENAME TO {HISTORICA}_clave_unica",
+        f"ALTER INDEX {INDICE_BRIN} RENAME TO {HISTORICA}_fecha_brin",
+        f"ALTER TABLE {TABLA} RENAME TO {HISTORICA}",
+        f"ALTER TABLE {HISTORICA} ALTER COLUMN id DROP IDENTITY IF EXISTS",
+        f"ALTER TABLE {HISTORICA} ALTER COLUMN id DROP DEFAULT",
+        f"CREATE SEQUENCE IF NOT EXISTS {SECUENCIA}",
+        f"SELECT setval('{SECUENCIA}', COALESCE((SELECT MAX(id) FROM {HISTORICA}), 0) + 1, false)",
+        f"""
+        CREATE TABLE {TABLA} (
+            LIKE {HISTORICA} INCLUDING DEFAULTS INCLUDING STORAGE
+        ) PARTITION BY RANGE (fecha_hora)
+        """,
+        f"ALTER TABLE {TABLA} ALTER COLUMN id SET DEFAULT nextval('{SECUENCIA}')",
+        f"ALTER SEQUENCE {SECUENCIA} OWNED BY {TABLA}.id",
+        # Padre vacío: estos índices son inmediatos y ATTACH adopta los de la histórica
+        f"ALTER TABLE {TABLA} ADD CONSTRAINT {PK} PRIMARY KEY (id, fecha_hora)",
+        f"""
+        ALTER TABLE {TABLA} ADD CONSTRAINT {TABLA}_sensor_fk
+            FOREIGN KEY (sensor_id) REFERENCES sensores_sensor (id)
+            DEFERRABLE INITIALLY DEFERRED
+        """,
+        f"CREATE INDEX {INDICE_SENSOR_FECHA} ON {TABLA} (sensor_id, fecha_hora DESC)",
+        f"CREATE INDEX {INDICE_BRIN} ON {TABLA} USING brin (fecha_hora)",
+        f"""
+        CREATE UNIQUE INDEX {INDICE_CLAVE}
+            ON {TABLA} (sensor_id, clave_idempotencia, fecha_hora)
+            WHERE clave_idempotencia IS NOT NULL
+        """,
+        f"""
+        ALTER TABLE {TABLA} ATTACH PARTITION {HISTORICA}
+            FOR VALUES FROM (MINVALUE) TO ({inicio_mes(primer_mes)})
+        """,
+        f"ALTER TABLE {HISTORICA} DROP CONSTRAINT {HISTORICA}_rango",
+        f"CREATE TABLE IF NOT EXISTS {DEFAULT} PARTITION OF {TABLA} DEFAULT",
+    ]
+
+
+def sql_crear_particion(mes: date) -> str:
+    siguiente = sumar_meses(mes, 1)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {nombre_particion(mes)} PARTITION OF {TABLA} "
+        f"FOR VALUES FROM ({inicio_mes(mes)}) TO ({inicio_mes(siguiente)})"
+    )
+
+
+def sql_desacoplar_particion(nombre: str, eliminar: bool = False) -> list[str]:
+    """
+    Con 'eliminar', antes del DROP se anulan las referencias sin FK en BD
+    (UltimoValorSensor.lectura, Alerta.lectura), como haría SET_NULL.
+    """
+    if not eliminar:
+        return [f"ALTER TABLE {TABLA} DETACH PARTITION {nombre}"]
+    return [
+        f"UPDATE {modelo._meta.db_table} SET lectura_id = NULL "
+        f"WHERE lectura_id IN (SELECT id FROM {nombre})"
+        for modelo in (UltimoValorSensor, Alerta)
+    ] + [
+        f"ALTER TABLE {TABLA} DETACH PARTITION {nombre}",
+        f"DROP TABLE {nombre}",
+    ]
+
+
+def sql_indice_brin() -> str:
+    """
+    Índice BRIN de fecha_hora en la tabla sin particionar (fuera de
+    transacción). La particionada ya lo tiene desde sql_convertir.
+    """
+    return f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDICE_BRIN} ON {TABLA} USING brin (fecha_hora)"
+
+
+# ================================================================
+# Operaciones (ejecutan SQL)
+# ================================================================
+def esta_particionada() -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass)",
+            [TABLA],
+        )
+        return cursor.fetchone()[0]
+
+
+def listar_particiones() -> list[tuple[str, str]]:
+    """(nombre, expresión de rango) de las particiones actuales."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = %s::regclass
+            ORDER BY c.relname
+            """,
+            [TABLA],
+        )
+        return cursor.fetchall()
+
+
+def limite_historica() -> date | None:
+    """Primer mes (local) que no cubre la partición histórica (None si no existe)."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            r"""
+            SELECT (regexp_match(pg_get_expr(relpartbound, oid), 'TO \(''([^'']+)''\)'))[1]::timestamptz
+            FROM pg_class WHERE relname = %s AND relispartition
+            """,
+            [HISTORICA],
+        )
+        fila = cursor.fetchone()
+    return timezone.localdate(fila[0]) if fila and fila[0] else None
+
+
+def ejecutar(sentencias: list[str]) -> None:
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            for sentencia in sentencias:
+                cursor.execute(sentencia)
+
+
+def ejecutar_sin_transaccion(sentencias: list[str]) -> None:
+    """Una sentencia por vez en autocommit (CREATE INDEX CONCURRENTLY, VALIDATE)."""
+    if connection.in_atomic_block:
+        raise RuntimeError("CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción.")
+    with connection.cursor() as cursor:
+        for sentencia in sentencias:
+            cursor.execute(sentencia)
+
+
+def particiones_mensuales_antes_de(limite: date) -> list[str]:
+    """Particiones mensuales (p<AAAA>_<MM>) cuyo mes termina antes de 'limite'."""
+    nombres = []
+    for nombre, _rango in listar_particiones():
+        sufijo = nombre.removeprefix(f"{TABLA}_p")
+        if sufijo == nombre:
+            continue
+        try:
+            anio, mes = (int(parte) for parte in sufijo.split("_"))
+        except ValueError:
+            continue
+        if sumar_meses(date(anio, mes, 1), 1) <= limite:
+            nombres.append(nombre)
+    return nombres
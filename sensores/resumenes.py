@@ -0,0 +1,282 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Resúmenes (rollups) de lecturas por minuto, hora y día
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Iterable
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Greatest, Least
+from django.utils import timezone
+
+from sensores.models import Lectura, ResumenLectura, Sensor
+from sensores.retencion import politica_retencion
+
+# Resolución -> duración del intervalo en segundos (de la más fina a la más gruesa)
+RESOLUCION_SEGUNDOS = {
+    "1m": 60,
+    "1h": 3600,
+    "1d": 86400,
+}
+
+
+# ================================================================
+# 1) INTERVALOS Y ACUMULACIÓN EN MEMORIA
+# ================================================================
+def inicio_intervalo(fecha: datetime, resolucion: str) -> datetime:
+    """Inicio del intervalo que contiene 'fecha', en hora local de la planta."""
+    local = timezone.localtime(fecha)
+    if resolucion == "1m":
+        return local.replace(second=0, microsecond=0)
+    if resolucion == "1h":
+        return local.replace(minute=0, second=0, microsecond=0)
+    if resolucion == "1d":
+        return local.replace(hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"Resolución desconocida: {resolucion}")
+
+
+class Acumulado:
+    """min/max/suma/cantidad/último de un intervalo, antes de escribirlo."""
+
+    __slots__ = ("minimo", "maximo", "suma", "cantidad", "ultimo_valor", "ultima_fecha")
+
+    def __init__(self, valor: Decimal, fecha: datetime):
+        self.minimo = valor
+        self.maximo = valor
+        self.suma = valor
+        self.cantidad = 1
+        self.ultimo_valor = valor
+        self.ultima_fecha = fecha
+
+    def agregar(self, valor: Decimal, fecha: datetime) -> None:
+        self.minimo = min(self.minimo, valor)
+        self.maximo = max(self.maximo, valor)
+        self.suma += valor
+        self.cantidad += 1
+        if fecha >= self.ultima_fecha:
+            self.ultimo_valor = valor
+            self.ultima_fecha = fecha
+
+
+def acumular(
+    lecturas: Iterable[tuple[int, datetime, object]],
+    resoluciones: Iterable[str] = RESOLUCION_SEGUNDOS,
+) -> dict[tuple[int, str, datetime], Acumulado]:
+    """Agrupa tuplas (sensor_id, fecha_hora, valor) por (sensor, resolución, intervalo)."""
+    resoluciones = list(resoluciones)
+    acumulados: dict[tuple[int, str, datetime], Acumulado] = {}
+    for sensor_id, fecha, valor in lecturas:
+        valor = valor if isinstance(valor, Decimal) else Decimal(str(valor))
+        for resolucion in resoluciones:
+            clave = (sensor_id, resolucion, inicio_intervalo(fecha, resolucion))
+            acumulado = acumulados.get(clave)
+            if acumulado is None:
+                acumulados[clave] = Acumulado(valor, fecha)
+            else:
+                acumulado.agregar(valor, fecha)
+    return acumulados
+
+
+# ================================================================
+# 2) MANTENCIÓN INCREMENTAL (INGESTA)
+# ================================================================
+def _fusionar(clave: tuple[int, str, datetime], acumulado: Acumulado) -> int:
+    sensor_id, resolucion, inicio = clave
+    return ResumenLectura.objects.filter(
+        sensor_id=sensor_id, resolucion=resolucion, inicio=inicio
+    ).update(
+        minimo=Least(F("minimo"), Value(acumulado.minimo)),
+        maximo=Greatest(F("maximo"), Value(acumulado.maximo)),
+        suma=F("suma") + acumulado.suma,
+        cantidad=F("cantidad") + acumulado.cantidad,
+        # En el SET se leen los valores previos de la fila
+        ultimo_valor=Case(
+            When(ultima_fecha__lte=acumulado.ultima_fecha, then=Value(acumulado.ultimo_valor)),
+            default=F("ultimo_valor"),
+        ),
+        ultima_fecha=Greatest(F("ultima_fecha"), Value(acumulado.ultima_fecha)),
+    )
+
+
+def registrar_resumenes(lecturas: Iterable[Lectura]) -> None:
+    """
+    Suma las lecturas a sus resúmenes de 1m/1h/1d: un UPDATE por intervalo
+    afectado (o un INSERT si el intervalo es nuevo).
+    """
+    acumulados = acumular((l.sensor_id, l.fecha_hora, l.valor) for l in lecturas)
+    for clave, acumulado in acumulados.items():
+        if _fusionar(clave, acumulado):
+            continue
+        sensor_id, resolucion, inicio = clave
+        try:
+            with transaction.atomic():
+                ResumenLectura.objects.create(
+                    sensor_id=sensor_id,
+                    resolucion=resolucion,
+                    inicio=inicio,
+                    minimo=acumulado.minimo,
+                    maximo=acumulado.maximo,
+                    suma=acumulado.suma,
+                    cantidad=acumulado.cantidad,
+                    ultimo_valor=acumulado.ultimo_valor,
+                    ultima_fecha=acumulado.ultima_fecha,
+                )
+        except IntegrityError:
+            # Otro proceso creó el intervalo entre el UPDATE y el INSERT
+            _fusionar(clave, acumulado)
+
+
+# ================================================================
+# 3) RECÁLCULO (COMANDO DE PUESTA AL DÍA)
+# ================================================================
+def _cortes_retencion(sensor_ids: Iterable[int] | None) -> dict[int, datetime | None]:
+    """{sensor_id: instante antes del cual sus lecturas crudas se purgan (None: nunca)}."""
+    ahora = timezone.now()
+    sensores = Sensor.objects.all()
+    if sensor_ids is not None:
+        sensores = sensores.filter(pk__in=sensor_ids)
+    cortes = {}
+    for sensor_id, tipo in sensores.values_list("pk", "tipo"):
+        dias = politica_retencion(tipo)["dias_crudos"]
+        cortes[sensor_id] = ahora - timedelta(days=dias) if dias is not None else None
+    return cortes
+
+
+def recalcular_resumenes(
+    desde: datetime,
+    hasta: datetime,
+    sensor_ids: Iterable[int] | None = None,
+    chunk_size: int = 5000,
+) -> int:
+    """
+    Reconstruye desde Lectura los resúmenes de los días locales que cubren
+    [desde, hasta). Procesa un día a la vez leyendo con iterator(), así que
+    la memoria queda acotada a los intervalos de un día.
+
+    Los resúmenes son lo único que queda tras la purga (sensores.retencion):
+    un sensor sin lecturas crudas ese día, o con el día anterior a su corte
+    de retención, conserva sus resúmenes sin tocarlos.
+    Retorna la cantidad de resúmenes escritos.
+    """
+    cortes = _cortes_retencion(sensor_ids)
+    dia = inicio_intervalo(desde, "1d")
+    total = 0
+    while dia < hasta:
+        siguiente = inicio_intervalo(dia + timedelta(hours=36), "1d")
+
+        lecturas = Lectura.objects.filter(fecha_hora__gte=dia, fecha_hora__lt=siguiente)
+        if sensor_ids is not None:
+            lecturas = lecturas.filter(sensor_id__in=sensor_ids)
+        vigentes = [
+            sensor_id
+            for sensor_id in lecturas.order_by().values_list("sensor_id", flat=True).distinct()
+            if cortes.get(sensor_id) is None or dia >= cortes[sensor_id]
+        ]
+        if not vigentes:
+            dia = siguiente
+            continue
+        lecturas = lecturas.filter(sensor_id__in=vigentes)
+        resumenes = ResumenLectura.objects.filter(
+            inicio__gte=dia, inicio__lt=siguiente, sensor_id__in=vigentes
+        )
+
+        acumulados = acumular(
+            lecturas.order_by().values_list("sensor_id", "fecha_hora", "valor").iterator(
+                chunk_size=chunk_size
+            )
+        )
+        with transaction.atomic():
+            resumenes.delete()
+            ResumenLectura.objects.bulk_create(
+                [
+                    ResumenLectura(
+                        sensor_id=sensor_id,
+                        resolucion=resolucion,
+                        inicio=inicio,
+                        minimo=a.minimo,
+                        maximo=a.maximo,
+                        suma=a.suma,
+                        cantidad=a.cantidad,
+                        ultimo_valor=a.ultimo_valor,
+                        ultima_fecha=a.ultima_fecha,
+                    )
+                    for (sensor_id, resolucion, inicio), a in acumulados.items()
+                ],
+                batch_size=chunk_size,
+            )
+        total += len(acumulados)
+        dia = siguiente
+    return total
+
+
+# ================================================================
+# 4) CONSULTA DE SERIES
+# ================================================================
+def elegir_resolucion(segundos: float) -> str | None:
+    """
+    Resumen más grueso cuyo intervalo no supera 'segundos'.
+    None si se necesita más detalle que 1 minuto (usar lecturas crudas).
+    """
+    elegida = None
+    for resolucion, duracion in RESOLUCION_SEGUNDOS.items():
+        if duracion <= segundos:
+            elegida = resolucion
+    return elegida
+
+
+def serie_sensor(
+    sensor_id: int,
+    desde: datetime,
+    hasta: datetime,
+    resolucion_segundos: float | None = None,
+    max_puntos: int = 1000,
+) -> dict:
+    """
+    Serie de un sensor en [desde, hasta) para gráficos.
+
+    - resolucion_segundos: detalle mínimo pedido; si no se indica se calcula
+      para no superar 'max_puntos' puntos.
+    - Usa el resumen más grueso que satisface la resolución; si se pide
+      menos de 1 minuto, retorna lecturas crudas.
+
+    Retorna {"resolucion": "1h" | "crudo" | ..., "puntos": [...]}
+    """
+    if resolucion_segundos is None:
+        resolucion_segundos = (hasta - desde).total_seconds() / max(max_puntos, 1)
+
+    resolucion = elegir_resolucion(resolucion_segundos)
+    if resolucion is None:
+        puntos = [
+            {"fecha_hora": fecha, "valor": valor}
+            for fecha, valor in Lectura.objects.filter(
+                sensor_id=sensor_id, fecha_hora__gte=desde, fecha_hora__lt=hasta
+            ).order_by("fecha_hora").values_list("fecha_hora", "valor")
+        ]
+        return {"resolucion": "crudo", "puntos": puntos}
+
+    puntos = [
+        {
+            "inicio": inicio,
+            "minimo": minimo,
+            "maximo": maximo,
+            "promedio": suma / cantidad,
+            "cantidad": cantidad,
+            "ultimo": ultimo,
+        }
+        for inicio, minimo, maximo, suma, cantidad, ultimo in ResumenLectura.objects.filter(
+            sensor_id=sensor_id,
+            resolucion=resolucion,
+            inicio__gte=inicio_intervalo(desde, resolucion),
+            inicio__lt=hasta,
+        ).order_by("inicio").values_list(
+            "inicio", "minimo", "maximo", "suma", "cantidad", "ultimo_valor"
+        )
+    ]
+    return {"resolucion": resolucion, "puntos": puntos}
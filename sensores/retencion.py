@@ -0,0 +1,171 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Política de retención y purga por tramos de lecturas crudas
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta
+from typing import Callable
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max, Min, Sum, TextField
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast, Length
+from django.utils import timezone
+
+from sensores.models import Lectura, Sensor
+
+# Estimación de bytes por fila sin contar raw_payload (motores sin pg_column_size)
+BYTES_FILA_ESTIMADOS = 96
+
+
+def politica_retencion(tipo: str) -> dict:
+    """
+    Política para un tipo de sensor según SENSORES_RETENCION:
+      {"dias_crudos": int | None, "dias_payload": int | None}
+    None = conservar indefinidamente. Los resúmenes (ResumenLectura)
+    nunca se purgan.
+    """
+    politicas = getattr(settings, "SENSORES_RETENCION", {})
+    politica = {"dias_crudos": None, "dias_payload": None}
+    politica.update(politicas.get("default", {}))
+    politica.update(politicas.get(tipo, {}))
+    return politica
+
+
+class ResultadoPurga:
+    def __init__(self):
+        self.filas_eliminadas = 0
+        self.payloads_limpiados = 0
+        self.bytes_liberados = 0
+        self.ultimo_pk = None
+
+    def como_dict(self) -> dict:
+        return {
+            "filas_eliminadas": self.filas_eliminadas,
+            "payloads_limpiados": self.payloads_limpiados,
+            "bytes_liberados": self.bytes_liberados,
+            "ultimo_pk": self.ultimo_pk,
+        }
+
+
+def _bytes_en(qs, fila_completa: bool) -> int:
+    """
+    Bytes que ocupan las filas (o sólo su raw_payload). En PostgreSQL se usa
+    pg_column_size (incluye TOAST comprimido); en otros motores se estima.
+    """
+    tabla = Lectura._meta.db_table
+    if connection.vendor == "postgresql":
+        columna = f'"{tabla}".*' if fila_completa else f'"{tabla}"."raw_payload"'
+        expresion = RawSQL(f"pg_column_size({columna})", [])
+        return qs.aggregate(b=Sum(expresion))["b"] or 0
+
+    payload = qs.aggregate(b=Sum(Length(Cast("raw_payload", output_field=TextField()))))["b"] or 0
+    if fila_completa:
+        return payload + BYTES_FILA_ESTIMADOS * qs.count()
+    return payload
+
+
+def _recorrer_por_tramos(
+    qs,
+    chunk: int,
+    desde_pk: int | None,
+    accion: Callable,
+    pausa: float,
+    resultado: ResultadoPurga,
+    avance: Callable[[dict], None] | None,
+) -> None:
+    """
+    Aplica 'accion' al queryset en ventanas de pk [a, a + chunk), cada una
+    en su propia transacción corta. Re-ejecutar retoma desde el menor pk
+    pendiente (o desde 'desde_pk').
+    """
+    limites = qs.aggregate(minimo=Min("pk"), maximo=Max("pk"))
+    if limites["minimo"] is None:
+        return
+    inicio = max(limites["minimo"], desde_pk or 0)
+    while inicio <= limites["maximo"]:
+        ventana = qs.filter(pk__gte=inicio, pk__lt=inicio + chunk)
+        with transaction.atomic():
+            accion(ventana)
+        resultado.ultimo_pk = inicio + chunk - 1
+        if avance:
+            avance(resultado.como_dict())
+        inicio += chunk
+        if pausa:
+            time.sleep(pausa)
+
+
+def purgar_lecturas(
+    ahora: datetime | None = None,
+    chunk: int = 5000,
+    desde_pk: int | None = None,
+    pausa: float = 0.0,
+    tipos: list[str] | None = None,
+    dry_run: bool = False,
+    avance: Callable[[dict], None] | None = None,
+) -> ResultadoPurga:
+    """
+    Aplica la política de retención de cada tipo de sensor:
+      1) limpia raw_payload de lecturas más antiguas que 'dias_payload'
+         (salvo las que el paso 2 va a eliminar)
+      2) elimina lecturas crudas más antiguas que 'dias_crudos'
+    Trabaja por tramos de pk para no mantener bloqueos largos.
+    Con dry_run sólo cuenta filas y bytes.
+    """
+    ahora = ahora or timezone.now()
+    resultado = ResultadoPurga()
+    tipos = tipos or [tipo for tipo, _ in Sensor.TIPO_SENSOR]
+
+    for tipo in tipos:
+        politica = politica_retencion(tipo)
+        sensor_ids = list(Sensor.objects.filter(tipo=tipo).values_list("pk", flat=True))
+        if not sensor_ids:
+            continue
+        lecturas = Lectura.objects.filter(sensor_id__in=sensor_ids)
+        corte_crudos = (
+            ahora - timedelta(days=politica["dias_crudos"])
+            if politica["dias_crudos"] is not None else None
+        )
+
+        if politica["dias_payload"] is not None:
+            corte = ahora - timedelta(days=politica["dias_payload"])
+
+            def limpiar(ventana):
+                ventana = ventana.filter(raw_payload__isnull=False)
+                resultado.bytes_liberados += _bytes_en(ventana, fila_completa=False)
+                if dry_run:
+                    resultado.payloads_limpiados += ventana.count()
+                else:
+                    resultado.payloads_limpiados += ventana.update(raw_payload=None)
+
+            # Lo anterior a corte_crudos se elimina en el paso 2: limpiarlo
+            # antes sería escribir (y dejar tuplas muertas) dos veces
+            con_payload = lecturas.filter(fecha_hora__lt=corte, raw_payload__isnull=False)
+            if corte_crudos is not None:
+                con_payload = con_payload.filter(fecha_hora__gte=corte_crudos)
+            _recorrer_por_tramos(
+                con_payload, chunk, desde_pk, limpiar, pausa, resultado, avance,
+            )
+
+        if corte_crudos is not None:
+
+            def eliminar(ventana):
+                resultado.bytes_liberados += _bytes_en(ventana, fila_completa=True)
+                if dry_run:
+                    resultado.filas_eliminadas += ventana.count()
+                else:
+                    _, por_modelo = ventana.delete()
+                    resultado.filas_eliminadas += por_modelo.get(Lectura._meta.label, 0)
+
+            _recorrer_por_tramos(
+                lecturas.filter(fecha_hora__lt=corte_crudos),
+                chunk, desde_pk, eliminar, pausa, resultado, avance,
+            )
+
+    return resultado
@@ -3,15 +3,42 @@
 # FECHA DE CREACIÓN: 01-10-2025
 # LICENCIA: Uso Educacional-No Comercial
 # PROPÓSITO: Servicios para la aplicación de sensores y actuadores IoT
-# FECHA ÚLTIMA MODIFICACIÓN: 18-11-2025
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
 # ---------------------------------------------------------
 from __future__ import annotations
 
+import math
 from datetime import datetime
-from django.utils.timezone import now
-from django.db import transaction
+from typing import Iterable
 
-from sensores.models import Sensor, Lectura, Alerta, ReglaControl, Actuador
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.timezone import is_naive, make_aware, now
+from django.db import IntegrityError, transaction
+
+from sensores.cache_sensores import (
+    SensorInfo,
+    aobtener_sensor_info,
+    obtener_sensor_info,
+    obtener_sensores_info,
+)
+from sensores.models import (
+    Sensor,
+    Lectura,
+    ReglaControl,
+    Actuador,
+    UltimoValorSensor,
+)
+from sensores.alertas import registrar_alerta
+from sensores.estado_actuadores import estado_conocido
+from sensores.idempotencia import buscar_clave, clave_de_payload, recordar_clave
+from sensores.motor_reglas import (
+    aprecargar_reglas,
+    evaluar_lectura,
+    precargar_reglas,
+)
+from sensores.resumenes import registrar_resumenes
+from planta.geometria import actualizar_volumen_estanque
 
 
 # ================================================================
@@ -32,12 +59,58 @@ def _payload_json_safe(payload: dict | None) -> dict | None:
     return {k: fix(v) for k, v in payload.items()}
 
 
+def _obtener_sensor(codigo: str) -> SensorInfo:
+    """SensorInfo cacheado del código; lanza Sensor.DoesNotExist si no existe."""
+    info = obtener_sensor_info(codigo)
+    if info is None:
+        raise Sensor.DoesNotExist(f"Sensor '{codigo}' no encontrado")
+    return info
+
+
+def _resumenes_en_ingesta() -> bool:
+    """
+    Si es False, los resúmenes 1m/1h/1d se mantienen sólo con
+    manage.py recalcular_resumenes (ej: ingesta masiva).
+    """
+    return getattr(settings, "SENSORES_RESUMENES_EN_INGESTA", True)
+
+
+def _nueva_lectura(sensor: Sensor | SensorInfo, **campos) -> Lectura:
+    """Lectura sin guardar; acepta el modelo Sensor o un SensorInfo cacheado."""
+    if isinstance(sensor, Sensor):
+        return Lectura(sensor=sensor, **campos)
+    return Lectura(sensor_id=sensor.id, **campos)
+
+
+def _lectura_duplicada(sensor: Sensor | SensorInfo, lectura_id: int, **campos) -> Lectura:
+    """
+    Reintento de una lectura ya registrada: instancia sin guardar con el id
+    original y duplicada=True (los campos del reintento son los mismos).
+    """
+    lectura = _nueva_lectura(sensor, **campos)
+    lectura.id = lectura_id
+    lectura.duplicada = True
+    return lectura
+
+
+def _id_por_clave(sensor_id: int, clave: str) -> int | None:
+    lectura_id = (
+        Lectura.objects.filter(sensor_id=sensor_id, clave_idempotencia=clave)
+        .values_list("id", flat=True)
+        .first()
+    )
+    if lectura_id is not None:
+        recordar_clave(sensor_id, clave, lectura_id)
+    return lectura_id
+
+
 def registrar_lectura(
     sensor=None,
     valor=None,
     unidad=None,
     fecha_hora=None,
     raw_payload=None,
+    clave_idempotencia=None,
 ) -> Lectura:
     """
     Modo 1: registrar_lectura({
@@ -45,16 +118,21 @@ def registrar_lectura(
                 "valor": 55,
                 "unidad": "cm",
                 "fecha_hora": "2025-11-18T00:00:00Z",
+                "seq": 1842,  # opcional, con "boot" o fecha_hora (clave de idempotencia)
                 "raw": {...}
             })
 
-    Modo 2: registrar_lectura(sensor_obj, 55, "cm", now(), {...})
+    Modo 2: registrar_lectura(sensor_obj, 55, "cm", now(), {...}, clave_idempotencia="1842")
+            (sensor_obj puede ser un Sensor o un SensorInfo cacheado)
+
+    Con clave de idempotencia, un reintento no inserta ni evalúa reglas:
+    retorna la lectura original (sin guardar, con duplicada=True).
     """
 
     # ---- MODO DICCIONARIO (payload desde API/ESP32) ----
     if isinstance(sensor, dict):
         data = sensor
-        sensor = Sensor.objects.get(codigo=data["sensor_codigo"])
+        sensor = _obtener_sensor(data["sensor_codigo"])
         valor = float(data["valor"])
         unidad = data.get("unidad", "")
 
@@ -62,106 +140,517 @@ def registrar_lectura(
         if isinstance(fecha_raw, datetime):
             fecha_hora = fecha_raw
         elif isinstance(fecha_raw, str):
-            # Maneja formato ISO con o sin 'Z'
-            fecha_hora = datetime.fromisoformat(fecha_raw.replace("Z", "+00:00"))
+            fecha_hora = _parsear_fecha(fecha_raw)
         else:
             fecha_hora = now()
 
         raw_payload = _payload_json_safe(data)
+        clave_idempotencia = clave_de_payload(data)
 
     # ---- MODO ARGUMENTOS SUELTOS ----
     if fecha_hora is None:
         fecha_hora = now()
 
-    with transaction.atomic():
-        lectura = Lectura.objects.create(
-            sensor=sensor,
-            valor=valor,
-            unidad=unidad,
-            fecha_hora=fecha_hora,
-            origen="ESP32",
-            raw_payload=_payload_json_safe(raw_payload),
-        )
+    campos = {
+        "valor": valor,
+        "unidad": unidad,
+        "fecha_hora": fecha_hora,
+        "origen": "ESP32",
+        "raw_payload": _payload_json_safe(raw_payload),
+        "clave_idempotencia": clave_idempotencia,
+    }
+    if clave_idempotencia:
+        original = buscar_clave(sensor.id, clave_idempotencia)
+        if original is not None:
+            return _lectura_duplicada(sensor, original, **campos)
 
-        # Evaluar reglas asociadas a este sensor
-        evaluar_reglas_sensor(sensor, lectura)
+    try:
+        with transaction.atomic():
+            lectura = _nueva_lectura(sensor, **campos)
+            lectura.save(force_insert=True)
+            actualizar_ultimo_valor(lectura)
+            actualizar_volumenes([(lectura, sensor)])
+            if _resumenes_en_ingesta():
+                registrar_resumenes([lectura])
 
-        return lectura
+            # Evaluar reglas asociadas a este sensor
+            evaluar_reglas_sensor(sensor, lectura)
+    except IntegrityError:
+        # Reintento que no estaba en memoria (otro worker, o el proceso reinició)
+        original = _id_por_clave(sensor.id, clave_idempotencia) if clave_idempotencia else None
+        if original is None:
+            raise
+        return _lectura_duplicada(sensor, original, **campos)
+
+    if clave_idempotencia:
+        transaction.on_commit(
+            lambda: recordar_clave(sensor.id, clave_idempotencia, lectura.id)
+        )
+    return lectura
 
 
 # ================================================================
 # 2) MOTOR DE REGLAS
 # ================================================================
-def evaluar_reglas_sensor(sensor: Sensor, lectura: Lectura) -> None:
+def evaluar_reglas_sensor(sensor: Sensor | SensorInfo, lectura: Lectura) -> None:
     """
-    Busca reglas activas para el sensor y ejecuta acciones si se cumplen.
+    Evalúa las reglas activas del sensor (compiladas y cacheadas en memoria,
+    ver sensores.motor_reglas) y ejecuta acciones si se cumplen.
+    Sólo accede a la base de datos cuando una regla se cumple.
     """
-    reglas = ReglaControl.objects.filter(sensor=sensor, activo=True)
-
-    for regla in reglas:
-        if regla.se_cumple(lectura.valor):
-            ejecutar_accion_regla(regla, sensor, lectura)
+    for disparo in evaluar_lectura(sensor.id, lectura.valor):
+        ejecutar_accion_regla(disparo.regla, sensor, lectura, disparo.inicio_episodio)
 
 
-def ejecutar_accion_regla(regla: ReglaControl, sensor: Sensor, lectura: Lectura) -> None:
+def ejecutar_accion_regla(
+    regla: ReglaControl,
+    sensor: Sensor | SensorInfo,
+    lectura: Lectura,
+    inicio_episodio: bool = True,
+) -> None:
     """
-    Crea una alerta y ejecuta la acción asociada (por ahora: encender bomba).
+    Registra la alerta (deduplicada por sensor y regla, ver sensores.alertas)
+    y ejecuta la acción asociada (por ahora: encender bomba).
     """
     # Registrar alerta
-    Alerta.objects.create(
-        sensor=sensor,
-        lectura=lectura,
-        severidad=regla.severidad,
-        mensaje=regla.mensaje_accion,
-    )
+    registrar_alerta(regla, sensor.id, lectura, inicio_episodio)
 
-    # Accion sobre actuador: por simplicidad, siempre ENCENDER si hay actuador
+    # Accion sobre actuador: por simplicidad, siempre ENCENDER si hay actuador.
+    # Si ya se sabe encendido, el comando se omite sin ir a la base de datos.
+    # encender() deja el comando en la outbox (misma transacción que la
+    # lectura); lo entrega manage.py despachar_comandos.
     actuador: Actuador | None = regla.actuador
-    if actuador:
-        actuador.encender()
+    if actuador and estado_conocido(actuador.pk) is not True:
+        actuador.encender(regla)
+
+
+# ================================================================
+# 2.1) ÚLTIMO VALOR POR SENSOR (tabla desnormalizada)
+# ================================================================
+def _campos_ultimo_valor(lectura: Lectura) -> dict:
+    return {
+        "lectura_id": lectura.id,
+        "valor": lectura.valor,
+        "unidad": lectura.unidad,
+        "fecha_hora": lectura.fecha_hora,
+    }
+
+
+def actualizar_ultimo_valor(lectura: Lectura) -> None:
+    """
+    Actualiza UltimoValorSensor con la lectura, salvo que ya exista un
+    valor más reciente (lecturas atrasadas del buffer del ESP32).
+    """
+    campos = _campos_ultimo_valor(lectura)
+    actualizados = UltimoValorSensor.objects.filter(
+        sensor_id=lectura.sensor_id,
+        fecha_hora__lte=lectura.fecha_hora,
+    ).update(**campos)
+    if not actualizados:
+        # No existe aún, o el existente es más reciente (get_or_create no lo toca)
+        UltimoValorSensor.objects.get_or_create(sensor_id=lectura.sensor_id, defaults=campos)
+
+
+def actualizar_ultimos_valores(lecturas: list[Lectura]) -> None:
+    """Versión para lotes: una actualización por sensor con su lectura más reciente."""
+    mas_recientes: dict[int, Lectura] = {}
+    for lectura in lecturas:
+        actual = mas_recientes.get(lectura.sensor_id)
+        if actual is None or lectura.fecha_hora >= actual.fecha_hora:
+            mas_recientes[lectura.sensor_id] = lectura
+    for lectura in mas_recientes.values():
+        actualizar_ultimo_valor(lectura)
+
+
+async def aactualizar_ultimo_valor(lectura: Lectura) -> None:
+    campos = _campos_ultimo_valor(lectura)
+    actualizados = await UltimoValorSensor.objects.filter(
+        sensor_id=lectura.sensor_id,
+        fecha_hora__lte=lectura.fecha_hora,
+    ).aupdate(**campos)
+    if not actualizados:
+        await UltimoValorSensor.objects.aget_or_create(sensor_id=lectura.sensor_id, defaults=campos)
+
+
+def reconstruir_ultimos_valores(sensor_ids=None) -> int:
+    """
+    Recalcula UltimoValorSensor desde la tabla Lectura (carga inicial o
+    lecturas insertadas sin pasar por registrar_lectura).
+    Retorna la cantidad de sensores actualizados.
+    """
+    sensores = Sensor.objects.all()
+    if sensor_ids is not None:
+        sensores = sensores.filter(pk__in=sensor_ids)
+
+    total = 0
+    for sensor_id in sensores.values_list("pk", flat=True).iterator():
+        ultima = Lectura.objects.filter(sensor_id=sensor_id).order_by("-fecha_hora").first()
+        if ultima is None:
+            continue
+        UltimoValorSensor.objects.update_or_create(
+            sensor_id=sensor_id, defaults=_campos_ultimo_valor(ultima)
+        )
+        total += 1
+    return total
+
+
+# ================================================================
+# 2.2) VOLUMEN ACTUAL DE ESTANQUES (sensores de NIVEL)
+# ================================================================
+def actualizar_volumenes(pares: Iterable[tuple[Lectura, Sensor | SensorInfo]]) -> None:
+    """
+    Convierte la lectura de NIVEL más reciente de cada estanque a litros y
+    la guarda en Estanque.volumen_actual_litros (ver planta.geometria).
+    """
+    mas_recientes: dict[int, Lectura] = {}
+    for lectura, sensor in pares:
+        if sensor.tipo != "NIVEL" or not sensor.estanque_id:
+            continue
+        actual = mas_recientes.get(sensor.estanque_id)
+        if actual is None or lectura.fecha_hora >= actual.fecha_hora:
+            mas_recientes[sensor.estanque_id] = lectura
+    for estanque_id, lectura in mas_recientes.items():
+        actualizar_volumen_estanque(estanque_id, lectura.valor, lectura.fecha_hora)
 
 
 # ================================================================
 # 3) PROCESAMIENTO DE PAYLOAD JSON DE LA API
 # ================================================================
-def procesar_payload_lectura(payload: dict) -> dict:
+# Lectura.valor es DecimalField(12, 4): |valor| < 10^8
+_VALOR_MAXIMO = 10 ** (
+    Lectura._meta.get_field("valor").max_digits - Lectura._meta.get_field("valor").decimal_places
+)
+
+
+def _parsear_fecha(texto: str) -> datetime:
     """
-    Valida y normaliza el JSON recibido desde el ESP32 / cliente HTTP.
+    Fecha ISO con o sin 'Z'. Sin zona horaria se interpreta en la hora local
+    (TIME_ZONE): el resto del flujo compara y agrupa fechas con zona.
+    """
+    fecha = datetime.fromisoformat(texto.replace("Z", "+00:00"))
+    if is_naive(fecha):
+        fecha = make_aware(fecha)
+    return fecha
+
+
+def _validar_campos_lectura(payload: dict) -> dict:
+    """
+    Valida los campos del payload que no requieren acceso a la base de datos
+    (campos obligatorios, fecha y valor). No resuelve el sensor.
 
     Retorna:
       - {"ok": False, "error": "..."} si hay error
-      - {"ok": True, "sensor": <Sensor>, "valor": float, "unidad": str, "fecha_hora": datetime}
+      - {"ok": True, "sensor_codigo": str, "valor": float, "unidad": str,
+         "fecha_hora": datetime, "clave_idempotencia": str | None}
     """
+    if not isinstance(payload, dict):
+        return {"ok": False, "error": "La lectura debe ser un objeto JSON"}
+
     required = ["sensor_codigo", "valor", "unidad"]
     for campo in required:
         if campo not in payload:
             return {"ok": False, "error": f"Falta el campo '{campo}'"}
 
+    for campo in ("sensor_codigo", "unidad"):
+        if not isinstance(payload[campo], str):
+            return {"ok": False, "error": f"El campo '{campo}' debe ser texto"}
+
     # Resolver fecha
     fecha_txt = payload.get("fecha_hora")
     if not fecha_txt:
         fecha = now()
     else:
         try:
-            fecha = datetime.fromisoformat(fecha_txt.replace("Z", "+00:00"))
+            fecha = _parsear_fecha(fecha_txt)
         except Exception:
             return {"ok": False, "error": "Formato de fecha inválido"}
 
-    # Buscar sensor
-    try:
-        sensor = Sensor.objects.get(codigo=payload["sensor_codigo"])
-    except Sensor.DoesNotExist:
-        return {"ok": False, "error": "Sensor no encontrado"}
-
     try:
         valor = float(payload["valor"])
     except Exception:
         return {"ok": False, "error": "Valor numérico inválido"}
+    if not math.isfinite(valor) or abs(round(valor, 4)) >= _VALOR_MAXIMO:
+        return {"ok": False, "error": "Valor numérico fuera de rango"}
 
     return {
         "ok": True,
-        "sensor": sensor,
+        "sensor_codigo": payload["sensor_codigo"],
         "valor": valor,
         "unidad": payload["unidad"],
         "fecha_hora": fecha,
+        "clave_idempotencia": clave_de_payload(payload),
+    }
+
+
+def procesar_payload_lectura(payload: dict) -> dict:
+    """
+    Valida y normaliza el JSON recibido desde el ESP32 / cliente HTTP.
+
+    Retorna:
+      - {"ok": False, "error": "..."} si hay error
+      - {"ok": True, "sensor": <SensorInfo>, "valor": float, "unidad": str,
+         "fecha_hora": datetime, "clave_idempotencia": str | None}
+
+    El sensor se resuelve desde el caché de metadatos (sensores.cache_sensores).
+    """
+    datos = _validar_campos_lectura(payload)
+    if not datos["ok"]:
+        return datos
+
+    # Buscar sensor
+    sensor = obtener_sensor_info(datos.pop("sensor_codigo"))
+    if sensor is None:
+        return {"ok": False, "error": "Sensor no encontrado"}
+
+    datos["sensor"] = sensor
+    return datos
+
+
+# ================================================================
+# 4) REGISTRO DE LECTURAS EN LOTE
+# ================================================================
+def registrar_lecturas_lote(payloads: list[dict], origen: str = "ESP32") -> dict:
+    """
+    Registra un lote de lecturas (ej: buffer del ESP32 tras una caída de Wi-Fi).
+
+    - Valida cada item con las mismas reglas que procesar_payload_lectura.
+    - Resuelve todos los sensor_codigo desde el caché de metadatos
+      (como máximo una consulta para los que no están en caché).
+    - Descarta los reintentos (misma clave de idempotencia que una lectura
+      ya registrada o anterior en el lote): no se insertan ni evalúan reglas.
+    - Inserta las lecturas válidas con bulk_create en una única transacción.
+    - Evalúa las reglas de control de todo el lote.
+
+    Retorna:
+      {
+        "ok": True,
+        "creadas": <int>,
+        "duplicadas": <int>,
+        "rechazadas": <int>,
+        "resultados": [
+            {"indice": 0, "ok": True, "id": <id_lectura>, "sensor": "<codigo>"},
+            {"indice": 1, "ok": False, "error": "..."},
+            {"indice": 2, "ok": True, "id": <id_original>, "sensor": "<codigo>", "duplicada": True},
+            ...
+        ],
+      }
+    """
+    resultados: list[dict] = []
+    validos: list[tuple[int, dict, dict]] = []
+
+    for indice, payload in enumerate(payloads):
+        datos = _validar_campos_lectura(payload)
+        if not datos["ok"]:
+            resultados.append({"indice": indice, "ok": False, "error": datos["error"]})
+            continue
+        validos.append((indice, payload, datos))
+        resultados.append(None)
+
+    # Una sola consulta para todos los sensores del lote
+    codigos = {datos["sensor_codigo"] for _, _, datos in validos}
+    sensores = obtener_sensores_info(codigos) if codigos else {}
+
+    por_insertar: list[tuple[int, Lectura, SensorInfo]] = []
+    for indice, payload, datos in validos:
+        sensor = sensores.get(datos["sensor_codigo"])
+        if sensor is None:
+            resultados[indice] = {"indice": indice, "ok": False, "error": "Sensor no encontrado"}
+            continue
+        lectura = _nueva_lectura(
+            sensor,
+            valor=datos["valor"],
+            unidad=datos["unidad"],
+            fecha_hora=datos["fecha_hora"],
+            origen=origen,
+            raw_payload=_payload_json_safe(payload),
+            clave_idempotencia=datos["clave_idempotencia"],
+        )
+        por_insertar.append((indice, lectura, sensor))
+
+    # Reintentos: (sensor_id, clave) -> id original, o la lectura del lote
+    # que la trae primero (su id se conoce tras el bulk_create)
+    originales: dict[tuple[int, str], int | Lectura] = _ids_por_claves(
+        [lectura for _, lectura, _ in por_insertar]
+    )
+    duplicadas: list[tuple[int, tuple[int, str], SensorInfo]] = []
+    nuevas: list[tuple[int, Lectura, SensorInfo]] = []
+    for indice, lectura, sensor in por_insertar:
+        clave = (lectura.sensor_id, lectura.clave_idempotencia)
+        if lectura.clave_idempotencia and clave in originales:
+            duplicadas.append((indice, clave, sensor))
+            continue
+        if lectura.clave_idempotencia:
+            originales[clave] = lectura
+        nuevas.append((indice, lectura, sensor))
+    por_insertar = nuevas
+
+    if por_insertar:
+        with transaction.atomic():
+            Lectura.objects.bulk_create([lectura for _, lectura, _ in por_insertar])
+            actualizar_ultimos_valores([lectura for _, lectura, _ in por_insertar])
+            actualizar_volumenes([(lectura, sensor) for _, lectura, sensor in por_insertar])
+            if _resumenes_en_ingesta():
+                registrar_resumenes([lectura for _, lectura, _ in por_insertar])
+            evaluar_reglas_lote([(lectura, sensor) for _, lectura, sensor in por_insertar])
+
+            claves = [
+                (lectura.sensor_id, lectura.clave_idempotencia, lectura.id)
+                for _, lectura, _ in por_insertar
+                if lectura.clave_idempotencia
+            ]
+            if claves:
+                transaction.on_commit(lambda: [recordar_clave(*clave) for clave in claves])
+
+        for indice, lectura, sensor in por_insertar:
+            resultados[indice] = {
+                "indice": indice,
+                "ok": True,
+                "id": lectura.id,
+                "sensor": sensor.codigo,
+            }
+
+    for indice, clave, sensor in duplicadas:
+        original = originales[clave]
+        resultados[indice] = {
+            "indice": indice,
+            "ok": True,
+            "id": original.id if isinstance(original, Lectura) else original,
+            "sensor": sensor.codigo,
+            "duplicada": True,
+        }
+
+    creadas = len(por_insertar)
+    return {
+        "ok": True,
+        "creadas": creadas,
+        "duplicadas": len(duplicadas),
+        "rechazadas": len(resultados) - creadas - len(duplicadas),
+        "resultados": resultados,
     }
+
+
+def _ids_por_claves(lecturas: list[Lectura]) -> dict[tuple[int, str], int]:
+    """
+    Ids originales de las lecturas del lote que son reintentos: primero el
+    registro en memoria y, para el resto, una sola consulta. Un reintento
+    concurrente que llegue entre la consulta y el insert lo frena la
+    restricción única (el lote falla y el dispositivo lo reenvía).
+    """
+    originales: dict[tuple[int, str], int] = {}
+    pendientes: set[tuple[int, str]] = set()
+    for lectura in lecturas:
+        if not lectura.clave_idempotencia:
+            continue
+        clave = (lectura.sensor_id, lectura.clave_idempotencia)
+        lectura_id = buscar_clave(*clave)
+        if lectura_id is not None:
+            originales[clave] = lectura_id
+        else:
+            pendientes.add(clave)
+
+    if pendientes:
+        for sensor_id, clave, lectura_id in Lectura.objects.filter(
+            sensor_id__in={sensor_id for sensor_id, _ in pendientes},
+            clave_idempotencia__in={clave for _, clave in pendientes},
+        ).order_by().values_list("sensor_id", "clave_idempotencia", "id"):
+            if (sensor_id, clave) in pendientes:
+                originales[(sensor_id, clave)] = lectura_id
+                recordar_clave(sensor_id, clave, lectura_id)
+    return originales
+
+
+def evaluar_reglas_lote(lecturas: list[tuple[Lectura, Sensor | SensorInfo]]) -> None:
+    """
+    Evalúa las reglas activas de todos los sensores presentes en el lote
+    (pares lectura, sensor). Las reglas que no están en caché se compilan
+    con una sola consulta.
+    """
+    precargar_reglas({sensor.id for _, sensor in lecturas})
+
+    # En orden cronológico para que los episodios (histéresis) sean correctos
+    for lectura, sensor in sorted(lecturas, key=lambda par: par[0].fecha_hora):
+        evaluar_reglas_sensor(sensor, lectura)
+
+
+# ================================================================
+# 5) INGESTA ASYNC (vista ASGI)
+# ================================================================
+# El ORM async de Django aún no soporta transaction.atomic(): la lectura y
+# sus alertas se escriben como sentencias independientes (autocommit).
+async def aprocesar_payload_lectura(payload: dict) -> dict:
+    """Versión async de procesar_payload_lectura (mismo contrato de retorno)."""
+    datos = _validar_campos_lectura(payload)
+    if not datos["ok"]:
+        return datos
+
+    sensor = await aobtener_sensor_info(datos.pop("sensor_codigo"))
+    if sensor is None:
+        return {"ok": False, "error": "Sensor no encontrado"}
+
+    datos["sensor"] = sensor
+    return datos
+
+
+async def aregistrar_lectura(
+    sensor: Sensor | SensorInfo,
+    valor,
+    unidad: str,
+    fecha_hora: datetime | None = None,
+    raw_payload: dict | None = None,
+    clave_idempotencia: str | None = None,
+) -> Lectura:
+    """Versión async de registrar_lectura (modo argumentos sueltos)."""
+    campos = {
+        "valor": valor,
+        "unidad": unidad,
+        "fecha_hora": fecha_hora or now(),
+        "origen": "ESP32",
+        "raw_payload": _payload_json_safe(raw_payload),
+        "clave_idempotencia": clave_idempotencia,
+    }
+    if clave_idempotencia:
+        original = buscar_clave(sensor.id, clave_idempotencia)
+        if original is not None:
+            return _lectura_duplicada(sensor, original, **campos)
+
+    lectura = _nueva_lectura(sensor, **campos)
+    try:
+        await lectura.asave(force_insert=True)
+    except IntegrityError:
+        original = (
+            await sync_to_async(_id_por_clave)(sensor.id, clave_idempotencia)
+            if clave_idempotencia
+            else None
+        )
+        if original is None:
+            raise
+        return _lectura_duplicada(sensor, original, **campos)
+    if clave_idempotencia:
+        # Autocommit: la lectura ya está confirmada
+        recordar_clave(sensor.id, clave_idempotencia, lectura.id)
+
+    await aactualizar_ultimo_valor(lectura)
+    await sync_to_async(actualizar_volumenes)([(lectura, sensor)])
+    if _resumenes_en_ingesta():
+        await sync_to_async(registrar_resumenes)([lectura])
+    await aevaluar_reglas_sensor(sensor, lectura)
+    return lectura
+
+
+async def aevaluar_reglas_sensor(sensor: Sensor | SensorInfo, lectura: Lectura) -> None:
+    await aprecargar_reglas([sensor.id])
+    for disparo in evaluar_lectura(sensor.id, lectura.valor):
+        await aejecutar_accion_regla(disparo.regla, sensor, lectura, disparo.inicio_episodio)
+
+
+async def aejecutar_accion_regla(
+    regla: ReglaControl,
+    sensor: Sensor | SensorInfo,
+    lectura: Lectura,
+    inicio_episodio: bool = True,
+) -> None:
+    await sync_to_async(registrar_alerta)(regla, sensor.id, lectura, inicio_episodio)
+
+    actuador: Actuador | None = regla.actuador
+    if actuador and estado_conocido(actuador.pk) is not True:
+        await actuador.aencender(regla)
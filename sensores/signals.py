@@ -0,0 +1,52 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Señales para mantener coherentes los cachés de sensores
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .alertas import olvidar_alerta, olvidar_alertas_de_regla
+from .cache_sensores import invalidar_sensor
+from .estado_actuadores import olvidar_actuador
+from .models import Actuador, Alerta, ReglaControl, Sensor
+from .motor_reglas import invalidar_reglas, invalidar_reglas_de_actuador, olvidar_episodio
+
+
+@receiver(post_save, sender=ReglaControl)
+@receiver(post_delete, sender=ReglaControl)
+def invalidar_reglas_por_cambio_regla(sender, instance, **kwargs):
+    """Una regla creada, editada o eliminada invalida las reglas de su sensor."""
+    invalidar_reglas(instance.sensor_id)
+    olvidar_episodio(instance.pk)
+    olvidar_alertas_de_regla(instance.pk)
+
+
+@receiver(post_save, sender=Alerta)
+@receiver(post_delete, sender=Alerta)
+def olvidar_alerta_por_cambio(sender, instance, **kwargs):
+    """Alerta resuelta o eliminada (ej: desde el admin) sale del índice de abiertas."""
+    olvidar_alerta(instance.sensor_id, instance.regla_id)
+
+
+@receiver(post_save, sender=Sensor)
+@receiver(post_delete, sender=Sensor)
+def invalidar_caches_por_cambio_sensor(sender, instance, **kwargs):
+    invalidar_reglas(instance.pk)
+    invalidar_sensor(instance.pk, instance.codigo)
+
+
+@receiver(post_save, sender=Actuador)
+@receiver(post_delete, sender=Actuador)
+def invalidar_reglas_por_cambio_actuador(sender, instance, update_fields=None, **kwargs):
+    """
+    Las reglas compiladas guardan su actuador precargado. Se invalidan las
+    reglas que lo usan, salvo en escrituras parciales de estado, que sólo
+    afectan al caché de estado (sensores.estado_actuadores).
+    """
+    olvidar_actuador(instance.pk)
+    if update_fields is not None and set(update_fields) <= {"encendido", "updated_at"}:
+        return
+    invalidar_reglas_de_actuador(instance.pk)
@@ -0,0 +1,110 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Pruebas unitarias para la deduplicación de alertas
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils.timezone import now
+
+from inventario.models import Ubicacion
+from sensores.models import Alerta, ReglaControl, Sensor
+from sensores.services import registrar_lectura
+
+
+class AlertasTests(TestCase):
+
+    def setUp(self):
+        self.ubic = Ubicacion.objects.create(codigo="UB-AL", nombre="Zona AL")
+        self.sensor = Sensor.objects.create(
+            codigo="S-AL",
+            nombre="Nivel",
+            tipo="NIVEL",
+            unidad="cm",
+            ubicacion=self.ubic,
+        )
+        self.regla = ReglaControl.objects.create(
+            sensor=self.sensor,
+            condicion="MAYOR",
+            umbral=50,
+            mensaje_accion="Nivel alto",
+        )
+        self.t = now()
+
+    def leer(self, *valores):
+        for valor in valores:
+            self.t += timedelta(seconds=5)
+            registrar_lectura(self.sensor, valor, "cm", self.t)
+
+    def resolver_alertas(self):
+        for alerta in Alerta.objects.filter(estado="NUEVA"):
+            alerta.estado = "RESUELTA"
+            alerta.save()
+
+    def test_coincidencias_repetidas_suman_ocurrencias(self):
+        self.leer(60, 61, 62)
+
+        alerta = Alerta.objects.get(sensor=self.sensor)
+        self.assertEqual(alerta.ocurrencias, 3)
+        self.assertEqual(alerta.regla, self.regla)
+        self.assertEqual(alerta.ultima_vez, self.t)
+
+    def test_nueva_alerta_solo_en_nuevo_episodio(self):
+        self.leer(60)
+        self.resolver_alertas()
+
+        # Misma condición sostenida: no se reabre
+        self.leer(61)
+        self.assertEqual(Alerta.objects.count(), 1)
+
+        # La condición termina y vuelve: nueva alerta
+        self.leer(40, 60)
+        self.assertEqual(Alerta.objects.count(), 2)
+
+    def test_histeresis_evita_episodios_por_oscilacion(self):
+        self.regla.histeresis = 5
+        self.regla.save()
+
+        self.leer(51)
+        self.resolver_alertas()
+
+        # 48 y 49 quedan dentro de la banda (50 - 5): sigue el mismo episodio
+        self.leer(48, 51, 49, 52)
+        self.assertEqual(Alerta.objects.count(), 1)
+
+        # 44 sale de la banda: el siguiente cruce abre una alerta nueva
+        self.leer(44, 51)
+        self.assertEqual(Alerta.objects.count(), 2)
+
+    def test_intervalo_minimo_entre_alertas(self):
+        self.regla.intervalo_minimo_seg = 3600
+        self.regla.save()
+
+        self.leer(60)
+        self.resolver_alertas()
+        self.leer(40, 60)
+
+        self.assertEqual(Alerta.objects.count(), 1)
+
+    def test_intervalo_minimo_se_mide_con_la_hora_de_las_lecturas(self):
+        # Lecturas históricas procesadas ahora: dos horas entre episodios
+        self.regla.intervalo_minimo_seg = 3600
+        self.regla.save()
+        self.t -= timedelta(days=2)
+
+        self.leer(60)
+        self.resolver_alertas()
+        self.t += timedelta(hours=2)
+        self.leer(40, 60)
+
+        self.assertEqual(Alerta.objects.count(), 2)
+
+    def test_alerta_abierta_es_unica_por_regla(self):
+        self.leer(60)
+        self.leer(40, 60)
+
+        alerta = Alerta.objects.get()
+        self.assertEqual(alerta.ocurrencias, 2)
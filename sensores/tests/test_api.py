@@ -3,15 +3,18 @@
 # FECHA DE CREACIÓN: 01-10-2025
 # LICENCIA: Uso Educacional-No Comercial
 # PROPÓSITO: Pruebas unitarias para la API de sensores y actuadores
-# FECHA ÚLTIMA MODIFICACIÓN: 18-11-2025
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
 # ---------------------------------------------------------
-from django.test import TestCase
-from django.utils.timezone import now
+from datetime import datetime
+
+from django.test import AsyncRequestFactory, TestCase
+from django.utils.timezone import make_aware, now
 import json
 
 from inventario.models import Ubicacion
 from planta.models import Estanque
-from sensores.models import Sensor
+from sensores.models import Sensor, Lectura
+from sensores.views_api import api_recibir_lectura_async
 
 
 class APITests(TestCase):
@@ -53,3 +56,136 @@ class APITests(TestCase):
         )
 
         self.assertEqual(resp.status_code, 201)
+
+    def test_api_ingreso_lote(self):
+        url = "/sensores/api/lecturas/lote/"
+
+        payload = [
+            {"sensor_codigo": self.sensor.codigo, "valor": 10, "unidad": "uds"},
+            {"sensor_codigo": "NO-EXISTE", "valor": 11, "unidad": "uds"},
+            {"sensor_codigo": self.sensor.codigo, "valor": "abc", "unidad": "uds"},
+            {
+                "sensor_codigo": self.sensor.codigo,
+                "valor": 12,
+                "unidad": "uds",
+                "fecha_hora": "2025-11-18T00:00:00Z",
+            },
+        ]
+
+        resp = self.client.post(
+            url,
+            data=json.dumps(payload),
+            content_type="application/json",
+        )
+
+        self.assertEqual(resp.status_code, 201)
+        data = resp.json()
+        self.assertEqual(data["creadas"], 2)
+        self.assertEqual(data["rechazadas"], 2)
+        self.assertEqual([r["ok"] for r in data["resultados"]], [True, False, False, True])
+        self.assertEqual(data["resultados"][1]["error"], "Sensor no encontrado")
+        self.assertEqual(Lectura.objects.filter(sensor=self.sensor).count(), 2)
+
+    def test_api_lote_rechaza_valores_invalidos_por_item(self):
+        payload = [
+            {"sensor_codigo": self.sensor.codigo, "valor": 10, "unidad": "uds"},
+            {"sensor_codigo": self.sensor.codigo, "valor": "nan", "unidad": "uds"},
+            {"sensor_codigo": self.sensor.codigo, "valor": "-inf", "unidad": "uds"},
+            {"sensor_codigo": self.sensor.codigo, "valor": 1e9, "unidad": "uds"},
+            {"sensor_codigo": [self.sensor.codigo], "valor": 1, "unidad": "uds"},
+            {"sensor_codigo": {"codigo": "S-02"}, "valor": 1, "unidad": "uds"},
+        ]
+
+        resp = self.client.post(
+            "/sensores/api/lecturas/lote/",
+            data=json.dumps(payload),
+            content_type="application/json",
+        )
+
+        self.assertEqual(resp.status_code, 201)
+        data = resp.json()
+        self.assertEqual((data["creadas"], data["rechazadas"]), (1, 5))
+        self.assertEqual(data["resultados"][3]["error"], "Valor numérico fuera de rango")
+        self.assertEqual(data["resultados"][4]["error"], "El campo 'sensor_codigo' debe ser texto")
+
+    def test_api_lote_mezcla_fecha_sin_zona_y_sin_fecha(self):
+        payload = [
+            {"sensor_codigo": self.sensor.codigo, "valor": 10, "unidad": "uds",
+             "fecha_hora": "2025-11-18T00:00:00"},
+            {"sensor_codigo": self.sensor.codigo, "valor": 11, "unidad": "uds"},
+        ]
+
+        resp = self.client.post(
+            "/sensores/api/lecturas/lote/",
+            data=json.dumps(payload),
+            content_type="application/json",
+        )
+
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual([r["ok"] for r in resp.json()["resultados"]], [True, True])
+        self.assertEqual(self.sensor.ultimo_valor.valor, 11)
+
+    def test_api_lote_rechaza_body_que_no_es_lista(self):
+        resp = self.client.post(
+            "/sensores/api/lecturas/lote/",
+            data=json.dumps({"sensor_codigo": self.sensor.codigo}),
+            content_type="application/json",
+        )
+
+        self.assertEqual(resp.status_code, 400)
+
+    async def test_api_ingreso_lectura_async(self):
+        factory = AsyncRequestFactory()
+        payload = {
+            "sensor_codigo": self.sensor.codigo,
+            "valor": 50.5,
+            "unidad": "cm",
+            "fecha_hora": "2025-11-18T00:00:00Z",
+        }
+
+        request = factory.post(
+            "/sensores/api/lectura/",
+            data=json.dumps(payload),
+            content_type="application/json",
+        )
+        resp = await api_recibir_lectura_async(request)
+
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(await Lectura.objects.filter(sensor=self.sensor).acount(), 1)
+
+        request = factory.post(
+            "/sensores/api/lectura/",
+            data=json.dumps({**payload, "sensor_codigo": "NO-EXISTE"}),
+            content_type="application/json",
+        )
+        resp = await api_recibir_lectura_async(request)
+        self.assertEqual(resp.status_code, 400)
+
+    async def test_fecha_sin_zona_horaria_se_interpreta_en_hora_local(self):
+        payload = {
+            "sensor_codigo": self.sensor.codigo,
+            "valor": 50.5,
+            "unidad": "cm",
+            "fecha_hora": "2025-11-18T00:00:00",
+        }
+        esperada = make_aware(datetime(2025, 11, 18))
+
+        resp = await self.async_client.post(
+            "/sensores/api/lectura/", data=json.dumps(payload), content_type="application/json"
+        )
+        self.assertEqual(resp.status_code, 201)
+
+        request = AsyncRequestFactory().post(
+            "/sensores/api/lectura/", data=json.dumps(payload), content_type="application/json"
+        )
+        resp = await api_recibir_lectura_async(request)
+        self.assertEqual(resp.status_code, 201)
+
+        resp = await self.async_client.post(
+            "/sensores/api/lecturas/lote/", data=json.dumps([payload]), content_type="application/json"
+        )
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(resp.json()["creadas"], 1)
+
+        fechas = [f async for f in Lectura.objects.filter(sensor=self.sensor).values_list("fecha_hora", flat=True)]
+        self.assertEqual(fechas, [esperada] * 3)
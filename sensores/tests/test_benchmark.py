@@ -0,0 +1,57 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Pruebas unitarias para el benchmark de ingesta
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from sensores import benchmark
+from sensores.models import Sensor
+
+
+class BenchmarkTests(TestCase):
+
+    def test_percentil(self):
+        valores = [float(i) for i in range(1, 101)]
+        self.assertEqual(benchmark.percentil(valores, 50), 50.0)
+        self.assertEqual(benchmark.percentil(valores, 99), 99.0)
+        self.assertEqual(benchmark.percentil([], 95), 0.0)
+
+    def test_comparar_con_base_detecta_regresiones(self):
+        base = {"servicio": {"lecturas_por_segundo": 100.0, "p95_ms": 10.0, "consultas_por_lectura": 7.0}}
+        with tempfile.TemporaryDirectory() as tmp:
+            ruta = os.path.join(tmp, "base.json")
+            benchmark.guardar_base(ruta, base)
+
+            igual = {"servicio": {"lecturas_por_segundo": 90.0, "p95_ms": 11.0, "consultas_por_lectura": 7.0}}
+            self.assertEqual(benchmark.comparar_con_base(ruta, igual), [])
+
+            peor = {"servicio": {"lecturas_por_segundo": 70.0, "p95_ms": 11.0, "consultas_por_lectura": 8.0}}
+            regresiones = benchmark.comparar_con_base(ruta, peor)
+            self.assertEqual(len(regresiones), 2)
+
+    def test_comando_reporta_metricas_y_limpia(self):
+        salida = StringIO()
+        with tempfile.TemporaryDirectory() as tmp:
+            ruta = os.path.join(tmp, "base.json")
+            call_command(
+                "benchmark_lecturas",
+                sensores=2, reglas=2, historicas=10, lecturas=5, calentamiento=1,
+                guardar_base=ruta, stdout=salida,
+            )
+            with open(ruta, encoding="utf-8") as archivo:
+                resultados = json.load(archivo)
+
+        for modo in ("cliente", "servicio"):
+            self.assertEqual(resultados[modo]["lecturas"], 5)
+            self.assertEqual(resultados[modo]["errores"], 0)
+            self.assertGreater(resultados[modo]["consultas_por_lectura"], 0)
+        self.assertFalse(Sensor.objects.filter(codigo__startswith=benchmark.PREFIJO).exists())
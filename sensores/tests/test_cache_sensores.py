@@ -0,0 +1,72 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Pruebas unitarias para el caché de metadatos de sensores
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from inventario.models import Ubicacion
+from sensores.cache_sensores import (
+    limpiar_cache_sensores,
+    obtener_sensor_info,
+    obtener_sensores_info,
+)
+from sensores.models import Sensor
+from sensores.services import procesar_payload_lectura
+
+
+class CacheSensoresTests(TestCase):
+
+    def setUp(self):
+        limpiar_cache_sensores()
+        self.ubic = Ubicacion.objects.create(codigo="UB-CS", nombre="Zona CS")
+        self.sensor = Sensor.objects.create(
+            codigo="S-CS",
+            nombre="Nivel",
+            tipo="NIVEL",
+            unidad="cm",
+            ubicacion=self.ubic,
+            rango_min=10,
+            rango_max=90,
+        )
+
+    def test_segunda_busqueda_no_consulta_bd(self):
+        with self.assertNumQueries(1):
+            info = obtener_sensor_info("S-CS")
+        with self.assertNumQueries(0):
+            self.assertEqual(obtener_sensor_info("S-CS"), info)
+            resultado = procesar_payload_lectura(
+                {"sensor_codigo": "S-CS", "valor": 5, "unidad": "cm"}
+            )
+
+        self.assertEqual(info.id, self.sensor.id)
+        self.assertEqual(info.rango_max, 90)
+        self.assertEqual(resultado["sensor"], info)
+
+    def test_sensor_inexistente(self):
+        self.assertIsNone(obtener_sensor_info("NO-EXISTE"))
+        self.assertEqual(obtener_sensores_info(["S-CS", "NO-EXISTE"]).keys(), {"S-CS"})
+
+    def test_guardar_sensor_invalida_cache(self):
+        obtener_sensor_info("S-CS")
+
+        self.sensor.codigo = "S-CS-2"
+        self.sensor.unidad = "mm"
+        self.sensor.save()
+
+        self.assertIsNone(obtener_sensor_info("S-CS"))
+        self.assertEqual(obtener_sensor_info("S-CS-2").unidad, "mm")
+
+    @override_settings(SENSORES_INFO_CACHE_ALIAS="default")
+    def test_cache_compartido_entre_workers(self):
+        caches["default"].clear()
+        obtener_sensor_info("S-CS")
+
+        # Otro worker: caché local vacío, pero el compartido ya lo tiene
+        limpiar_cache_sensores()
+        with self.assertNumQueries(0):
+            info = obtener_sensor_info("S-CS")
+        self.assertEqual(info.codigo, "S-CS")
@@ -0,0 +1,184 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Pruebas unitarias para el despacho de comandos a actuadores
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+import json
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.utils.timezone import now
+
+from inventario.models import Ubicacion
+from sensores.comandos import (
+    TransporteFalso,
+    confirmar_comandos,
+    despachar_pendientes,
+    metricas_comandos,
+    parsear_ack,
+)
+from sensores.models import Actuador, ComandoActuador, ReglaControl, Sensor
+from sensores.services import registrar_lectura
+
+
+class ComandosTests(TestCase):
+
+    def setUp(self):
+        self.ubic = Ubicacion.objects.create(codigo="UB-CM", nombre="Zona CM")
+        self.sensor = Sensor.objects.create(
+            codigo="S-CM",
+            nombre="Nivel",
+            tipo="NIVEL",
+            unidad="cm",
+            ubicacion=self.ubic,
+        )
+        self.bomba = Actuador.objects.create(
+            codigo="A-CM1", nombre="Bomba 1", tipo="BOMBA", gpio="GPIO23", ubicacion=self.ubic
+        )
+        self.valvula = Actuador.objects.create(
+            codigo="A-CM2", nombre="Válvula", tipo="VALVULA", gpio="GPIO5", ubicacion=self.ubic
+        )
+        self.regla = ReglaControl.objects.create(
+            sensor=self.sensor,
+            actuador=self.bomba,
+            condicion="MAYOR",
+            umbral=50,
+            mensaje_accion="Nivel alto",
+        )
+
+    def test_lectura_encola_un_comando_por_cambio_de_estado(self):
+        registrar_lectura(self.sensor, 60, "cm", now())
+        registrar_lectura(self.sensor, 61, "cm", now())
+
+        comando = ComandoActuador.objects.get()
+        self.assertEqual(comando.actuador, self.bomba)
+        self.assertEqual(comando.accion, "ENCENDER")
+        self.assertEqual(comando.estado, "PENDIENTE")
+
+    def test_despacho_agrupa_por_dispositivo_y_confirma(self):
+        c1 = ComandoActuador.objects.create(actuador=self.bomba, accion="ENCENDER")
+        c2 = ComandoActuador.objects.create(actuador=self.bomba, accion="APAGAR")
+        c3 = ComandoActuador.objects.create(actuador=self.valvula, accion="ENCENDER")
+        transporte = TransporteFalso()
+
+        resultado = despachar_pendientes(transporte)
+
+        self.assertEqual(resultado["enviados"], 3)
+        self.assertEqual(resultado["dispositivos"], 2)
+        envios = dict(transporte.enviados)
+        self.assertEqual([m["id"] for m in envios["A-CM1"]], [c1.pk, c2.pk])
+        self.assertEqual(envios["A-CM2"][0]["gpio"], "GPIO5")
+
+        ack = c1.creado_en + timedelta(milliseconds=250)
+        self.assertEqual(confirmar_comandos([c1.pk, c3.pk, c3.pk], ahora=ack), 2)
+        c1.refresh_from_db()
+        self.assertEqual(c1.estado, "CONFIRMADO")
+        self.assertEqual(c1.latencia_ms, 250)
+        # Un ack repetido no vuelve a confirmar
+        self.assertEqual(confirmar_comandos([c1.pk]), 0)
+
+        metricas = metricas_comandos()
+        self.assertEqual(metricas["por_estado"]["CONFIRMADO"], 2)
+        self.assertEqual(metricas["por_estado"]["ENVIADO"], 1)
+
+    def test_envio_fallido_reintenta_hasta_max_intentos(self):
+        comando = ComandoActuador.objects.create(actuador=self.bomba, accion="ENCENDER")
+        transporte = TransporteFalso(fallar=["A-CM1"])
+
+        with self.assertLogs("sensores.comandos", level="WARNING"):
+            despachar_pendientes(transporte, max_intentos=2)
+        comando.refresh_from_db()
+        self.assertEqual(comando.estado, "PENDIENTE")
+        self.assertEqual(comando.intentos, 1)
+
+        with self.assertLogs("sensores.comandos", level="WARNING"):
+            resultado = despachar_pendientes(transporte, max_intentos=2)
+        comando.refresh_from_db()
+        self.assertEqual(comando.estado, "FALLIDO")
+        self.assertEqual(resultado["fallidos"], 1)
+
+    def test_enviado_sin_ack_se_reenvia_hasta_max_intentos(self):
+        hace_un_minuto = now() - timedelta(minutes=1)
+        reemplazado = ComandoActuador.objects.create(
+            actuador=self.bomba, accion="ENCENDER", estado="ENVIADO", intentos=1,
+            creado_en=hace_un_minuto - timedelta(seconds=1), enviado_en=hace_un_minuto,
+        )
+        ultimo = ComandoActuador.objects.create(
+            actuador=self.bomba, accion="APAGAR", estado="ENVIADO", intentos=1,
+            creado_en=hace_un_minuto, enviado_en=hace_un_minuto,
+        )
+        reciente = ComandoActuador.objects.create(
+            actuador=self.valvula, accion="ENCENDER", estado="ENVIADO", intentos=1, enviado_en=now(),
+        )
+        transporte = TransporteFalso()
+
+        resultado = despachar_pendientes(transporte, max_intentos=2, plazo_ack=30)
+
+        self.assertEqual(resultado["enviados"], 1)
+        self.assertEqual(transporte.enviados, [("A-CM1", [ultimo.como_mensaje()])])
+        ultimo.refresh_from_db()
+        self.assertEqual((ultimo.estado, ultimo.intentos), ("ENVIADO", 2))
+        self.assertEqual(ComandoActuador.objects.get(pk=reemplazado.pk).intentos, 1)
+        self.assertEqual(ComandoActuador.objects.get(pk=reciente.pk).intentos, 1)
+
+        # Agotados los intentos sin ack, queda FALLIDO (y el estado se vuelve a pedir)
+        ComandoActuador.objects.filter(pk=ultimo.pk).update(enviado_en=hace_un_minuto)
+        resultado = despachar_pendientes(TransporteFalso(), max_intentos=2, plazo_ack=30)
+
+        self.assertEqual((resultado["tomados"], resultado["fallidos"]), (0, 1))
+        ultimo.refresh_from_db()
+        self.assertEqual(ultimo.estado, "FALLIDO")
+
+    def test_encender_y_apagar_encolan_y_fallido_se_reencola(self):
+        self.assertTrue(self.valvula.encender())
+        self.assertTrue(self.valvula.apagar())
+        self.assertFalse(self.valvula.apagar())
+        self.assertEqual(
+            list(ComandoActuador.objects.order_by("id").values_list("accion", flat=True)),
+            ["ENCENDER", "APAGAR"],
+        )
+
+        ComandoActuador.objects.update(estado="FALLIDO")
+        self.assertFalse(self.valvula.apagar())
+        self.assertFalse(self.valvula.apagar())  # el reencolado queda PENDIENTE
+        self.assertEqual(ComandoActuador.objects.filter(estado="PENDIENTE", accion="APAGAR").count(), 1)
+
+    def test_envio_sin_transaccion_abierta_y_ack_durante_el_envio(self):
+        comando = ComandoActuador.objects.create(actuador=self.bomba, accion="ENCENDER")
+        bloques_del_test = len(connection.atomic_blocks)
+
+        class TransporteConAck(TransporteFalso):
+            def enviar(self, actuador, mensajes):
+                self.bloques = len(connection.atomic_blocks)
+                self.estado_al_enviar = ComandoActuador.objects.get(pk=comando.pk).estado
+                confirmar_comandos([m["id"] for m in mensajes])
+                super().enviar(actuador, mensajes)
+
+        transporte = TransporteConAck()
+        self.assertEqual(despachar_pendientes(transporte)["enviados"], 1)
+
+        self.assertEqual(transporte.bloques, bloques_del_test)
+        self.assertEqual(transporte.estado_al_enviar, "EN_CURSO")
+        comando.refresh_from_db()
+        self.assertEqual(comando.estado, "CONFIRMADO")
+
+    def test_parsear_ack(self):
+        self.assertEqual(parsear_ack(b'{"id": 7}'), [7])
+        self.assertEqual(parsear_ack(b'{"ids": [1, 2]}'), [1, 2])
+        self.assertEqual(parsear_ack(b"[3]"), [3])
+        self.assertIsNone(parsear_ack(b"no-json"))
+
+    def test_api_ack(self):
+        comando = ComandoActuador.objects.create(actuador=self.bomba, accion="ENCENDER")
+
+        resp = self.client.post(
+            "/sensores/api/comandos/ack/",
+            data=json.dumps({"id": comando.pk}),
+            content_type="application/json",
+        )
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["confirmados"], 1)
@@ -0,0 +1,82 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Pruebas unitarias para la exportación de lecturas
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+import csv
+import io
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from inventario.models import Ubicacion
+from planta.models import Estanque
+from sensores.models import Lectura, Sensor
+
+
+class ExportacionLecturasTests(TestCase):
+
+    def setUp(self):
+        self.ubic = Ubicacion.objects.create(codigo="UB-EX", nombre="Zona EX")
+        self.estanque = Estanque.objects.create(
+            codigo="EST-EX", nombre="Estanque EX", capacidad_litros=1000,
+            ubicacion=self.ubic, altura_cm=100,
+        )
+        self.nivel = Sensor.objects.create(
+            codigo="S-EX1", nombre="Nivel", tipo="NIVEL", unidad="cm",
+            ubicacion=self.ubic, estanque=self.estanque,
+        )
+        self.ir = Sensor.objects.create(
+            codigo="S-EX2", nombre="IR", tipo="IR", unidad="uds", ubicacion=self.ubic,
+        )
+        inicio = timezone.make_aware(datetime(2026, 3, 1, 12))
+        Lectura.objects.bulk_create(
+            [
+                Lectura(sensor=self.nivel, valor=i, unidad="cm", fecha_hora=inicio + timedelta(days=i))
+                for i in range(5)
+            ]
+            + [Lectura(sensor=self.ir, valor=7, unidad="uds", fecha_hora=inicio)]
+        )
+        self.staff = get_user_model().objects.create_user("staff", password="x", is_staff=True)
+
+    def _leer_csv(self, contenido: str) -> list[list[str]]:
+        return list(csv.reader(io.StringIO(contenido)))
+
+    def test_csv_en_streaming_filtrado(self):
+        self.client.force_login(self.staff)
+
+        resp = self.client.get(
+            "/sensores/exportar/lecturas/",
+            {"estanque": self.estanque.pk, "desde": "2026-03-02", "hasta": "2026-03-03"},
+        )
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.streaming)
+        self.assertIn("lecturas_20260302_20260303.csv", resp["Content-Disposition"])
+        filas = self._leer_csv(b"".join(resp.streaming_content).decode())
+        self.assertEqual(filas[0], ["fecha_hora", "sensor", "valor", "unidad", "origen"])
+        self.assertEqual([(f[1], float(f[2])) for f in filas[1:]], [("S-EX1", 1.0), ("S-EX1", 2.0)])
+
+    def test_solo_staff_y_parametros_invalidos(self):
+        self.assertEqual(self.client.get("/sensores/exportar/lecturas/").status_code, 302)
+
+        self.client.force_login(self.staff)
+        self.assertEqual(
+            self.client.get("/sensores/exportar/lecturas/", {"desde": "ayer"}).status_code, 400
+        )
+        self.assertEqual(
+            self.client.get("/sensores/exportar/lecturas/", {"formato": "xls"}).status_code, 400
+        )
+
+    def test_comando_exportar_csv(self):
+        salida = io.StringIO()
+        call_command("exportar_lecturas", sensores=["S-EX2"], stdout=salida, stderr=io.StringIO())
+
+        filas = self._leer_csv(salida.getvalue())
+        self.assertEqual(len(filas), 2)
+        self.assertEqual(filas[1][1], "S-EX2")
@@ -0,0 +1,139 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Pruebas unitarias para la ingesta idempotente de lecturas
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+import json
+
+from django.test import TestCase, override_settings
+
+from inventario.models import Ubicacion
+from planta.models import Estanque
+from sensores.cache_sensores import limpiar_cache_sensores
+from sensores.idempotencia import buscar_clave, clave_de_payload, limpiar_claves, recordar_clave
+from sensores.models import Actuador, Alerta, Lectura, ReglaControl, Sensor
+from sensores.services import registrar_lecturas_lote
+
+
+class IdempotenciaLecturasTests(TestCase):
+
+    def setUp(self):
+        limpiar_claves()
+        limpiar_cache_sensores()
+        self.addCleanup(limpiar_claves)
+        self.ubic = Ubicacion.objects.create(codigo="UB-ID", nombre="Zona ID")
+        self.estanque = Estanque.objects.create(
+            codigo="EST-ID", nombre="Estanque ID", capacidad_litros=1000,
+            ubicacion=self.ubic, altura_cm=100,
+        )
+        self.sensor = Sensor.objects.create(
+            codigo="S-ID", nombre="Nivel", tipo="NIVEL", unidad="cm",
+            ubicacion=self.ubic, estanque=self.estanque,
+        )
+        actuador = Actuador.objects.create(
+            codigo="A-ID", nombre="Bomba", tipo="BOMBA", gpio="GPIO4",
+            ubicacion=self.ubic, estanque=self.estanque,
+        )
+        ReglaControl.objects.create(
+            sensor=self.sensor, actuador=actuador, condicion="MAYOR", umbral=50,
+            mensaje_accion="Nivel alto", severidad="WARN", activo=True,
+        )
+
+    def _payload(self, seq: int, valor: float = 80) -> dict:
+        return {
+            "sensor_codigo": "S-ID", "valor": valor, "unidad": "cm",
+            "fecha_hora": f"2026-03-01T10:{seq:02d}:00Z", "seq": seq,
+        }
+
+    def _post(self, payload: dict):
+        return self.client.post(
+            "/sensores/api/lectura/", data=json.dumps(payload), content_type="application/json"
+        )
+
+    def test_reintento_responde_el_id_original_sin_reglas_ni_base(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            primera = self._post(self._payload(1))
+        self.assertEqual(primera.status_code, 201)
+
+        with self.assertNumQueries(0):
+            reintento = self._post(self._payload(1))
+
+        self.assertEqual(reintento.status_code, 200)
+        self.assertEqual(reintento.json()["id"], primera.json()["id"])
+        self.assertTrue(reintento.json()["duplicada"])
+        self.assertEqual(Lectura.objects.count(), 1)
+        self.assertEqual(Alerta.objects.get().ocurrencias, 1)
+
+    def test_reintento_fuera_de_memoria_lo_frena_la_restriccion(self):
+        primera = self._post(self._payload(2))
+        limpiar_claves()  # ej: otro worker o el proceso reinició
+
+        reintento = self._post(self._payload(2))
+
+        self.assertEqual(reintento.status_code, 200)
+        self.assertEqual(reintento.json()["id"], primera.json()["id"])
+        self.assertEqual(Lectura.objects.count(), 1)
+        self.assertEqual(
+            buscar_clave(self.sensor.id, clave_de_payload(self._payload(2))), primera.json()["id"]
+        )
+
+    def test_lote_descarta_reintentos_de_la_base_y_del_mismo_lote(self):
+        previa = registrar_lecturas_lote([self._payload(3)])["resultados"][0]["id"]
+        limpiar_claves()
+
+        resultado = registrar_lecturas_lote([
+            self._payload(3), self._payload(4), self._payload(4), self._payload(5, valor=10),
+        ])
+
+        self.assertEqual((resultado["creadas"], resultado["duplicadas"]), (2, 2))
+        self.assertEqual(resultado["resultados"][0]["id"], previa)
+        self.assertEqual(resultado["resultados"][2]["id"], resultado["resultados"][1]["id"])
+        self.assertEqual(Lectura.objects.count(), 3)
+
+        todo_repetido = self.client.post(
+            "/sensores/api/lecturas/lote/",
+            data=json.dumps([self._payload(4)]),
+            content_type="application/json",
+        )
+        self.assertEqual(todo_repetido.status_code, 200)
+
+    def test_sin_clave_no_se_deduplica(self):
+        payload = self._payload(6)
+        del payload["seq"]
+
+        self.assertEqual(self._post(payload).status_code, 201)
+        self.assertEqual(self._post(payload).status_code, 201)
+        self.assertEqual(Lectura.objects.count(), 2)
+
+    def test_seq_se_acota_por_arranque_o_fecha(self):
+        antes_de_reiniciar = dict(self._payload(8), boot=1)
+        despues_de_reiniciar = dict(self._payload(9), seq=8, boot=2)
+        self.assertNotEqual(
+            clave_de_payload(antes_de_reiniciar), clave_de_payload(despues_de_reiniciar)
+        )
+        self.assertEqual(clave_de_payload(antes_de_reiniciar), "1:8")
+
+        # Sin "boot": el mismo seq en otra fecha es otra lectura
+        self.assertNotEqual(
+            clave_de_payload(self._payload(8)), clave_de_payload(dict(self._payload(9), seq=8))
+        )
+        sin_fecha = self._payload(8)
+        del sin_fecha["fecha_hora"]
+        self.assertIsNone(clave_de_payload(sin_fecha))
+        self.assertEqual(len(clave_de_payload({"clave_idempotencia": "x" * 80})), 64)
+
+    @override_settings(SENSORES_IDEMPOTENCIA_MAX_CLAVES=2, SENSORES_IDEMPOTENCIA_HASH=True)
+    def test_memoria_acotada_y_clave_por_hash(self):
+        for lectura_id in (1, 2, 3):
+            recordar_clave(self.sensor.id, str(lectura_id), lectura_id)
+        self.assertIsNone(buscar_clave(self.sensor.id, "1"))
+        self.assertEqual(buscar_clave(self.sensor.id, "3"), 3)
+
+        payload = self._payload(7)
+        del payload["seq"]
+        self.assertEqual(clave_de_payload(payload), clave_de_payload(dict(payload)))
+        self.assertEqual(len(clave_de_payload(payload)), 64)
+        del payload["fecha_hora"]
+        self.assertIsNone(clave_de_payload(payload))
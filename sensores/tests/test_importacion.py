@@ -0,0 +1,186 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Pruebas unitarias para la importación masiva de lecturas
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+import io
+import json
+import os
+import tempfile
+from datetime import datetime, timezone as dt_timezone
+from unittest import mock, skipUnless
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+from inventario.models import Ubicacion
+from planta.models import Estanque
+from sensores import importacion
+from sensores.cache_sensores import limpiar_cache_sensores
+from sensores.importacion import importar_lecturas, leer_checkpoint
+from sensores.models import Actuador, Alerta, Lectura, ReglaControl, ResumenLectura, Sensor, UltimoValorSensor
+
+
+class ImportacionLecturasTests(TestCase):
+
+    def setUp(self):
+        limpiar_cache_sensores()
+        self.ubic = Ubicacion.objects.create(codigo="UB-IM", nombre="Zona IM")
+        self.estanque = Estanque.objects.create(
+            codigo="EST-IM", nombre="Estanque IM", capacidad_litros=1000,
+            ubicacion=self.ubic, altura_cm=100,
+        )
+        self.sensor = Sensor.objects.create(
+            codigo="S-IM", nombre="Nivel", tipo="NIVEL", unidad="cm",
+            ubicacion=self.ubic, estanque=self.estanque,
+        )
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def _archivo(self, nombre: str, contenido: str) -> str:
+        ruta = os.path.join(self.dir.name, nombre)
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            archivo.write(contenido)
+        return ruta
+
+    def _jsonl(self, filas: list) -> str:
+        return self._archivo("sd.jsonl", "".join(
+            (fila if isinstance(fila, str) else json.dumps(fila)) + "\n" for fila in filas
+        ))
+
+    def _fila(self, minuto: int, valor: float, codigo: str = "S-IM") -> dict:
+        return {
+            "sensor_codigo": codigo, "valor": valor, "unidad": "cm",
+            "fecha_hora": f"2026-03-01T10:{minuto:02d}:00+00:00",
+        }
+
+    def test_csv_valida_deduplica_y_recalcula_derivados(self):
+        existente = datetime(2026, 3, 1, 10, 0, tzinfo=dt_timezone.utc)
+        Lectura.objects.create(sensor=self.sensor, valor=10, unidad="cm", fecha_hora=existente)
+        ruta = self._archivo("sd.csv", (
+            "sensor_codigo,valor,unidad,fecha_hora\n"
+            "S-IM,10,cm,2026-03-01T10:00:00+00:00\n"   # ya estaba en la base
+            "S-IM,20,cm,2026-03-01T10:01:00+00:00\n"
+            "S-IM,20,cm,2026-03-01T10:01:00+00:00\n"   # repetida en el archivo
+            "S-IM,abc,cm,2026-03-01T10:02:00+00:00\n"
+            "S-XX,5,cm,2026-03-01T10:03:00+00:00\n"
+            "S-IM,5,cm,\n"                            # sin fecha: no es histórica
+            "S-IM,40,cm,2026-03-01T10:04:00+00:00\n"
+        ))
+        rechazos = io.StringIO()
+
+        resultado = importar_lecturas(ruta, chunk_size=3, rechazos=rechazos)
+
+        self.assertEqual(
+            (resultado["insertadas"], resultado["duplicadas"], resultado["rechazadas"]), (2, 2, 3)
+        )
+        self.assertFalse(resultado["usa_copy"])
+        self.assertEqual(Lectura.objects.filter(sensor=self.sensor).count(), 3)
+        self.assertEqual(
+            sorted(json.loads(l)["linea"] for l in rechazos.getvalue().splitlines()), [5, 6, 7]
+        )
+        self.assertEqual(UltimoValorSensor.objects.get(sensor=self.sensor).valor, 40)
+        self.estanque.refresh_from_db()
+        self.assertEqual(self.estanque.volumen_actual_litros, 400)
+        self.assertTrue(ResumenLectura.objects.filter(sensor=self.sensor).exists())
+
+    def test_resumenes_de_dias_sin_filas_importadas_se_conservan(self):
+        retenido = datetime(2026, 3, 2, 12, 0, tzinfo=dt_timezone.utc)
+        ResumenLectura.objects.create(
+            sensor=self.sensor, resolucion="1h", inicio=retenido, minimo=1, maximo=1,
+            suma=1, cantidad=1, ultimo_valor=1, ultima_fecha=retenido,
+        )
+        fila_del_3 = dict(self._fila(0, 30), fecha_hora="2026-03-03T10:00:00+00:00")
+
+        importar_lecturas(self._jsonl([self._fila(0, 10), fila_del_3]))
+
+        self.assertTrue(ResumenLectura.objects.filter(inicio=retenido).exists())
+        self.assertEqual(
+            ResumenLectura.objects.filter(sensor=self.sensor, resolucion="1d").count(), 2
+        )
+
+    def test_reanuda_desde_checkpoint(self):
+        ruta = self._jsonl([self._fila(m, m) for m in range(6)])
+        checkpoint = ruta + ".checkpoint"
+        original = importacion._importar_bloque
+        llamadas = []
+
+        def falla_en_el_segundo(*args, **kwargs):
+            llamadas.append(1)
+            if len(llamadas) == 2:
+                raise RuntimeError("corte de luz")
+            return original(*args, **kwargs)
+
+        with mock.patch.object(importacion, "_importar_bloque", falla_en_el_segundo):
+            with self.assertRaises(RuntimeError):
+                importar_lecturas(ruta, chunk_size=2, checkpoint=checkpoint)
+
+        self.assertEqual(Lectura.objects.count(), 2)
+        self.assertEqual(leer_checkpoint(checkpoint).linea, 2)
+
+        resultado = importar_lecturas(ruta, chunk_size=2, checkpoint=checkpoint)
+
+        self.assertTrue(resultado["reanudada"])
+        self.assertEqual(resultado["insertadas"], 6)
+        self.assertEqual(Lectura.objects.count(), 6)
+        self.assertFalse(os.path.exists(checkpoint))
+
+    def test_reproducir_reglas_y_json_invalido(self):
+        actuador = Actuador.objects.create(
+            codigo="A-IM", nombre="Bomba", tipo="BOMBA", gpio="GPIO5",
+            ubicacion=self.ubic, estanque=self.estanque,
+        )
+        ReglaControl.objects.create(
+            sensor=self.sensor, actuador=actuador, condicion="MAYOR", umbral=50,
+            mensaje_accion="Nivel alto", severidad="WARN", activo=True,
+        )
+        ruta = self._jsonl([self._fila(0, 80), "{no es json"])
+
+        salida = io.StringIO()
+        call_command("importar_lecturas", ruta, "--reglas", "omitir", "--sin-checkpoint", stdout=salida)
+        self.assertIn("1 lecturas importadas", salida.getvalue())
+        self.assertFalse(Alerta.objects.exists())
+
+        Lectura.objects.all().delete()
+        call_command("importar_lecturas", ruta, "--reglas", "reproducir", "--sin-checkpoint", stdout=io.StringIO())
+        self.assertTrue(Alerta.objects.filter(sensor=self.sensor).exists())
+
+    def test_unidad_vacia_o_larga_se_rechaza_por_fila(self):
+        ruta = self._jsonl([
+            dict(self._fila(0, 10), unidad=""),
+            dict(self._fila(1, 20), unidad="x" * 21),
+            self._fila(2, 30),
+        ])
+        rechazos = io.StringIO()
+
+        resultado = importar_lecturas(ruta, rechazos=rechazos)
+
+        self.assertEqual((resultado["insertadas"], resultado["rechazadas"]), (1, 2))
+        self.assertEqual([json.loads(l)["linea"] for l in rechazos.getvalue().splitlines()], [1, 2])
+
+    @skipUnless(connection.vendor == "postgresql", "COPY sólo existe en PostgreSQL")
+    def test_copy_inserta_y_rechaza_por_fila(self):
+        ruta = self._jsonl([
+            dict(self._fila(0, 10), unidad=""),
+            dict(self._fila(1, 20), unidad="x" * 21),
+            self._fila(2, 30),
+        ])
+
+        resultado = importar_lecturas(ruta)
+
+        self.assertTrue(resultado["usa_copy"])
+        self.assertEqual((resultado["insertadas"], resultado["rechazadas"]), (1, 2))
+        lectura = Lectura.objects.get(sensor=self.sensor)
+        self.assertEqual((lectura.unidad, lectura.raw_payload["valor"]), ("cm", 30))
+
+        sin_payload = Lectura(
+            sensor=self.sensor, valor=1, unidad="cm", origen="ESP32",
+            fecha_hora=datetime(2026, 3, 2, tzinfo=dt_timezone.utc), raw_payload=None,
+        )
+        importacion._insertar_copy([sin_payload])
+        self.assertTrue(
+            Lectura.objects.filter(fecha_hora=sin_payload.fecha_hora, raw_payload__isnull=True).exists()
+        )
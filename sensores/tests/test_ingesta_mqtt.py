@@ -0,0 +1,104 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Pruebas unitarias para la ingesta MQTT por micro-lotes
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+import json
+from types import SimpleNamespace
+
+from django.test import TestCase
+
+from inventario.models import Ubicacion
+from sensores.ingesta import IngestorLotes
+from sensores.models import Lectura, Sensor
+from sensores.mqtt import ConsumidorMqtt
+from sensores.services import registrar_lecturas_lote
+
+
+class BrokerFalso:
+    """Sustituto local de un cliente paho-mqtt conectado a un broker."""
+
+    def __init__(self):
+        self.on_connect = None
+        self.on_message = None
+        self.suscripciones = []
+
+    def subscribe(self, topico, qos=0):
+        self.suscripciones.append((topico, qos))
+
+    def conectar(self):
+        self.on_connect(self, None, {}, 0, None)
+
+    def publicar(self, topico, payload):
+        if not isinstance(payload, bytes):
+            payload = json.dumps(payload).encode("utf-8")
+        self.on_message(self, None, SimpleNamespace(topic=topico, payload=payload))
+
+
+class IngestaMqttTests(TestCase):
+
+    def setUp(self):
+        self.ubic = Ubicacion.objects.create(codigo="UB-MQ", nombre="Zona MQTT")
+        self.sensor = Sensor.objects.create(
+            codigo="NIVEL_TK1",
+            nombre="Nivel TK1",
+            tipo="NIVEL",
+            unidad="cm",
+            ubicacion=self.ubic,
+        )
+        self.broker = BrokerFalso()
+        self.ingestor = IngestorLotes(tamano_lote=2, capacidad_cola=3, timeout_encolar=0)
+        self.consumidor = ConsumidorMqtt(self.broker, self.ingestor)
+
+    def test_suscribe_al_conectar(self):
+        self.broker.conectar()
+        self.assertEqual(self.broker.suscripciones, [("planta/+/lectura", 1)])
+
+    def test_mensajes_se_registran_en_lotes(self):
+        # sensor_codigo tomado del tópico
+        self.broker.publicar("planta/NIVEL_TK1/lectura", {"valor": 10, "unidad": "cm"})
+        # lista de lecturas en un solo mensaje
+        self.broker.publicar(
+            "planta/NIVEL_TK1/lectura",
+            [{"valor": 11, "unidad": "cm"}, {"valor": "x", "unidad": "cm"}],
+        )
+        with self.assertLogs("sensores.mqtt", level="WARNING"):
+            self.broker.publicar("planta/NIVEL_TK1/lectura", b"no es json")
+
+        self.ingestor.vaciar()
+
+        metricas = self.ingestor.metricas.como_dict()
+        self.assertEqual(Lectura.objects.filter(sensor=self.sensor).count(), 2)
+        self.assertEqual(metricas["creadas"], 2)
+        self.assertEqual(metricas["rechazadas"], 1)
+        self.assertEqual(metricas["lotes"], 2)
+        self.assertEqual(self.consumidor.invalidos, 1)
+
+    def test_lote_fallido_se_reintenta_de_a_una(self):
+        def registrar(payloads):
+            if any(p["valor"] == "rompe" for p in payloads):
+                raise RuntimeError("error de escritura")
+            return registrar_lecturas_lote(payloads)
+
+        ingestor = IngestorLotes(tamano_lote=3, registrar=registrar)
+        for valor in (1, "rompe", 3):
+            ingestor.encolar({"sensor_codigo": "NIVEL_TK1", "valor": valor, "unidad": "cm"})
+
+        with self.assertLogs("sensores.ingesta", level="ERROR"):
+            ingestor.vaciar()
+
+        metricas = ingestor.metricas.como_dict()
+        self.assertEqual((metricas["creadas"], metricas["errores"], metricas["lotes"]), (2, 1, 1))
+        self.assertEqual(Lectura.objects.filter(sensor=self.sensor).count(), 2)
+
+    def test_cola_llena_descarta_y_cuenta(self):
+        with self.assertLogs("sensores.ingesta", level="WARNING"):
+            for valor in range(5):
+                self.broker.publicar("planta/NIVEL_TK1/lectura", {"valor": valor, "unidad": "cm"})
+
+        metricas = self.ingestor.metricas.como_dict()
+        self.assertEqual(metricas["recibidas"], 5)
+        self.assertEqual(metricas["descartadas"], 2)
+        self.assertEqual(metricas["profundidad_maxima"], 3)
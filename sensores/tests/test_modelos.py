@@ -3,8 +3,10 @@
 # FECHA DE CREACIÓN: 01-11-2025
 # LICENCIA: Uso Educacional-No Comercial
 # PROPÓSITO: Pruebas unitarias para modelos de sensores y actuadores Io
-# FECHA ÚLTIMA MODIFICACIÓN: 18-11-2025
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
 # ---------------------------------------------------------
+from datetime import timedelta
+
 from django.test import TestCase
 from django.utils import timezone
 
@@ -60,3 +62,23 @@ class SensorLecturaTests(TestCase):
         )
         self.assertTrue(lectura.esta_fuera_de_rango())
 
+    def test_rangos_en_bloque(self):
+        sin_rango = Sensor.objects.create(
+            codigo="SEN-2", nombre="Sin rango", tipo="IR", unidad="uds", ubicacion=self.ubic
+        )
+        ahora = timezone.now()
+        for sensor, valor in [(self.sensor, 5), (self.sensor, 50), (self.sensor, 95), (sin_rango, 1000)]:
+            Lectura.objects.create(sensor=sensor, valor=valor, unidad="cm", fecha_hora=ahora)
+        # Fuera de la ventana consultada
+        Lectura.objects.create(sensor=self.sensor, valor=500, unidad="cm", fecha_hora=ahora - timedelta(days=40))
+
+        ventana = Lectura.objects.entre(ahora - timedelta(days=30), ahora + timedelta(seconds=1))
+        with self.assertNumQueries(1):
+            conteo = ventana.conteo_fuera_de_rango()
+        self.assertEqual(conteo[self.sensor.pk], {"total": 3, "fuera_de_rango": 2})
+        self.assertEqual(conteo[sin_rango.pk], {"total": 1, "fuera_de_rango": 0})
+
+        with self.assertNumQueries(1):
+            marcas = [(float(l.valor), l.esta_fuera_de_rango()) for l in ventana.con_fuera_de_rango()]
+        self.assertEqual(sorted(marcas), [(5.0, True), (50.0, False), (95.0, True), (1000.0, False)])
+        self.assertEqual(ventana.solo_fuera_de_rango().count(), 2)
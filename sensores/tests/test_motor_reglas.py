@@ -0,0 +1,64 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Pruebas unitarias para el caché de reglas compiladas
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from django.test import TestCase
+
+from inventario.models import Ubicacion
+from sensores.models import Sensor, ReglaControl
+from sensores.motor_reglas import invalidar_reglas, reglas_que_se_cumplen
+
+
+class MotorReglasTests(TestCase):
+
+    def setUp(self):
+        invalidar_reglas()
+        self.ubic = Ubicacion.objects.create(codigo="UB-MR", nombre="Zona MR")
+        self.sensor = Sensor.objects.create(
+            codigo="S-MR",
+            nombre="Nivel",
+            tipo="NIVEL",
+            unidad="cm",
+            ubicacion=self.ubic,
+        )
+        self.regla = ReglaControl.objects.create(
+            sensor=self.sensor,
+            condicion="MAYOR",
+            umbral=50,
+            mensaje_accion="Nivel alto",
+        )
+
+    def test_segunda_evaluacion_no_consulta_bd(self):
+        with self.assertNumQueries(1):
+            reglas_que_se_cumplen(self.sensor.id, 60)
+        with self.assertNumQueries(0):
+            self.assertEqual(reglas_que_se_cumplen(self.sensor.id, 60), [self.regla])
+            self.assertEqual(reglas_que_se_cumplen(self.sensor.id, 40), [])
+
+    def test_guardar_regla_invalida_cache(self):
+        reglas_que_se_cumplen(self.sensor.id, 60)
+
+        self.regla.umbral = 70
+        self.regla.save()
+
+        self.assertEqual(reglas_que_se_cumplen(self.sensor.id, 60), [])
+
+    def test_eliminar_o_desactivar_regla_invalida_cache(self):
+        self.assertEqual(len(reglas_que_se_cumplen(self.sensor.id, 60)), 1)
+
+        self.regla.desactivar()
+        self.assertEqual(reglas_que_se_cumplen(self.sensor.id, 60), [])
+
+        otra = ReglaControl.objects.create(
+            sensor=self.sensor,
+            condicion="MENOR_IGUAL",
+            umbral=10,
+            mensaje_accion="Nivel bajo",
+        )
+        self.assertEqual(reglas_que_se_cumplen(self.sensor.id, 10), [otra])
+
+        otra.delete()
+        self.assertEqual(reglas_que_se_cumplen(self.sensor.id, 10), [])
@@ -0,0 +1,104 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Pruebas unitarias para el particionamiento de lecturas
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+import io
+from datetime import date, datetime, time
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TransactionTestCase
+from django.utils import timezone
+
+from inventario.models import Ubicacion
+from sensores import particiones
+from sensores.models import Lectura, Sensor
+from sensores.particiones import (
+    inicio_mes,
+    nombre_particion,
+    sql_convertir,
+    sql_crear_particion,
+    sql_desacoplar_particion,
+    sql_preparar_conversion,
+    sumar_meses,
+)
+
+
+class ParticionesTests(SimpleTestCase):
+
+    def test_sumar_meses_cruza_anios(self):
+        self.assertEqual(sumar_meses(date(2026, 11, 15), 1), date(2026, 12, 1))
+        self.assertEqual(sumar_meses(date(2026, 12, 1), 1), date(2027, 1, 1))
+        self.assertEqual(sumar_meses(date(2026, 1, 1), -1), date(2025, 12, 1))
+        self.assertEqual(sumar_meses(date(2026, 10, 1), -12), date(2025, 10, 1))
+
+    def test_sql_crear_particion_mensual(self):
+        self.assertEqual(nombre_particion(date(2026, 2, 1)), "sensores_lectura_p2026_02")
+        # Límites en hora local (America/Santiago) con su desfase explícito
+        self.assertEqual(inicio_mes(date(2026, 12, 15)), "'2026-12-01T00:00:00-03:00'::timestamptz")
+        self.assertIn(
+            f"FOR VALUES FROM ({inicio_mes(date(2026, 12, 1))}) TO ({inicio_mes(date(2027, 1, 1))})",
+            sql_crear_particion(date(2026, 12, 1)),
+        )
+
+    def test_conversion_construye_indices_concurrentes_antes_de_adjuntar(self):
+        preparacion = sql_preparar_conversion(date(2026, 11, 1))
+        self.assertTrue(all(
+            "CONCURRENTLY" in sentencia for sentencia in preparacion if "CREATE" in sentencia
+        ))
+        self.assertIn("NOT VALID", preparacion[-2])
+        self.assertIn("VALIDATE CONSTRAINT", preparacion[-1])
+
+        conversion = sql_convertir(date(2026, 11, 1))
+        self.assertFalse(any("VALIDATE" in sentencia for sentencia in conversion))
+        self.assertTrue(any("PRIMARY KEY USING INDEX" in sentencia for sentencia in conversion))
+
+    def test_eliminar_anula_referencias_antes_del_drop(self):
+        sentencias = sql_desacoplar_particion("sensores_lectura_p2025_01", eliminar=True)
+
+        self.assertEqual(len(sentencias), 4)
+        self.assertTrue(all(s.startswith("UPDATE") for s in sentencias[:2]))
+        self.assertEqual(sentencias[-1], "DROP TABLE sensores_lectura_p2025_01")
+        self.assertEqual(len(sql_desacoplar_particion("sensores_lectura_p2025_01")), 1)
+
+
+@skipUnless(connection.vendor == "postgresql", "El particionamiento requiere PostgreSQL")
+class ConversionPostgresTests(TransactionTestCase):
+    """
+    Ejecuta el SQL real contra la base de pruebas. Deja sensores_lectura
+    particionada: las pruebas siguientes corren sobre la tabla convertida.
+    """
+
+    def test_convertir_enruta_por_mes_local_y_no_rechaza_la_ingesta(self):
+        ubic = Ubicacion.objects.create(codigo="UB-PT", nombre="Zona PT")
+        sensor = Sensor.objects.create(codigo="S-PT", nombre="Nivel", tipo="NIVEL", unidad="cm", ubicacion=ubic)
+        Lectura.objects.create(sensor=sensor, valor=1, unidad="cm", fecha_hora=timezone.now())
+
+        mes_actual = timezone.localdate().replace(day=1)
+        primer_mes = particiones.sumar_meses(mes_actual, 2)
+        particiones.ejecutar_sin_transaccion(particiones.sql_preparar_conversion(primer_mes))
+        # Entre ambas fases: una lectura del mes siguiente sigue entrando
+        mes_siguiente = particiones.sumar_meses(mes_actual, 1)
+        Lectura.objects.create(
+            sensor=sensor, valor=2, unidad="cm",
+            fecha_hora=timezone.make_aware(datetime.combine(mes_siguiente, time(12))),
+        )
+
+        particiones.ejecutar(particiones.sql_convertir(primer_mes))
+        self.assertTrue(particiones.esta_particionada())
+        self.assertEqual(particiones.limite_historica(), primer_mes)
+
+        call_command("particiones_lecturas", "crear", "--meses", "3", stdout=io.StringIO())
+        # Medianoche local del primer día del mes: va a la partición de ese mes
+        inicio = timezone.make_aware(datetime.combine(primer_mes, time.min))
+        Lectura.objects.create(sensor=sensor, valor=3, unidad="cm", fecha_hora=inicio)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT tableoid::regclass::text FROM {particiones.TABLA} WHERE valor = 3"
+            )
+            self.assertEqual(cursor.fetchone()[0], nombre_particion(primer_mes))
+        self.assertEqual(Lectura.objects.count(), 3)
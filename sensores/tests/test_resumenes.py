@@ -0,0 +1,97 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Pruebas unitarias para los resúmenes de lecturas
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from datetime import datetime, timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from inventario.models import Ubicacion
+from sensores.models import ResumenLectura, Sensor
+from sensores.resumenes import elegir_resolucion, recalcular_resumenes, serie_sensor
+from sensores.services import registrar_lectura
+
+
+class ResumenesTests(TestCase):
+
+    def setUp(self):
+        self.ubic = Ubicacion.objects.create(codigo="UB-RS", nombre="Zona RS")
+        self.sensor = Sensor.objects.create(
+            codigo="S-RS",
+            nombre="Nivel",
+            tipo="NIVEL",
+            unidad="cm",
+            ubicacion=self.ubic,
+        )
+        self.base = timezone.make_aware(datetime(2026, 3, 10, 8, 0, 0))
+
+    def test_ingesta_mantiene_resumenes(self):
+        registrar_lectura(self.sensor, 10, "cm", self.base + timedelta(seconds=10))
+        registrar_lectura(self.sensor, 30, "cm", self.base + timedelta(seconds=50))
+        # Lectura atrasada dentro del mismo minuto: no cambia el último valor
+        registrar_lectura(self.sensor, 20, "cm", self.base + timedelta(seconds=5))
+
+        minuto = ResumenLectura.objects.get(sensor=self.sensor, resolucion="1m")
+        self.assertEqual(minuto.inicio, self.base)
+        self.assertEqual((minuto.minimo, minuto.maximo, minuto.cantidad), (10, 30, 3))
+        self.assertEqual(minuto.promedio, 20)
+        self.assertEqual(minuto.ultimo_valor, 30)
+        self.assertEqual(ResumenLectura.objects.filter(sensor=self.sensor).count(), 3)
+
+    def test_recalcular_coincide_con_ingesta(self):
+        for i in range(5):
+            registrar_lectura(self.sensor, i, "cm", self.base + timedelta(minutes=i * 20))
+        esperado = sorted(
+            ResumenLectura.objects.values_list("resolucion", "inicio", "suma", "cantidad")
+        )
+
+        ResumenLectura.objects.all().delete()
+        recalcular_resumenes(self.base, self.base + timedelta(hours=2))
+
+        self.assertEqual(
+            sorted(ResumenLectura.objects.values_list("resolucion", "inicio", "suma", "cantidad")),
+            esperado,
+        )
+
+    @override_settings(SENSORES_RETENCION={"default": {"dias_crudos": 30}})
+    def test_recalcular_conserva_resumenes_de_dias_purgados(self):
+        purgado = timezone.localtime() - timedelta(days=60)
+        parcial = timezone.localtime() - timedelta(days=45)
+        for fecha in (purgado, parcial):
+            registrar_lectura(self.sensor, 10, "cm", fecha)
+            registrar_lectura(self.sensor, 20, "cm", fecha + timedelta(minutes=1))
+        # Día sin lecturas crudas y día anterior al corte con una parte purgada
+        self.sensor.lecturas.filter(fecha_hora__lt=parcial).delete()
+        self.sensor.lecturas.filter(fecha_hora=parcial).delete()
+        antes = sorted(ResumenLectura.objects.values_list("resolucion", "inicio", "cantidad"))
+
+        recalcular_resumenes(purgado - timedelta(days=1), timezone.now())
+
+        self.assertEqual(
+            sorted(ResumenLectura.objects.values_list("resolucion", "inicio", "cantidad")), antes
+        )
+
+    def test_serie_elige_resumen_mas_grueso(self):
+        self.assertIsNone(elegir_resolucion(10))
+        self.assertEqual(elegir_resolucion(60), "1m")
+        self.assertEqual(elegir_resolucion(7200), "1h")
+        self.assertEqual(elegir_resolucion(30 * 86400), "1d")
+
+        for i in range(3):
+            registrar_lectura(self.sensor, 10 * (i + 1), "cm", self.base + timedelta(hours=i))
+
+        mes = serie_sensor(self.sensor.id, self.base - timedelta(days=15), self.base + timedelta(days=15), max_puntos=100)
+        self.assertEqual(mes["resolucion"], "1h")
+        self.assertEqual([p["promedio"] for p in mes["puntos"]], [10, 20, 30])
+
+        dia = serie_sensor(self.sensor.id, self.base, self.base + timedelta(days=1), resolucion_segundos=86400)
+        self.assertEqual(dia["resolucion"], "1d")
+        self.assertEqual(dia["puntos"][0]["cantidad"], 3)
+
+        crudo = serie_sensor(self.sensor.id, self.base, self.base + timedelta(minutes=1), max_puntos=100)
+        self.assertEqual(crudo["resolucion"], "crudo")
+        self.assertEqual(len(crudo["puntos"]), 1)
@@ -0,0 +1,79 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Pruebas unitarias para la retención de lecturas
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from inventario.models import Ubicacion
+from sensores.models import Alerta, Lectura, Sensor
+from sensores.retencion import politica_retencion, purgar_lecturas
+
+
+@override_settings(SENSORES_RETENCION={
+    "default": {"dias_crudos": None, "dias_payload": 30},
+    "IR": {"dias_crudos": 90},
+})
+class RetencionTests(TestCase):
+
+    def setUp(self):
+        self.ubic = Ubicacion.objects.create(codigo="UB-RT", nombre="Zona RT")
+        self.ir = Sensor.objects.create(
+            codigo="S-IR", nombre="IR", tipo="IR", unidad="uds", ubicacion=self.ubic
+        )
+        self.nivel = Sensor.objects.create(
+            codigo="S-NV", nombre="Nivel", tipo="NIVEL", unidad="cm", ubicacion=self.ubic
+        )
+        ahora = timezone.now()
+        for sensor in (self.ir, self.nivel):
+            for dias in (1, 45, 120, 200):
+                Lectura.objects.create(
+                    sensor=sensor,
+                    valor=dias,
+                    unidad=sensor.unidad,
+                    fecha_hora=ahora - timedelta(days=dias),
+                    raw_payload={"valor": dias, "firmware": "1.0.3"},
+                )
+        self.vieja_ir = Lectura.objects.get(sensor=self.ir, valor=200)
+        Alerta.objects.create(sensor=self.ir, lectura=self.vieja_ir, severidad="WARN", mensaje="x")
+
+    def test_politica_combina_default_y_tipo(self):
+        self.assertEqual(politica_retencion("IR"), {"dias_crudos": 90, "dias_payload": 30})
+        self.assertEqual(politica_retencion("PH"), {"dias_crudos": None, "dias_payload": 30})
+
+    def test_dry_run_no_modifica(self):
+        resultado = purgar_lecturas(dry_run=True, chunk=2)
+
+        self.assertEqual(resultado.filas_eliminadas, 2)
+        # Las IR de 120 y 200 días se eliminan: su payload no se limpia antes
+        self.assertEqual(resultado.payloads_limpiados, 4)
+        self.assertGreater(resultado.bytes_liberados, 0)
+        self.assertEqual(Lectura.objects.filter(raw_payload__isnull=True).count(), 0)
+
+    def test_dry_run_estima_los_mismos_bytes_que_la_purga(self):
+        # Las filas IR viejas caen en ambos cortes: su payload no se cuenta dos veces
+        estimado = purgar_lecturas(dry_run=True, chunk=2).bytes_liberados
+
+        self.assertEqual(purgar_lecturas(chunk=2).bytes_liberados, estimado)
+
+    def test_purga_por_tramos(self):
+        resultado = purgar_lecturas(chunk=2)
+
+        self.assertEqual((resultado.filas_eliminadas, resultado.payloads_limpiados), (2, 4))
+        self.assertEqual(Lectura.objects.filter(sensor=self.ir).count(), 2)
+        self.assertEqual(Lectura.objects.filter(sensor=self.nivel).count(), 4)
+        # raw_payload limpiado en todo lo mayor a 30 días
+        self.assertEqual(
+            list(Lectura.objects.filter(raw_payload__isnull=False).values_list("valor", flat=True)),
+            [1, 1],
+        )
+        # Las alertas se conservan sin la lectura eliminada
+        self.assertIsNone(Alerta.objects.get(sensor=self.ir).lectura)
+
+        # Re-ejecutar no encuentra nada pendiente
+        self.assertEqual(purgar_lecturas(chunk=2).como_dict()["filas_eliminadas"], 0)
@@ -3,18 +3,23 @@
 # FECHA DE CREACIÓN: 01-10-2025
 # LICENCIA: Uso Educacional-No Comercial
 # PROPÓSITO: Pruebas unitarias para servicios IoT
-# FECHA ÚLTIMA MODIFICACIÓN: 18-11-2025
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
 # ---------------------------------------------------------
 
+from django.db import transaction
 from django.test import TestCase
 from django.utils.timezone import now
 
 from planta.models import Estanque
 from inventario.models import Ubicacion
-from sensores.models import Sensor, Actuador, ReglaControl, Lectura
+from datetime import timedelta
+
+from sensores.estado_actuadores import estado_conocido, limpiar_estados
+from sensores.models import Sensor, Actuador, ReglaControl, Lectura, Alerta
 from sensores.services import (
     procesar_payload_lectura,
     registrar_lectura,
+    registrar_lecturas_lote,
     evaluar_reglas_sensor,
 )
 
@@ -99,3 +104,88 @@ class ServiciosTests(TestCase):
         # Recargar el actuador para ver el estado actualizado
         self.act.refresh_from_db()
         self.assertTrue(self.act.encendido)
+
+    # -------------------------------------------------------------
+    # TEST 3: Registro de lecturas en lote
+    # -------------------------------------------------------------
+    def test_registrar_lecturas_lote(self):
+        payloads = [
+            {"sensor_codigo": "S-01", "valor": 40, "unidad": "cm"},
+            {"sensor_codigo": "S-01", "valor": 70, "unidad": "cm"},
+            {"sensor_codigo": "S-99", "valor": 70, "unidad": "cm"},
+            {"valor": 70, "unidad": "cm"},
+        ]
+
+        resultado = registrar_lecturas_lote(payloads)
+
+        self.assertEqual(resultado["creadas"], 2)
+        self.assertEqual(resultado["rechazadas"], 2)
+        self.assertEqual(resultado["resultados"][3]["error"], "Falta el campo 'sensor_codigo'")
+        self.assertEqual(Lectura.objects.filter(sensor=self.sensor).count(), 2)
+
+        # Sólo la lectura de 70 supera el umbral
+        self.assertEqual(Alerta.objects.filter(sensor=self.sensor).count(), 1)
+        self.act.refresh_from_db()
+        self.assertTrue(self.act.encendido)
+
+    # -------------------------------------------------------------
+    # TEST 4: Último valor desnormalizado
+    # -------------------------------------------------------------
+    def test_ultimo_valor_ignora_lecturas_atrasadas(self):
+        ahora = now()
+        registrar_lectura(self.sensor, 30, "cm", ahora)
+        # Lectura atrasada (buffer del ESP32): no reemplaza al valor actual
+        registrar_lectura(self.sensor, 20, "cm", ahora - timedelta(minutes=5))
+
+        sensor = Sensor.objects.con_ultimo_valor().get(pk=self.sensor.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(sensor.valor_actual(), 30)
+
+        registrar_lecturas_lote([
+            {"sensor_codigo": "S-01", "valor": 41, "unidad": "cm",
+             "fecha_hora": (ahora + timedelta(minutes=2)).isoformat()},
+            {"sensor_codigo": "S-01", "valor": 40, "unidad": "cm",
+             "fecha_hora": (ahora + timedelta(minutes=1)).isoformat()},
+        ])
+        self.sensor.refresh_from_db()
+        self.assertEqual(self.sensor.valor_actual(), 41)
+        self.assertEqual(float(self.sensor.ultima_lectura().valor), 41)
+
+    # -------------------------------------------------------------
+    # TEST 5: Comandos redundantes al actuador
+    # -------------------------------------------------------------
+    def test_encender_solo_escribe_si_cambia_estado(self):
+        self.assertTrue(self.act.encender())
+        marca = Actuador.objects.get(pk=self.act.pk).updated_at
+
+        self.assertFalse(self.act.encender())
+        self.assertEqual(Actuador.objects.get(pk=self.act.pk).updated_at, marca)
+
+        self.assertTrue(self.act.apagar())
+        self.assertFalse(Actuador.objects.get(pk=self.act.pk).encendido)
+
+    def test_estado_se_recuerda_solo_al_confirmar(self):
+        limpiar_estados()
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                self.act.encender()
+                raise RuntimeError("rollback")
+        self.assertIsNone(estado_conocido(self.act.pk))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.act.encender()
+        self.assertIs(estado_conocido(self.act.pk), True)
+
+    def test_regla_omite_comando_si_actuador_ya_encendido(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            registrar_lectura(self.sensor, 60, "cm", now())
+        self.act.refresh_from_db()
+        self.assertTrue(self.act.encendido)
+
+        # Cambio por fuera del ORM de instancias (no pasa por señales): el
+        # estado cacheado sigue "encendido", así que la regla no envía comando
+        Actuador.objects.filter(pk=self.act.pk).update(encendido=False)
+        registrar_lectura(self.sensor, 61, "cm", now())
+
+        self.act.refresh_from_db()
+        self.assertFalse(self.act.encendido)
@@ -3,11 +3,27 @@
 # FECHA DE CREACIÓN: 01-10-2025
 # LICENCIA: Uso Educacional-No Comercial
 # PROPÓSITO: URLs para la aplicación de sensores y actuadores IoT
-# FECHA ÚLTIMA MODIFICACIÓN: 18-11-2025
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
 # ---------------------------------------------------------
+from django.conf import settings
 from django.urls import path
-from .views_api import api_recibir_lectura
+from .views import exportar_lecturas
+from .views_api import (
+    api_ack_comandos,
+    api_recibir_lectura,
+    api_recibir_lectura_async,
+    api_recibir_lecturas_lote,
+)
+
+# Ingesta sync (WSGI) o async nativa (ASGI) según configuración
+if getattr(settings, "SENSORES_INGESTA_ASYNC", False):
+    vista_lectura = api_recibir_lectura_async
+else:
+    vista_lectura = api_recibir_lectura
 
 urlpatterns = [
-    path("api/lectura/", api_recibir_lectura, name="api_recibir_lectura"),
+    path("api/lectura/", vista_lectura, name="api_recibir_lectura"),
+    path("api/lecturas/lote/", api_recibir_lecturas_lote, name="api_recibir_lecturas_lote"),
+    path("api/comandos/ack/", api_ack_comandos, name="api_ack_comandos"),
+    path("exportar/lecturas/", exportar_lecturas, name="exportar_lecturas"),
 ]
@@ -1,3 +1,94 @@
-from django.shortcuts import render
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Vistas de la aplicación de sensores (exportación de lecturas)
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from __future__ import annotations
 
-# Create your views here.
+import tempfile
+from datetime import datetime, time, timedelta
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import FileResponse, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .exportacion import (
+    FORMATOS,
+    bloques_arrow,
+    consulta_exportacion,
+    escribir_parquet,
+    filas_csv,
+    formato_disponible,
+)
+
+
+def _parsear_fecha(valor: str | None, fin: bool = False) -> datetime | None:
+    """
+    AAAA-MM-DD (día local completo; con fin=True, hasta el final del día)
+    o fecha-hora ISO. Lanza ValueError si no se reconoce.
+    """
+    if not valor:
+        return None
+    dia = parse_date(valor)
+    if dia is not None:
+        if fin:
+            dia += timedelta(days=1)
+        return timezone.make_aware(datetime.combine(dia, time.min))
+    fecha_hora = parse_datetime(valor)
+    if fecha_hora is None:
+        raise ValueError(valor)
+    return fecha_hora if timezone.is_aware(fecha_hora) else timezone.make_aware(fecha_hora)
+
+
+@staff_member_required
+def exportar_lecturas(request):
+    """
+    Exporta lecturas sin cargarlas en memoria (ver sensores.exportacion).
+
+    URL: /sensores/exportar/lecturas/
+    Método: GET
+    Parámetros:
+      - sensor: código (repetible)
+      - estanque: id del estanque
+      - desde / hasta: AAAA-MM-DD (hasta incluido) o fecha-hora ISO
+      - formato: csv (por defecto), arrow o parquet (requieren pyarrow)
+    """
+    formato = request.GET.get("formato", "csv")
+    if formato not in FORMATOS:
+        return JsonResponse({"ok": False, "error": f"Formato desconocido: {formato}"}, status=400)
+    if not formato_disponible(formato):
+        return JsonResponse({"ok": False, "error": f"El formato {formato} requiere pyarrow"}, status=400)
+
+    try:
+        desde = _parsear_fecha(request.GET.get("desde"))
+        hasta = _parsear_fecha(request.GET.get("hasta"), fin=True)
+        estanque = request.GET.get("estanque")
+        estanque_id = int(estanque) if estanque else None
+    except ValueError:
+        return JsonResponse({"ok": False, "error": "Parámetros inválidos"}, status=400)
+
+    qs = consulta_exportacion(request.GET.getlist("sensor"), estanque_id, desde, hasta)
+    nombre = "lecturas"
+    if desde:
+        nombre += f"_{timezone.localtime(desde):%Y%m%d}"
+    if hasta:
+        nombre += f"_{timezone.localtime(hasta - timedelta(microseconds=1)):%Y%m%d}"
+
+    if formato == "parquet":
+        # Parquet escribe su índice al final: se arma en un temporal (disco, no RAM)
+        archivo = tempfile.TemporaryFile()
+        escribir_parquet(qs, archivo)
+        archivo.seek(0)
+        return FileResponse(archivo, as_attachment=True, filename=f"{nombre}.parquet")
+
+    if formato == "arrow":
+        response = StreamingHttpResponse(bloques_arrow(qs), content_type="application/vnd.apache.arrow.stream")
+        response["Content-Disposition"] = f'attachment; filename="{nombre}.arrow"'
+        return response
+
+    response = StreamingHttpResponse(filas_csv(qs), content_type="text/csv; charset=utf-8")
+    response["Content-Disposition"] = f'attachment; filename="{nombre}.csv"'
+    return response
@@ -2,10 +2,46 @@ from __future__ import annotations
 
 import json
 
+from django.conf import settings
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 
-from .services import procesar_payload_lectura, registrar_lectura
+from .comandos import confirmar_comandos, parsear_ack
+from .services import (
+    aprocesar_payload_lectura,
+    aregistrar_lectura,
+    procesar_payload_lectura,
+    registrar_lectura,
+    registrar_lecturas_lote,
+)
+
+
+def _leer_json_request(request) -> dict | None:
+    """Parsea el body JSON (o form-data como fallback). None si el JSON es inválido."""
+    try:
+        if request.body:
+            return json.loads(request.body.decode("utf-8"))
+        # Fallback por si el cliente envía form-data
+        return request.POST.dict()
+    except json.JSONDecodeError:
+        return None
+
+
+def _respuesta_lectura(lectura, sensor) -> JsonResponse:
+    """201 con el id nuevo, o 200 con el id original si fue un reintento."""
+    if getattr(lectura, "duplicada", False):
+        return JsonResponse(
+            {"ok": True, "id": lectura.id, "sensor": sensor.codigo, "duplicada": True},
+            status=200,
+        )
+    return JsonResponse(
+        {
+            "ok": True,
+            "id": lectura.id,
+            "sensor": sensor.codigo,
+        },
+        status=201,
+    )
 
 
 @csrf_exempt
@@ -20,11 +56,15 @@ def api_recibir_lectura(request):
         "sensor_codigo": "NIVEL_TK1",
         "valor": 123.4,
         "unidad": "cm",
-        "fecha_hora": "2025-11-18T04:30:00Z"  # opcional
+        "fecha_hora": "2025-11-18T04:30:00Z",  # opcional
+        "seq": 1842,                           # opcional: clave de idempotencia
+        "boot": 17                             # opcional: arranque del ESP32 (acota "seq")
     }
 
     Respuestas:
       - 201: {"ok": true, "id": <id_lectura>, "sensor": "<codigo>"}
+      - 200: {"ok": true, "id": <id_original>, "sensor": "<codigo>", "duplicada": true}
+             (reintento con una clave ya registrada: no se vuelve a insertar)
       - 400: {"ok": false, "error": "..."}
     """
     if request.method != "POST":
@@ -34,13 +74,8 @@ def api_recibir_lectura(request):
         )
 
     # Intentar parsear JSON del cuerpo
-    try:
-        if request.body:
-            data = json.loads(request.body.decode("utf-8"))
-        else:
-            # Fallback por si el cliente envía form-data
-            data = request.POST.dict()
-    except json.JSONDecodeError:
+    data = _leer_json_request(request)
+    if data is None:
         return JsonResponse(
             {"ok": False, "error": "JSON inválido"},
             status=400,
@@ -52,19 +87,136 @@ def api_recibir_lectura(request):
         return JsonResponse(resultado, status=400)
 
     # Registrar lectura usando los datos ya validados
+    sensor = resultado["sensor"]
     lectura = registrar_lectura(
-        sensor=resultado["sensor"],
+        sensor=sensor,
         valor=resultado["valor"],
         unidad=resultado["unidad"],
         fecha_hora=resultado["fecha_hora"],
         raw_payload=data,  # solo tipos simples, serializable
+        clave_idempotencia=resultado["clave_idempotencia"],
     )
 
-    return JsonResponse(
-        {
-            "ok": True,
-            "id": lectura.id,
-            "sensor": lectura.sensor.codigo,
-        },
-        status=201,
+    return _respuesta_lectura(lectura, sensor)
+
+
+@csrf_exempt
+async def api_recibir_lectura_async(request):
+    """
+    Versión async (ASGI) de api_recibir_lectura: mismo contrato de request y
+    respuesta, pero el sensor, la lectura y las alertas se leen/escriben con
+    el ORM async, sin ocupar un hilo por request mientras espera.
+
+    Se publica en /sensores/api/lectura/ cuando SENSORES_INGESTA_ASYNC = True.
+    """
+    if request.method != "POST":
+        return JsonResponse(
+            {"detail": "Método no permitido"},
+            status=405,
+        )
+
+    data = _leer_json_request(request)
+    if data is None:
+        return JsonResponse(
+            {"ok": False, "error": "JSON inválido"},
+            status=400,
+        )
+
+    resultado = await aprocesar_payload_lectura(data)
+    if not resultado.get("ok"):
+        return JsonResponse(resultado, status=400)
+
+    sensor = resultado["sensor"]
+    lectura = await aregistrar_lectura(
+        sensor=sensor,
+        valor=resultado["valor"],
+        unidad=resultado["unidad"],
+        fecha_hora=resultado["fecha_hora"],
+        raw_payload=data,
+        clave_idempotencia=resultado["clave_idempotencia"],
     )
+
+    return _respuesta_lectura(lectura, sensor)
+
+
+@csrf_exempt
+def api_recibir_lecturas_lote(request):
+    """
+    Endpoint para recibir un lote de lecturas (buffer del ESP32).
+
+    URL: /sensores/api/lecturas/lote/
+    Método: POST
+    Body (JSON): lista de lecturas con el mismo formato de /sensores/api/lectura/
+    [
+        {"sensor_codigo": "NIVEL_TK1", "valor": 123.4, "unidad": "cm", "fecha_hora": "..."},
+        ...
+    ]
+
+    Respuestas:
+      - 201: {"ok": true, "creadas": n, "duplicadas": d, "rechazadas": m, "resultados": [...]}
+             (al menos una lectura registrada; el detalle va por item)
+      - 200: sólo reintentos de lecturas ya registradas
+      - 400: {"ok": false, "error": "..."} o ninguna lectura válida
+    """
+    if request.method != "POST":
+        return JsonResponse(
+            {"detail": "Método no permitido"},
+            status=405,
+        )
+
+    try:
+        data = json.loads(request.body.decode("utf-8"))
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return JsonResponse(
+            {"ok": False, "error": "JSON inválido"},
+            status=400,
+        )
+
+    if not isinstance(data, list) or not data:
+        return JsonResponse(
+            {"ok": False, "error": "Se espera una lista de lecturas no vacía"},
+            status=400,
+        )
+
+    maximo = getattr(settings, "SENSORES_LOTE_MAXIMO", 1000)
+    if len(data) > maximo:
+        return JsonResponse(
+            {"ok": False, "error": f"El lote supera el máximo de {maximo} lecturas"},
+            status=400,
+        )
+
+    resultado = registrar_lecturas_lote(data)
+    if resultado["creadas"]:
+        status = 201
+    else:
+        status = 200 if resultado["duplicadas"] else 400
+    return JsonResponse(resultado, status=status)
+
+
+@csrf_exempt
+def api_ack_comandos(request):
+    """
+    Ack de comandos entregados al ESP32 (transporte HTTP).
+
+    URL: /sensores/api/comandos/ack/
+    Método: POST
+    Body (JSON): {"id": 12}, {"ids": [12, 13]} o [12, 13]
+
+    Respuestas:
+      - 200: {"ok": true, "confirmados": n}
+      - 400: {"ok": false, "error": "..."}
+    """
+    if request.method != "POST":
+        return JsonResponse(
+            {"detail": "Método no permitido"},
+            status=405,
+        )
+
+    ids = parsear_ack(request.body)
+    if not ids:
+        return JsonResponse(
+            {"ok": False, "error": "Ack inválido"},
+            status=400,
+        )
+
+    return JsonResponse({"ok": True, "confirmados": confirmar_comandos(ids)})
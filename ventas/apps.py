@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class VentasConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ventas'
+
+    def ready(self):
+        # Señales que mantienen Pedido.monto_total y unidades_total
+        from . import signals  # noqa
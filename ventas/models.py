@@ -1,9 +1,55 @@
+from decimal import Decimal
+
 from django.db import models
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from core.models import BaseModel
 from clientes.models import Cliente, SectorEntrega
 from productos.models import Producto
 
 
+def _monto_detalles(prefijo: str = ""):
+    return Sum(
+        F(f"{prefijo}cantidad") * F(f"{prefijo}precio_unitario"),
+        output_field=DecimalField(max_digits=12, decimal_places=2),
+    )
+
+
+CAMPOS_TOTALES_PEDIDO = ("monto_total", "unidades_total")
+
+
+class PedidoQuerySet(models.QuerySet):
+
+    def con_totales(self):
+        """
+        Anota monto_calculado (suma de cantidad * precio_unitario) y
+        unidades_calculadas en la misma consulta del listado; total() y
+        cantidad_total() las usan sin volver a la base de datos.
+        (Es un JOIN con agregación: no combinar con otros annotate sobre
+        relaciones múltiples, que multiplicarían las filas sumadas.)
+        """
+        return self.annotate(
+            monto_calculado=Coalesce(_monto_detalles("detalles__"), Value(Decimal("0"))),
+            unidades_calculadas=Coalesce(Sum("detalles__cantidad"), 0),
+        )
+
+    def recalcular_totales(self) -> int:
+        """
+        Recalcula las columnas monto_total y unidades_total en un solo
+        UPDATE (ej: detalles creados con bulk_create, que no emite señales).
+        Retorna la cantidad de pedidos actualizados.
+        """
+        detalles = DetallePedido.objects.filter(pedido=OuterRef("pk")).order_by().values("pedido")
+        return self.update(
+            monto_total=Coalesce(
+                Subquery(detalles.annotate(v=_monto_detalles()).values("v")), Value(Decimal("0"))
+            ),
+            unidades_total=Coalesce(
+                Subquery(detalles.annotate(v=Sum("cantidad")).values("v")), 0
+            ),
+        )
+
+
 class Pedido(BaseModel):
     ESTADOS_PEDIDO = [
         ("PENDIENTE", "Pendiente"),
@@ -35,6 +81,11 @@ class Pedido(BaseModel):
         default="PENDIENTE"
     )
     observaciones = models.TextField(blank=True)
+    # Desnormalizados: los mantienen las señales de DetallePedido (ver ventas.signals)
+    monto_total = models.DecimalField(max_digits=12, decimal_places=2, default=0, editable=False)
+    unidades_total = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = PedidoQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Pedido"
@@ -44,11 +95,35 @@ class Pedido(BaseModel):
     def __str__(self):
         return f"Pedido #{self.id} - {self.cliente}"
 
+    def save(self, *args, **kwargs):
+        # Los totales sólo los escribe recalcular_totales(): una instancia leída
+        # antes del último recálculo (ej: desactivar()) no debe pisarlos.
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = [
+                campo for campo in update_fields if campo not in CAMPOS_TOTALES_PEDIDO
+            ]
+            super().save(*args, **kwargs)
+            return
+
+        # Guardado completo con la semántica de Django (incluye insertar si la
+        # fila ya no existe); después se recalculan desde los detalles.
+        existente = not self._state.adding
+        super().save(*args, **kwargs)
+        if existente:
+            Pedido.objects.filter(pk=self.pk).recalcular_totales()
+            self.refresh_from_db(fields=CAMPOS_TOTALES_PEDIDO)
+
     def total(self):
+        # Anotado por Pedido.objects.con_totales(): no consulta los detalles
+        if hasattr(self, "monto_calculado"):
+            return self.monto_calculado
         return sum(det.subtotal() for det in self.detalles.all())
 
     def cantidad_total(self) -> int:
         """Retorna la cantidad total de unidades en el pedido."""
+        if hasattr(self, "unidades_calculadas"):
+            return self.unidades_calculadas
         return sum(det.cantidad for det in self.detalles.all())
 
     def esta_entregado(self) -> bool:
@@ -79,6 +154,13 @@ class DetallePedido(BaseModel):
         verbose_name = "Detalle de pedido"
         verbose_name_plural = "Detalles de pedido"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instancia = super().from_db(db, field_names, values)
+        # Pedido al que pertenecía al leerse: si cambia, ambos recalculan totales
+        instancia._pedido_id_original = instancia.__dict__.get("pedido_id")
+        return instancia
+
     def subtotal(self):
         return self.cantidad * self.precio_unitario
 
@@ -0,0 +1,21 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Señales que mantienen los totales desnormalizados de Pedido
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import DetallePedido, Pedido
+
+
+@receiver(post_save, sender=DetallePedido)
+@receiver(post_delete, sender=DetallePedido)
+def actualizar_totales_pedido(sender, instance, **kwargs):
+    # Un UPDATE con subconsultas: no carga los detalles del pedido.
+    # Si el detalle se movió de pedido, el anterior también se recalcula.
+    pedido_ids = {instance.pedido_id, getattr(instance, "_pedido_id_original", None)} - {None}
+    Pedido.objects.filter(pk__in=pedido_ids).recalcular_totales()
+    instance._pedido_id_original = instance.pedido_id
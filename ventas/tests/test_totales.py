@@ -0,0 +1,120 @@
+# ---------------------------------------------------------
+# AUTORES: Paula Ortiz, Benjamin Nuñez, Khrismery Gallardo
+# FECHA DE CREACIÓN: 17-10-2026
+# LICENCIA: Uso Educacional-No Comercial
+# PROPÓSITO: Pruebas unitarias para los totales de pedidos
+# FECHA ÚLTIMA MODIFICACIÓN: 17-10-2026
+# ---------------------------------------------------------
+from decimal import Decimal
+
+from django.test import TestCase
+
+from clientes.models import Cliente, SectorEntrega
+from productos.models import Producto
+from ventas.models import DetallePedido, Pedido
+
+
+class TotalesPedidoTests(TestCase):
+
+    def setUp(self):
+        sector = SectorEntrega.objects.create(nombre="Centro", direccion_referencia="Plaza")
+        self.cliente = Cliente.objects.create(
+            rut_numero=12345678, rut_dv="5", nombre_razon_social="Cliente", direccion_cobranza="X 1"
+        )
+        self.sector = sector
+        self.bidon = Producto.objects.create(
+            codigo="B20-T", nombre="Bidón", presentacion_litros=20, precio_lista=2500
+        )
+
+    def _pedido(self, *lineas) -> Pedido:
+        pedido = Pedido.objects.create(cliente=self.cliente, sector_entrega=self.sector)
+        for cantidad, precio in lineas:
+            DetallePedido.objects.create(
+                pedido=pedido, producto=self.bidon, cantidad=cantidad, precio_unitario=precio
+            )
+        return pedido
+
+    def test_listado_con_totales_en_una_consulta(self):
+        for i in range(20):
+            self._pedido((2, "2500.00"), (i, "1000.50"))
+        self._pedido()  # sin detalles
+
+        with self.assertNumQueries(1):
+            pedidos = list(Pedido.objects.con_totales().order_by("id"))
+            totales = [(p.total(), p.cantidad_total()) for p in pedidos]
+
+        self.assertEqual(totales[3], (Decimal("8001.50"), 5))
+        self.assertEqual(totales[-1], (0, 0))
+        sin_anotar = Pedido.objects.order_by("id")[3]
+        self.assertEqual((sin_anotar.total(), sin_anotar.cantidad_total()), totales[3])
+
+    def test_columnas_desnormalizadas_siguen_a_los_detalles(self):
+        pedido = self._pedido((2, "2500.00"), (1, "300.00"))
+        pedido.refresh_from_db()
+        self.assertEqual((pedido.monto_total, pedido.unidades_total), (Decimal("5300.00"), 3))
+
+        detalle = pedido.detalles.get(cantidad=1)
+        detalle.cantidad = 4
+        detalle.save()
+        pedido.detalles.get(cantidad=2).delete()
+
+        pedido.refresh_from_db()
+        self.assertEqual((pedido.monto_total, pedido.unidades_total), (Decimal("1200.00"), 4))
+
+    def test_recalcular_totales_tras_bulk_create(self):
+        pedido = self._pedido()
+        DetallePedido.objects.bulk_create([
+            DetallePedido(pedido=pedido, producto=self.bidon, cantidad=3, precio_unitario=100),
+            DetallePedido(pedido=pedido, producto=self.bidon, cantidad=1, precio_unitario=50),
+        ])
+
+        self.assertEqual(Pedido.objects.recalcular_totales(), 1)
+
+        pedido.refresh_from_db()
+        self.assertEqual((pedido.monto_total, pedido.unidades_total), (Decimal("350.00"), 4))
+
+    def test_instancia_desactualizada_no_pisa_los_totales(self):
+        pedido = self._pedido((1, "100.00"))
+        desactualizado = Pedido.objects.get(pk=pedido.pk)
+        DetallePedido.objects.create(pedido=pedido, producto=self.bidon, cantidad=2, precio_unitario=50)
+
+        desactualizado.estado = "PREPARACION"
+        desactualizado.save()
+        desactualizado.desactivar()
+
+        pedido.refresh_from_db()
+        self.assertEqual(pedido.estado, "PREPARACION")
+        self.assertFalse(pedido.activo)
+        self.assertEqual((pedido.monto_total, pedido.unidades_total), (Decimal("200.00"), 3))
+
+    def test_guardar_pedido_eliminado_lo_vuelve_a_insertar(self):
+        pedido = self._pedido((1, "100.00"))
+        Pedido.objects.filter(pk=pedido.pk).delete()
+
+        pedido.estado = "PREPARACION"
+        pedido.save()
+
+        self.assertEqual(Pedido.objects.get(pk=pedido.pk).estado, "PREPARACION")
+
+    def test_update_fields_explicito_omite_los_totales(self):
+        pedido = self._pedido((1, "100.00"))
+        pedido.monto_total = 0
+        pedido.estado = "DESPACHO"
+
+        pedido.save(update_fields=["estado", "monto_total"])
+
+        pedido.refresh_from_db()
+        self.assertEqual((pedido.estado, pedido.monto_total), ("DESPACHO", Decimal("100.00")))
+
+    def test_detalle_movido_recalcula_ambos_pedidos(self):
+        origen = self._pedido((2, "100.00"), (1, "50.00"))
+        destino = self._pedido()
+
+        detalle = DetallePedido.objects.get(pedido=origen, cantidad=2)
+        detalle.pedido = destino
+        detalle.save()
+
+        origen.refresh_from_db()
+        destino.refresh_from_db()
+        self.assertEqual((origen.monto_total, origen.unidades_total), (Decimal("50.00"), 1))
+        self.assertEqual((destino.monto_total, destino.unidades_total), (Decimal("200.00"), 2))